@@ -0,0 +1,142 @@
+# coding=utf8
+"""JSON Codec
+
+Compares encoding and decoding typical Responses with jsonb, the way body did
+before formats.JSON was used everywhere, against formats.JSON with each
+backend available
+
+	python benchmarks/json_codec.py [iterations]
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Ouroboros imports
+import jsonb
+
+# Python imports
+from datetime import datetime
+from decimal import Decimal
+import sys
+from timeit import timeit
+
+# Local imports
+from body import formats
+
+def _record(i: int) -> dict:
+	"""Record
+
+	Returns a record shaped like those returned by most reads
+
+	Arguments:
+		i (int): The index of the record
+
+	Returns:
+		dict
+	"""
+	return {
+		'_id': '%032x' % i,
+		'_created': datetime(2026, 10, 17, 12, 0, i % 60),
+		'name': { 'first': 'First %d' % i, 'last': 'Last %d' % i },
+		'email': 'user%d@example.com' % i,
+		'locale': 'en-US',
+		'balance': Decimal('%d.%02d' % ( i, i % 100 )),
+		'verified': i % 2 == 0,
+		'tags': [ 'tag%d' % t for t in range(i % 5) ],
+		'count': i * 7
+	}
+
+PAYLOADS = {
+	'single': { 'data': _record(1) },
+	'list of 100': { 'data': [ _record(i) for i in range(100) ] },
+	'list of 1000': { 'data': [ _record(i) for i in range(1000) ] },
+	'__list of 10': { 'data': [
+		[ 'user', { 'data': _record(i) } ] for i in range(10)
+	] },
+	'error': { 'error': {
+		'code': 1001,
+		'msg': [ [ 'field%d' % i, 'missing' ] for i in range(10) ]
+	} }
+}
+"""The payloads to encode and decode, shaped like the Responses sent"""
+
+def _old_encode(val: any) -> bytes:
+	"""Old Encode
+
+	Encodes the way body did before, to a str with jsonb, which was then
+	encoded to bytes to be sent
+
+	Arguments:
+		val (any): The value to encode
+
+	Returns:
+		bytes
+	"""
+	return jsonb.encode(val).encode('utf-8')
+
+def _old_decode(val: bytes) -> any:
+	"""Old Decode
+
+	Decodes the way body did before, by converting the bytes received to a
+	str, then decoding it with jsonb
+
+	Arguments:
+		val (bytes): The value to decode
+
+	Returns:
+		any
+	"""
+	return jsonb.decode(val.decode('utf-8'))
+
+def main(iterations: int):
+	"""Main
+
+	Times each payload with each codec and prints the results
+
+	Arguments:
+		iterations (int): The number of times to encode and decode each
+			payload
+
+	Returns:
+		None
+	"""
+
+	# Collect the codecs to compare
+	lCodecs = [ ( 'jsonb (before)', _old_encode, _old_decode ) ]
+	for sBackend, bDecimal in [
+		( 'jsonb', True ), ( 'orjson', True ), ( 'orjson', False )
+	]:
+		try:
+			formats.json_backend(sBackend, bDecimal)
+		except ValueError:
+			continue
+		lCodecs.append((
+			'%s%s' % ( sBackend, not bDecimal and ', floats' or '' ),
+			formats.JSON.encode, formats.JSON.decode
+		))
+
+	# Print the header
+	print('%-14s %-18s %12s %12s %10s' % (
+		'payload', 'codec', 'encode us', 'decode us', 'bytes'
+	))
+
+	# Go through each payload and codec
+	for sPayload, dPayload in PAYLOADS.items():
+		for sCodec, fEncode, fDecode in lCodecs:
+			bEncoded = fEncode(dPayload)
+			fEnc = timeit(lambda: fEncode(dPayload), number = iterations)
+			fDec = timeit(lambda: fDecode(bEncoded), number = iterations)
+			print('%-14s %-18s %12.1f %12.1f %10d' % (
+				sPayload, sCodec,
+				fEnc / iterations * 1000000,
+				fDec / iterations * 1000000,
+				len(bEncoded)
+			))
+		print('')
+
+# Only run if called directly
+if __name__ == '__main__':
+	main(len(sys.argv) > 1 and int(sys.argv[1]) or 200)
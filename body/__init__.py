@@ -10,11 +10,14 @@ __email__		= "chris@ouroboroscoding.com"
 __created__		= "2022-08-29"
 
 __all__ = [
-	'create', 'read', 'update', 'delete',
-	'Service', 'Error', 'Response', 'ResponseException'
+	'create', 'read', 'update', 'delete', 'create_many', 'update_many',
+	'delete_many', 'aio', 'Service', 'Error', 'Many', 'Response',
+	'ResponseException'
 ]
 
-# Import external calls and Service
-from body.external import create, delete, read, update
-from body.response import Error, Response, ResponseException
+# Import external calls, the awaitable versions, and Service
+from body.external import create, create_many, delete, delete_many, read, \
+	update, update_many
+from body import aio
+from body.response import Error, Many, Response, ResponseException
 from body.service import Service
\ No newline at end of file
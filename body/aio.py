@@ -0,0 +1,202 @@
+# coding=utf8
+"""AIO
+
+Awaitable versions of the methods used to connect to other services, so that
+calls to several services can be made at the same time via asyncio.gather
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+__all__ = [
+	'create', 'create_many', 'delete', 'delete_many', 'read', 'request',
+	'update', 'update_many'
+]
+
+# Python imports
+import asyncio
+import contextvars
+from functools import partial
+from typing import MutableMapping
+
+# Local imports
+from body import external
+from body.response import Response
+
+async def create(
+	service: str,
+	path: str,
+	req: dict = {}
+) -> Response:
+	"""Create
+
+	Make a POST request
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response
+	"""
+	return await request(service, 'create', path, req)
+
+async def create_many(
+	service: str,
+	path: str,
+	req: dict = {}
+) -> Response:
+	"""Create Many
+
+	Make a POST request to create many items of a noun at once, the data is
+	the list of items
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response: see body.response.Many
+	"""
+	return await request(service, 'create_many', path, req)
+
+async def delete(
+	service: str,
+	path: str,
+	req: dict = {}
+) -> Response:
+	"""Delete
+
+	Make a DELETE request
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response
+	"""
+	return await request(service, 'delete', path, req)
+
+async def delete_many(
+	service: str,
+	path: str,
+	req: dict = {}
+) -> Response:
+	"""Delete Many
+
+	Make a DELETE request to delete many items of a noun at once, the data is
+	the list of items
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response: see body.response.Many
+	"""
+	return await request(service, 'delete_many', path, req)
+
+async def read(
+	service: str,
+	path: str,
+	req: dict = {}
+) -> Response:
+	"""Read
+
+	Make a GET request
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response
+	"""
+	return await request(service, 'read', path, req)
+
+async def request(
+	service: str,
+	action: str,
+	path: str,
+	req: MutableMapping = {}
+) -> Response:
+	"""Request
+
+	Awaitable version of body.external.request. The request is run on the
+	shared pool of threads used by body.external so that it uses the same
+	services, connection pools, and in-process dispatch, without blocking the
+	event loop
+
+	Arguments:
+		service (str): The service we are requesting data from
+		action (str): The action to take on the service
+		path (str): The path of the request
+		req (dict): The request details: 'data', 'session', and 'enviroment'
+
+	Raises:
+		KeyError: if the service or action don't exist
+
+	Returns:
+		Response
+	"""
+
+	# Get the running loop
+	oLoop = asyncio.get_running_loop()
+
+	# Copy the current context so that any context variables set by the
+	#	caller are available to the request
+	oContext = contextvars.copy_context()
+
+	# Run the request on the shared executor and wait for the result
+	return await oLoop.run_in_executor(
+		external._executor(),
+		partial(oContext.run, external.request, service, action, path, req)
+	)
+
+async def update(
+	service: str,
+	path: str,
+	req: dict = {}
+) -> Response:
+	"""Update
+
+	Make a PUT request
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response
+	"""
+	return await request(service, 'update', path, req)
+
+async def update_many(
+	service: str,
+	path: str,
+	req: dict = {}
+) -> Response:
+	"""Update Many
+
+	Make a PUT request to update many items of a noun at once, the data is
+	the list of items
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response: see body.response.Many
+	"""
+	return await request(service, 'update_many', path, req)
\ No newline at end of file
@@ -0,0 +1,373 @@
+# coding=utf8
+"""ASGI
+
+Holds the class used to serve a REST instance from an event loop, through any
+ASGI server, so that requests waiting on I/O in async methods don't each hold
+a worker
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'ASGI' ]
+
+# Python imports
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+from tempfile import SpooledTemporaryFile
+import traceback
+from typing import BinaryIO, TYPE_CHECKING
+
+# Pip imports
+import bottle
+
+# Local imports
+from body import ingest, loop
+from body.external import prewarm
+if TYPE_CHECKING:
+	from body.rest import REST
+
+SPOOL = 1048576
+"""The number of bytes of a request body kept in memory before it's moved to
+disk"""
+
+class ASGI(object):
+	"""ASGI
+
+	An ASGI application that serves the routes of a REST instance. Async
+	noun methods are awaited on the event loop, every other method is run on
+	a pool of threads, as is anything that isn't a noun, e.g. additional
+	routes, through the original WSGI application
+	"""
+
+	def __init__(self, app: REST, threads: int = 32):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			app (REST): The REST instance to serve
+			threads (uint): The maximum number of sync methods run at the
+				same time
+
+		Raises:
+			ValueError
+
+		Returns:
+			ASGI
+		"""
+
+		# Make sure the number of threads is valid
+		try:
+			self._threads = int(threads)
+			if self._threads < 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('threads', 'must be an int greater than 0')
+
+		# Store the app and init the pool
+		self._app = app
+		self._executor = None
+		self._pid = None
+
+	async def __call__(self, scope: dict, receive: callable, send: callable):
+		"""Call (__call__)
+
+		Python magic method that allows the instance to be called by the
+		server
+
+		Arguments:
+			scope (dict): The details of the connection
+			receive (callable): Awaited to get the next event from the client
+			send (callable): Awaited to send an event to the client
+
+		Returns:
+			None
+		"""
+
+		# If it's the start or end of the server
+		if scope['type'] == 'lifespan':
+			return await self._lifespan(receive, send)
+
+		# If it's not HTTP, we don't handle it
+		if scope['type'] != 'http':
+			raise ValueError('scope.type', 'not supported: %s' % scope['type'])
+
+		# Make sure we have threads in this process, and that coroutines
+		#	started from them run on this loop
+		oLoop = asyncio.get_running_loop()
+		if self._pid != os.getpid():
+			self._start(oLoop)
+
+		# Read the entire body, moving it to disk if it's large, so that nouns
+		#	that take their data one item at a time never hold all of it
+		oBody = SpooledTemporaryFile(max_size = SPOOL)
+		while True:
+			dEvent = await receive()
+			if dEvent['type'] == 'http.disconnect':
+				oBody.close()
+				return
+			oBody.write(dEvent.get('body', b''))
+			if not dEvent.get('more_body'):
+				break
+
+		# Generate the WSGI environment
+		dEnviron = self._environ(scope, oBody)
+
+		# Find the route, and if it's one of ours, handle it on the loop
+		try:
+			oRoute = self._app.router.match(dEnviron)[0]
+		except bottle.HTTPError:
+			oRoute = None
+		if oRoute is not None and hasattr(oRoute.callback, '_drive_async'):
+			oRequest = bottle.BaseRequest(dEnviron)
+			oResponse = bottle.BaseResponse()
+			try:
+				mBody = await oRoute.callback._drive_async(
+					oRoute.callback._handle(oRequest, oResponse),
+					self._executor
+				)
+			except Exception:
+				print(traceback.format_exc(), file = sys.stderr)
+				oResponse = bottle.BaseResponse(status = 500)
+				mBody = b'Internal Server Error'
+			iStatus = oResponse.status_code
+			lHeaders = oResponse.headerlist
+
+		# Else, let bottle handle it on a thread
+		else:
+			iStatus, lHeaders, mBody = await oLoop.run_in_executor(
+				self._executor, self._wsgi, dEnviron
+			)
+
+		# Send the response, and remove the body
+		try:
+			await self._send(
+				send, oLoop, iStatus, lHeaders, mBody, scope['method'] == 'HEAD'
+			)
+		finally:
+			oBody.close()
+
+	@staticmethod
+	def _environ(scope: dict, body: BinaryIO) -> dict:
+		"""Environ
+
+		Generates the WSGI environment of a request
+
+		Arguments:
+			scope (dict): The details of the connection
+			body (file): The body of the request
+
+		Returns:
+			dict
+		"""
+
+		# Get the server and client
+		tServer = scope.get('server') or ( 'localhost', 80 )
+		tClient = scope.get('client') or ( '', 0 )
+
+		# Init the environment
+		iLength = body.tell()
+		body.seek(0)
+		dRet = {
+			'REQUEST_METHOD': scope['method'],
+			'SCRIPT_NAME': scope.get('root_path', '').encode().decode('latin-1'),
+			'PATH_INFO': scope['path'].encode().decode('latin-1'),
+			'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+			'SERVER_NAME': tServer[0],
+			'SERVER_PORT': str(tServer[1]),
+			'SERVER_PROTOCOL': 'HTTP/%s' % scope.get('http_version', '1.1'),
+			'REMOTE_ADDR': tClient[0],
+			'CONTENT_LENGTH': str(iLength),
+			'wsgi.version': ( 1, 0 ),
+			'wsgi.url_scheme': scope.get('scheme', 'http'),
+			'wsgi.input': body,
+			ingest.SPOOLED: True,
+			'wsgi.errors': sys.stderr,
+			'wsgi.multithread': True,
+			'wsgi.multiprocess': True,
+			'wsgi.run_once': False
+		}
+
+		# Add the headers, the body has already been read, so its length is
+		#	known
+		for bName, bValue in scope['headers']:
+			sName = bName.decode('latin-1').upper().replace('-', '_')
+			if sName in [ 'CONTENT_LENGTH', 'TRANSFER_ENCODING' ]:
+				continue
+			if sName != 'CONTENT_TYPE':
+				sName = 'HTTP_%s' % sName
+			sValue = bValue.decode('latin-1')
+			if sName in dRet:
+				dRet[sName] = '%s,%s' % ( dRet[sName], sValue )
+			else:
+				dRet[sName] = sValue
+
+		# Return the environment
+		return dRet
+
+	async def _lifespan(self, receive: callable, send: callable):
+		"""Lifespan
+
+		Handles the start and end of the server, opening connections to other
+		services on start, and stopping the threads on end
+
+		Arguments:
+			receive (callable): Awaited to get the next event
+			send (callable): Awaited to send an event
+
+		Returns:
+			None
+		"""
+		while True:
+			dEvent = await receive()
+
+			# If the server is starting, get everything ready
+			if dEvent['type'] == 'lifespan.startup':
+				oLoop = asyncio.get_running_loop()
+				self._start(oLoop)
+				await oLoop.run_in_executor(self._executor, prewarm)
+				await send({ 'type': 'lifespan.startup.complete' })
+
+			# Else, if it's stopping, stop the threads
+			elif dEvent['type'] == 'lifespan.shutdown':
+				if self._executor is not None:
+					self._executor.shutdown(wait = False)
+					self._executor = None
+					self._pid = None
+				loop.use(None)
+				await send({ 'type': 'lifespan.shutdown.complete' })
+				return
+
+	async def _send(self,
+		send: callable,
+		event_loop: asyncio.AbstractEventLoop,
+		status: int,
+		headers: list,
+		body: any,
+		head: bool
+	):
+		"""Send
+
+		Sends the status, headers, and body of a response. Bodies that are
+		iterators, e.g. streams, are sent one chunk at a time, each generated
+		on a thread
+
+		Arguments:
+			send (callable): Awaited to send an event to the client
+			event_loop (asyncio.AbstractEventLoop): The running loop
+			status (uint): The HTTP status
+			headers (list): The headers as ( name, value ) pairs
+			body (any): The body, str, bytes, or an iterator of either
+			head (bool): True if the request was HEAD, and no body is sent
+
+		Returns:
+			None
+		"""
+
+		# Convert the headers
+		lHeaders = [
+			( k.lower().encode('latin-1'), str(v).encode('latin-1') )
+			for k, v in headers
+		]
+
+		# If we have the entire body, convert it, and send its length
+		bIterator = not isinstance(body, (str, bytes, bytearray))
+		if not bIterator:
+			if isinstance(body, str):
+				body = body.encode('utf-8')
+			if not any([ t[0] == b'content-length' for t in lHeaders ]):
+				lHeaders.append(( b'content-length', str(len(body)).encode() ))
+
+		# Start the response
+		await send({
+			'type': 'http.response.start',
+			'status': status,
+			'headers': lHeaders
+		})
+
+		# If we don't have an iterator, send the body and stop
+		if not bIterator:
+			await send({
+				'type': 'http.response.body',
+				'body': not head and body or b''
+			})
+			return
+
+		# Send each chunk, getting them on a thread, as they could be
+		#	generated by sync code, and make sure the iterator is closed once
+		#	done
+		oIterator = iter(body)
+		try:
+			while not head:
+				m = await event_loop.run_in_executor(
+					self._executor, next, oIterator, None
+				)
+				if m is None:
+					break
+				if m:
+					await send({
+						'type': 'http.response.body',
+						'body': isinstance(m, str) and m.encode('utf-8') or m,
+						'more_body': True
+					})
+		finally:
+			if hasattr(body, 'close'):
+				body.close()
+
+		# Let the client know there's nothing left
+		await send({ 'type': 'http.response.body', 'body': b'' })
+
+	def _start(self, event_loop: asyncio.AbstractEventLoop):
+		"""Start
+
+		Creates the pool of threads, done on the first request, and again
+		after a fork, and makes the loop the one async methods called from
+		other threads are run on
+
+		Arguments:
+			event_loop (asyncio.AbstractEventLoop): The running loop
+
+		Returns:
+			None
+		"""
+		if self._pid != os.getpid():
+			self._executor = ThreadPoolExecutor(
+				max_workers = self._threads, thread_name_prefix = 'body.asgi'
+			)
+			self._pid = os.getpid()
+			loop.use(event_loop)
+
+	def _wsgi(self, environ: dict) -> tuple:
+		"""WSGI
+
+		Runs a request through the original WSGI application, on a thread,
+		and returns the status, headers, and body it generated
+
+		Arguments:
+			environ (dict): The WSGI environment
+
+		Returns:
+			( uint, list, any )
+		"""
+
+		# Store whatever bottle starts the response with
+		dStart = {}
+		def start_response(status: str, headers: list, exc_info = None):
+			dStart['status'] = int(status.split(' ', 1)[0])
+			dStart['headers'] = headers
+
+		# Run the request
+		mBody = self._app(environ, start_response)
+
+		# If the body is a list, join it
+		if isinstance(mBody, list):
+			mBody = b''.join(mBody)
+
+		# Return the response
+		return ( dStart['status'], dStart['headers'], mBody )
\ No newline at end of file
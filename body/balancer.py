@@ -0,0 +1,327 @@
+# coding=utf8
+"""Balancer
+
+Holds the class used to spread requests to a single service across several
+hosts
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'Balancer' ]
+
+# Python imports
+import random
+from threading import Lock
+from time import monotonic
+
+# Local imports
+from body.pool import Pool
+
+class _Host(object):
+	"""Host
+
+	A private class used to hold the details of a single host of a service
+	"""
+
+	__slots__ = (
+		'ejected', 'ejections', 'failures', 'in_flight', 'pool', 'requests',
+		'url'
+	)
+
+	def __init__(self, url: str, pool: Pool):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			url (str): The base url of the host
+			pool (Pool): The connection pool for the host
+
+		Returns:
+			_Host
+		"""
+		self.ejected = 0.0
+		self.ejections = 0
+		self.failures = 0
+		self.in_flight = 0
+		self.pool = pool
+		self.requests = 0
+		self.url = url
+
+class Balancer(object):
+	"""Balancer
+
+	Picks which of a service's hosts each request goes to, and keeps track of
+	their health. Hosts that fail too many times in a row, by not accepting
+	connections or returning 5xx statuses, are ejected and not picked again
+	until the cooldown has passed, unless every host is ejected
+	"""
+
+	LEAST_IN_FLIGHT = 'least_in_flight'
+	"""Pick the host with the fewest requests in progress"""
+
+	ROUND_ROBIN = 'round_robin'
+	"""Pick each host in turn"""
+
+	TWO_CHOICES = 'two_choices'
+	"""Pick two hosts at random and use the one with fewer requests in
+	progress"""
+
+	STRATEGIES = ( LEAST_IN_FLIGHT, ROUND_ROBIN, TWO_CHOICES )
+	"""All valid strategies"""
+
+	def __init__(self,
+		urls: list,
+		pool: dict = {},
+		strategy: str = ROUND_ROBIN,
+		failures: int = 5,
+		cooldown: float = 30
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			urls (str[]): The base urls of each host
+			pool (dict): The arguments used to create each host's Pool
+			strategy (str): How to pick a host, 'round_robin',
+				'least_in_flight', or 'two_choices'
+			failures (uint): The number of failures in a row before a host is
+				ejected, 0 to never eject hosts
+			cooldown (float): The number of seconds a host stays ejected
+
+		Raises:
+			ValueError
+
+		Returns:
+			Balancer
+		"""
+
+		# Validate the settings
+		if strategy not in self.STRATEGIES:
+			raise ValueError(
+				'strategy', 'must be one of %s' % ', '.join(self.STRATEGIES)
+			)
+		try:
+			self._failures = int(failures)
+			if self._failures < 0: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('failures', 'must be an int of 0 or greater')
+		try:
+			self._cooldown = float(cooldown)
+			if self._cooldown < 0: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('cooldown', 'must be a number of 0 or greater')
+
+		# Store the rest of the settings
+		self._pool = pool
+		self._strategy = strategy
+
+		# Init the state
+		self._lock = Lock()
+		self._hosts = []
+		self._next = 0
+
+		# Add the hosts
+		self.update(urls)
+
+	def close(self):
+		"""Close
+
+		Closes all open connections to every host
+
+		Returns:
+			None
+		"""
+		for oHost in self._hosts:
+			oHost.pool.close()
+
+	def pick(self) -> _Host:
+		"""Pick
+
+		Returns the host the next request should go to. Every host returned
+		must be passed to release() once the request is done
+
+		Returns:
+			_Host
+		"""
+
+		fNow = monotonic()
+		with self._lock:
+
+			# Get the hosts that haven't been ejected, or all of them if they
+			#	all have been, as it's better to try than give up
+			lHosts = [ o for o in self._hosts if o.ejected <= fNow ] or \
+				self._hosts
+
+			# If there's only one, there's no choice to make
+			if len(lHosts) == 1:
+				oHost = lHosts[0]
+
+			# If we are going in turn
+			elif self._strategy == self.ROUND_ROBIN:
+				oHost = lHosts[self._next % len(lHosts)]
+				self._next += 1
+
+			# If we want the least busy, start from a different host each
+			#	time so ties don't always go to the first one
+			elif self._strategy == self.LEAST_IN_FLIGHT:
+				iStart = self._next % len(lHosts)
+				self._next += 1
+				oHost = min(
+					lHosts[iStart:] + lHosts[:iStart],
+					key = lambda o: o.in_flight
+				)
+
+			# Else, pick two at random and use the least busy
+			else:
+				oA, oB = random.sample(lHosts, 2)
+				oHost = oB.in_flight < oA.in_flight and oB or oA
+
+			# Mark the request as in progress and return the host
+			oHost.in_flight += 1
+			oHost.requests += 1
+			return oHost
+
+	def pool_stats(self) -> dict:
+		"""Pool Stats
+
+		Returns the connection counters of every host added together. See
+		Pool.stats for the details
+
+		Returns:
+			dict
+		"""
+		dRet = {}
+		for oHost in self._hosts:
+			for k,v in oHost.pool.stats().items():
+				dRet[k] = dRet.get(k, 0) + v
+		return dRet
+
+	def prewarm(self) -> int:
+		"""Prewarm
+
+		Opens the configured number of connections to every host
+
+		Returns:
+			uint: The number of connections actually opened
+		"""
+		return sum([ o.pool.prewarm() for o in self._hosts ])
+
+	def release(self, host: _Host, ok: bool | None):
+		"""Release
+
+		Marks the request to the host as done, and records whether it failed
+
+		Arguments:
+			host (_Host): The host returned by pick()
+			ok (bool): False if the host couldn't be reached or returned a 5xx
+				status, None if the request failed for reasons that have
+				nothing to do with the host
+
+		Returns:
+			None
+		"""
+		with self._lock:
+
+			# The request is no longer in progress
+			host.in_flight -= 1
+
+			# If the host isn't to blame either way, there's nothing to record
+			if ok is None:
+				return
+
+			# If it worked, reset the failures
+			if ok:
+				host.failures = 0
+				return
+
+			# Add the failure, and if there's been too many, eject the host
+			host.failures += 1
+			if self._failures and host.failures >= self._failures:
+				host.ejected = monotonic() + self._cooldown
+				host.ejections += 1
+				host.failures = 0
+
+	def reset(self):
+		"""Reset
+
+		Drops every host's connections without closing them, used after a
+		fork so that processes never share sockets
+
+		Returns:
+			None
+		"""
+		for oHost in self._hosts:
+			oHost.pool.reset()
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the strategy, and for each host by url, the requests made to
+		it, the requests in progress, the failures in a row, whether it's
+		currently ejected, and how many times it has been
+
+		Returns:
+			dict
+		"""
+		fNow = monotonic()
+		with self._lock:
+			return {
+				'hosts': { o.url: {
+					'ejected': o.ejected > fNow,
+					'ejections': o.ejections,
+					'failures': o.failures,
+					'in_flight': o.in_flight,
+					'requests': o.requests
+				} for o in self._hosts },
+				'strategy': self._strategy
+			}
+
+	def update(self, urls: list):
+		"""Update
+
+		Replaces the list of hosts. Hosts that are in both the old and new
+		lists keep their connections and state, hosts no longer in the list
+		have their connections closed, and any requests already sent to them
+		finish normally
+
+		Arguments:
+			urls (str[]): The base urls of each host
+
+		Raises:
+			ValueError
+
+		Returns:
+			None
+		"""
+
+		# Make sure we got at least one
+		if not urls:
+			raise ValueError('hosts', 'must have at least one host')
+
+		with self._lock:
+
+			# Keep the existing hosts by url
+			dOld = { o.url: o for o in self._hosts }
+
+			# Go through each url, re-use the host if we have it, else
+			#	create a new one
+			lHosts = []
+			for sURL in urls:
+				if sURL in dOld:
+					lHosts.append(dOld.pop(sURL))
+				elif sURL not in [ o.url for o in lHosts ]:
+					lHosts.append(_Host(sURL, Pool(sURL, **self._pool)))
+
+			# Swap in the new list
+			self._hosts = lHosts
+
+		# Close the connections to any hosts that were removed
+		for oHost in dOld.values():
+			oHost.pool.close()
\ No newline at end of file
@@ -0,0 +1,327 @@
+# coding=utf8
+"""Batch
+
+Holds the classes used to collect several reads so they can be sent together
+as a single request
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'Batch', 'Window' ]
+
+# Python imports
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+import contextvars
+from threading import current_thread, Event, Lock
+
+class Batch(object):
+	"""Batch
+
+	Context manager that collects reads, returning a Future for each, and
+	sends them once the block is done
+
+	with external.batch() as oBatch:
+		oUser = oBatch.read('user', 'user', { 'data': { '_id': _id } })
+		oPerms = oBatch.read('user', 'permissions', { 'data': { '_id': _id } })
+	oUser.result().data
+	"""
+
+	def __init__(self,
+		send: Callable[[str, list], list],
+		executor: Executor | None = None,
+		prefix: str | None = None
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			send (callable): Takes the name of a service and a list of
+				( path, req ) and returns a list of Responses in the same order
+			executor (Executor): Optional, used to send to several services
+				at the same time
+			prefix (str): Optional, the name the executor's threads start
+				with, if the batch is sent from one of them, the services are
+				sent one at a time instead
+
+		Returns:
+			Batch
+		"""
+		self._send = send
+		self._executor = executor
+		self._pending = {}
+		self._prefix = prefix
+
+	def __enter__(self) -> Batch:
+		"""Enter (__enter__)
+
+		Python magic method called when the instance is used in a with
+		statement
+
+		Returns:
+			Batch
+		"""
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback) -> bool:
+		"""Exit (__exit__)
+
+		Python magic method called when the with statement is done. Sends the
+		reads, unless the block raised an exception, in which case they are
+		cancelled
+
+		Returns:
+			bool
+		"""
+
+		# If there was an exception, cancel everything
+		if exc_type is not None:
+			for l in self._pending.values():
+				for t in l:
+					t[2].cancel()
+			self._pending = {}
+
+		# Else, send everything
+		else:
+			self.flush()
+
+		# Let any exception through
+		return False
+
+	def _run(self, service: str, reads: list):
+		"""Run
+
+		Sends the reads for a single service and sets the results of their
+		Futures
+
+		Arguments:
+			service (str): The name of the service
+			reads (list): The list of ( path, req, Future )
+
+		Returns:
+			None
+		"""
+		try:
+			lResponses = self._send(service, [ ( t[0], t[1] ) for t in reads ])
+		except BaseException as e:
+			for t in reads:
+				t[2].set_exception(e)
+		else:
+			for i in range(len(reads)):
+				reads[i][2].set_result(lResponses[i])
+
+	def flush(self):
+		"""Flush
+
+		Sends all the reads collected so far
+
+		Returns:
+			None
+		"""
+
+		# Take the pending reads
+		dPending = self._pending
+		self._pending = {}
+
+		# If there's only one service, or no way to run them at once, or we
+		#	are already running in one of the executor's threads, where
+		#	waiting on other threads in the same pool could dead lock it, send
+		#	them one service at a time
+		if len(dPending) < 2 or self._executor is None or (
+			self._prefix is not None and
+			current_thread().name.startswith(self._prefix)
+		):
+			for sService, lReads in dPending.items():
+				self._run(sService, lReads)
+
+		# Else, send them all at the same time, each using a copy of the
+		#	current context so the deadline and details of the call are kept,
+		#	and wait for them
+		else:
+			for oFuture in [
+				self._executor.submit(
+					contextvars.copy_context().run,
+					self._run, sService, lReads
+				)
+				for sService, lReads in dPending.items()
+			]:
+				oFuture.result()
+
+	def read(self, service: str, path: str, req: dict = {}) -> Future:
+		"""Read
+
+		Adds a read to the batch and returns the Future that will hold its
+		Response once the batch is sent
+
+		Arguments:
+			service (str): The service to call
+			path (str): The path on the service
+			req (dict): The request details, which can include 'data',
+				'session', and 'meta'
+
+		Returns:
+			Future
+		"""
+		oFuture = Future()
+		try:
+			self._pending[service].append(( path, req, oFuture ))
+		except KeyError:
+			self._pending[service] = [ ( path, req, oFuture ) ]
+		return oFuture
+
+class _Group(object):
+	"""Group
+
+	A private class used to hold the items collected by a Window for a single
+	key
+	"""
+
+	__slots__ = ( 'done', 'error', 'full', 'items', 'results' )
+
+	def __init__(self):
+		"""Constructor
+
+		Creates a new instance
+
+		Returns:
+			_Group
+		"""
+		self.done = Event()
+		self.error = None
+		self.full = Event()
+		self.items = []
+		self.results = None
+
+class Window(object):
+	"""Window
+
+	Collects items passed by different threads, by key, for a short window of
+	time, or until there are enough of them, then hands them all to a single
+	function call. The first thread to pass an item for a key waits for the
+	window and makes the call, the rest wait for it and get their own result
+	"""
+
+	def __init__(self,
+		func: Callable[[str, list], list],
+		size: int = 10,
+		wait: float = 0.002
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			func (callable): Takes the key and the list of items, and returns
+				a list of results in the same order
+			size (uint): The maximum number of items passed to the function
+			wait (float): The number of seconds to wait for more items
+
+		Raises:
+			ValueError
+
+		Returns:
+			Window
+		"""
+
+		# Validate the settings
+		try:
+			self._size = int(size)
+			if self._size < 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('size', 'must be an int greater than 0')
+		try:
+			self._wait = float(wait)
+			if self._wait < 0: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('window', 'must be a number of 0 or greater')
+
+		# Store the function and init the state
+		self._func = func
+		self._groups = {}
+		self._lock = Lock()
+		self._calls = 0
+		self._items = 0
+
+	def run(self, key: str, item: any) -> any:
+		"""Run
+
+		Adds the item to the current group for the key, and returns its
+		result once the group has been passed to the function. If the function
+		raises an exception, every caller in the group gets it
+
+		Arguments:
+			key (str): The key that identifies items that can be grouped
+			item (any): The item to pass to the function
+
+		Returns:
+			any
+		"""
+
+		with self._lock:
+
+			# Add the item to the current group, or start a new one
+			try:
+				oGroup = self._groups[key]
+				bLeader = False
+			except KeyError:
+				oGroup = _Group()
+				self._groups[key] = oGroup
+				bLeader = True
+			iIndex = len(oGroup.items)
+			oGroup.items.append(item)
+
+			# If the group is full, close it and let the leader know
+			if len(oGroup.items) >= self._size:
+				del self._groups[key]
+				oGroup.full.set()
+
+		# If someone else is making the call, wait for it
+		if not bLeader:
+			oGroup.done.wait()
+			if oGroup.error is not None:
+				raise oGroup.error
+			return oGroup.results[iIndex]
+
+		# Wait for the window, or for the group to fill up, then close it if
+		#	it hasn't been already
+		oGroup.full.wait(self._wait)
+		with self._lock:
+			if self._groups.get(key) is oGroup:
+				del self._groups[key]
+			self._calls += 1
+			self._items += len(oGroup.items)
+
+		# Make the call
+		try:
+			oGroup.results = self._func(key, oGroup.items)
+		except BaseException as e:
+			oGroup.error = e
+			raise
+
+		# Whatever happens, let anyone waiting know
+		finally:
+			oGroup.done.set()
+
+		# Return our result
+		return oGroup.results[0]
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the number of calls made to the function and the number of
+		items passed to it
+
+		Returns:
+			dict
+		"""
+		with self._lock:
+			return {
+				'calls': self._calls,
+				'items': self._items
+			}
\ No newline at end of file
@@ -0,0 +1,346 @@
+# coding=utf8
+"""Cache
+
+Holds the class used to keep a size limited, least recently used, cache of
+values that expire
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'Cache', 'canonical' ]
+
+# Python imports
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+def canonical(val: Any) -> Any:
+	"""Canonical
+
+	Returns a version of the value where the keys of every dict are sorted so
+	that two values that are equal always encode to the same string
+
+	Arguments:
+		val (any): The value to make canonical
+
+	Returns:
+		any
+	"""
+
+	# If we have a dict, return its pairs sorted by key
+	if isinstance(val, dict):
+		return [ [ k, canonical(val[k]) ] for k in sorted(val) ]
+
+	# If we have a list, make each element canonical
+	if isinstance(val, (list, tuple)):
+		return [ canonical(v) for v in val ]
+
+	# Anything else is fine as is
+	return val
+
+class Cache(object):
+	"""Cache
+
+	A thread safe, least recently used, cache of values that expire. Once a
+	value is past its ttl it can still be returned, marked stale, for as long
+	as its stale time allows
+	"""
+
+	FRESH = 1
+	"""The value returned is still within its ttl"""
+
+	STALE = 2
+	"""The value returned is past its ttl, but within its stale time"""
+
+	EXPIRED = 3
+	"""The value returned is past its stale time, only returned if asked for"""
+
+	def __init__(self,
+		max_bytes: int = 67108864,
+		max_entries: int | None = None
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			max_bytes (uint): The maximum total size of the values stored,
+				defaults to 64MB
+			max_entries (uint): Optional, the maximum number of values stored
+
+		Raises:
+			ValueError
+
+		Returns:
+			Cache
+		"""
+
+		# Make sure the limits are valid
+		try:
+			self._max_bytes = int(max_bytes)
+			if self._max_bytes < 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('max_bytes', 'must be an int greater than 0')
+		if max_entries is not None:
+			try:
+				max_entries = int(max_entries)
+				if max_entries < 1: raise ValueError()
+			except (TypeError, ValueError):
+				raise ValueError('max_entries', 'must be an int greater than 0')
+		self._max_entries = max_entries
+
+		# Init the values, the total size, and the lock
+		self._values = OrderedDict()
+		self._bytes = 0
+		self._lock = Lock()
+
+		# Init the stats
+		self._hits = 0
+		self._misses = 0
+		self._stale = 0
+		self._evictions = 0
+
+	def __contains__(self, key: str) -> bool:
+		"""Contains (__contains__)
+
+		Python magic method that returns True if the key is in the cache and
+		still usable, fresh or stale
+
+		Arguments:
+			key (str): The key to check
+
+		Returns:
+			bool
+		"""
+		with self._lock:
+			try:
+				return self._values[key][3] > monotonic()
+			except KeyError:
+				return False
+
+	def __len__(self) -> int:
+		"""Length (__len__)
+
+		Python magic method that returns the number of values stored
+
+		Returns:
+			uint
+		"""
+		return len(self._values)
+
+	def _evict(self):
+		"""Evict
+
+		Removes the least recently used values until the cache is within its
+		limits. Assumes the lock is already held
+
+		Returns:
+			None
+		"""
+		while self._values and (
+			self._bytes > self._max_bytes or (
+				self._max_entries is not None and
+				len(self._values) > self._max_entries
+			)
+		):
+			t = self._values.popitem(last = False)[1]
+			self._bytes -= t[1]
+			self._evictions += 1
+
+	def clear(self, prefix: str | None = None):
+		"""Clear
+
+		Removes all values, or only those whose key starts with the prefix
+
+		Arguments:
+			prefix (str): Optional, the start of the keys to remove
+
+		Returns:
+			None
+		"""
+		with self._lock:
+
+			# If there's no prefix, clear everything
+			if prefix is None:
+				self._values.clear()
+				self._bytes = 0
+
+			# Else, only remove the matching keys
+			else:
+				for k in [ k for k in self._values if k.startswith(prefix) ]:
+					self._bytes -= self._values.pop(k)[1]
+
+	def delete(self, key: str) -> bool:
+		"""Delete
+
+		Removes a single value
+
+		Arguments:
+			key (str): The key of the value to remove
+
+		Returns:
+			bool: True if the value existed
+		"""
+		with self._lock:
+			try:
+				self._bytes -= self._values.pop(key)[1]
+				return True
+			except KeyError:
+				return False
+
+	def get(self, key: str, expired: bool = False) -> tuple:
+		"""Get
+
+		Returns the value associated with the key and its state, FRESH or
+		STALE, or ( None, None ) if the value doesn't exist or has completely
+		expired
+
+		Arguments:
+			key (str): The key of the value to return
+			expired (bool): Optional, set to True to get completely expired
+				values, marked EXPIRED, instead of removing them, so they can
+				be revalidated. Still counted as a miss
+
+		Returns:
+			( any, int | None )
+		"""
+
+		# Get the current time
+		fNow = monotonic()
+
+		with self._lock:
+
+			# Find the value
+			try:
+				t = self._values[key]
+
+			# If it doesn't exist, count the miss
+			except KeyError:
+				self._misses += 1
+				return ( None, None )
+
+			# If it's completely expired, count the miss, and return it if
+			#	asked, else remove it
+			if t[3] <= fNow:
+				self._misses += 1
+				if expired:
+					return ( t[0], self.EXPIRED )
+				del self._values[key]
+				self._bytes -= t[1]
+				return ( None, None )
+
+			# Mark it as the most recently used
+			self._values.move_to_end(key)
+
+			# If it's still fresh
+			if t[2] > fNow:
+				self._hits += 1
+				return ( t[0], self.FRESH )
+
+			# Else, it's stale
+			self._stale += 1
+			return ( t[0], self.STALE )
+
+	def set(self,
+		key: str,
+		value: Any,
+		ttl: float,
+		stale: float = 0,
+		size: int | None = None
+	):
+		"""Set
+
+		Stores a value under the key
+
+		Arguments:
+			key (str): The key to store the value under
+			value (any): The value to store
+			ttl (float): The number of seconds the value is fresh for
+			stale (float): The number of seconds after the ttl that the value
+				can still be returned as stale
+			size (uint): Optional, the size of the value in bytes, required if
+				the value is not a str or bytes. A str is measured once
+				encoded as UTF-8, not by its number of characters
+
+		Raises:
+			ValueError
+
+		Returns:
+			None
+		"""
+
+		# If we didn't get a size, figure it out from the value
+		if size is None:
+			size = Cache.size(value)
+
+		# If the value is bigger than the entire cache, don't bother
+		if size > self._max_bytes:
+			return
+
+		# Calculate the expiry times
+		fNow = monotonic()
+		fFresh = fNow + ttl
+		fStale = fFresh + max(0, stale)
+
+		with self._lock:
+
+			# If the key already exists, remove its size
+			try:
+				self._bytes -= self._values.pop(key)[1]
+			except KeyError:
+				pass
+
+			# Store the value, add its size, and make room if necessary
+			self._values[key] = ( value, size, fFresh, fStale )
+			self._bytes += size
+			self._evict()
+
+	@staticmethod
+	def size(value: str | bytes | bytearray) -> int:
+		"""Size
+
+		Returns the number of bytes a str or bytes value takes up, a str is
+		measured encoded as UTF-8, as any character outside of ASCII takes
+		up more than one byte
+
+		Arguments:
+			value (str | bytes | bytearray): The value to measure
+
+		Raises:
+			ValueError
+
+		Returns:
+			uint
+		"""
+		if isinstance(value, str):
+			return len(value.encode('utf-8'))
+		if not isinstance(value, (bytes, bytearray)):
+			raise ValueError('size', 'required for non-string values')
+		return len(value)
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the current statistics of the cache
+
+		Returns:
+			dict
+		"""
+		with self._lock:
+			iTotal = self._hits + self._stale + self._misses
+			return {
+				'bytes': self._bytes,
+				'entries': len(self._values),
+				'evictions': self._evictions,
+				'hits': self._hits,
+				'misses': self._misses,
+				'ratio': iTotal and \
+					((self._hits + self._stale) / iTotal) or 0.0,
+				'stale': self._stale
+			}
\ No newline at end of file
@@ -0,0 +1,419 @@
+# coding=utf8
+"""Cached
+
+Holds the decorator used to cache the Responses of a noun's read method in the
+process running the service, and the functions used to invalidate them when
+the noun is written to
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'cached', 'clear', 'invalidates', 'settings', 'stats' ]
+
+# Ouroboros imports
+from config import config
+import jsonb
+
+# Python imports
+from collections.abc import Callable
+from functools import wraps
+import inspect
+import os
+import pickle
+from threading import Lock
+
+# Local imports
+from body import stream
+from body.cache import Cache, canonical
+from body.response import Response
+
+ATTRIBUTE = '_body_cached'
+"""The attribute the settings are stored under on the noun's method"""
+
+__cache = None
+"""The cache shared by every service in the process"""
+
+__generations = {}
+"""The number of clears of everything (None), of a service, and of a noun of
+a service ( service, noun ), used to avoid storing reads that started before
+a write finished"""
+
+__lock = Lock()
+"""Lock used to create the cache, modify the generations, and store Responses
+once the generation is checked"""
+
+def _after_fork():
+	"""After Fork
+
+	Called in child processes after a fork, the lock could have been held by
+	a thread that no longer exists, so start over
+
+	Returns:
+		None
+	"""
+	global __cache, __lock
+	__cache = None
+	__generations.clear()
+	__lock = Lock()
+
+# Make sure forked processes get their own cache
+os.register_at_fork(after_in_child = _after_fork)
+
+def _cache() -> Cache:
+	"""Cache
+
+	Returns the cache shared by all services, creating it if necessary from
+	config.body.rest.cache
+
+	Raises:
+		ValueError
+
+	Returns:
+		Cache
+	"""
+	global __cache
+
+	# If we don't have one yet, create it
+	if __cache is None:
+		with __lock:
+			if __cache is None:
+				dConf = config.body.rest.cache({
+					'max_bytes': 67108864,
+					'max_entries': None
+				})
+				try:
+					__cache = Cache(dConf['max_bytes'], dConf['max_entries'])
+				except ValueError as e:
+					raise ValueError(
+						'config.body.rest.cache.%s' % e.args[0], e.args[1]
+					)
+
+	# Return the cache
+	return __cache
+
+def _prefix(service: str, noun: str | None = None) -> str:
+	"""Prefix
+
+	Returns the start of the keys of every Response cached for the service,
+	or for one noun of the service
+
+	Arguments:
+		service (str): The name of the service
+		noun (str): Optional, the noun
+
+	Returns:
+		str
+	"""
+	return noun is None and ('%s\n' % service) or \
+		('%s\n%s\n' % ( service, noun ))
+
+def _generation(service: str, noun: str) -> tuple:
+	"""Generation
+
+	Returns the number of times everything, the service, and the noun have
+	been cleared, any of which changing means the noun was written to
+
+	Arguments:
+		service (str): The name of the service
+		noun (str): The noun
+
+	Returns:
+		( uint, uint, uint )
+	"""
+	return (
+		__generations.get(None, 0),
+		__generations.get(service, 0),
+		__generations.get(( service, noun ), 0)
+	)
+
+def _lookup(
+	service: str,
+	noun: str,
+	session: bool | str,
+	req: dict
+) -> tuple:
+	"""Lookup
+
+	Generates the key of a request from the service, noun, data, and session,
+	and returns it along with a copy of the Response cached under it, if
+	there is one. If the request can't be cached, the key is None
+
+	Arguments:
+		service (str): The name of the service
+		noun (str): The noun
+		session (bool | str): The session setting of the decorator
+		req (dict): The request details
+
+	Returns:
+		( str | None, Response | None )
+	"""
+
+	# Generate the session part of the key
+	if session is False:
+		sSession = ''
+	elif session is True:
+		sSession = req.get('session') and req['session'].key() or None
+	else:
+		mUser = _user(req, session)
+		sSession = mUser is not None and jsonb.encode(mUser) or None
+
+	# If the session part is missing, the request can't be cached
+	if sSession is None:
+		return ( None, None )
+
+	# Generate the key
+	sKey = '%s%s\n%s' % (
+		_prefix(service, noun),
+		('data' in req and req['data'] is not None) and \
+			jsonb.encode(canonical(req['data'])) or '',
+		sSession
+	)
+
+	# If we have it, return a copy of it
+	bRaw = _cache().get(sKey)[0]
+	return ( sKey, bRaw is not None and \
+		Response.from_dict(pickle.loads(bRaw)) or None )
+
+def _store(
+	service: str,
+	noun: str,
+	generation: tuple,
+	key: str,
+	ttl: float,
+	response: any
+):
+	"""Store
+
+	Stores a Response if it worked, isn't a stream, and the noun wasn't
+	written to while it was generated
+
+	Arguments:
+		service (str): The name of the service
+		noun (str): The noun
+		generation (tuple): The generation of the noun before the Response
+			was generated, see _generation
+		key (str): The key to store it under
+		ttl (float): The number of seconds to store it for
+		response (any): What the method returned
+
+	Returns:
+		None
+	"""
+
+	# If it failed, or is a stream, it can't be stored
+	if not isinstance(response, Response) or response.error or \
+		stream.is_stream(response.data):
+		return
+
+	# Encode it
+	try:
+		bRaw = pickle.dumps(response.to_dict())
+	except Exception:
+		return
+
+	# Store it, as long as the noun wasn't written to. Checked under the same
+	#	lock clear counts writes under, so a write can't finish in between
+	oCache = _cache()
+	with __lock:
+		if _generation(service, noun) == generation:
+			oCache.set(key, bRaw, ttl, 0, len(bRaw))
+
+def _user(req: dict, path: str) -> any:
+	"""User
+
+	Returns the value found at the dot separated path in the session of the
+	request, or None if there's no session, or nothing at the path
+
+	Arguments:
+		req (dict): The request details
+		path (str): The path in the session, e.g. 'user._id'
+
+	Returns:
+		any
+	"""
+	try:
+		m = req['session']
+		for s in path.split('.'):
+			m = m[s]
+		return m
+	except (KeyError, IndexError, TypeError):
+		return None
+
+def cached(
+	ttl: float = 60,
+	session: bool | str = False
+) -> Callable:
+	"""Cached
+
+	Decorator used on the read method of a noun to cache its Responses in the
+	process running the service. Responses are keyed by the noun, the data
+	sent, and optionally the session, and are removed when the create,
+	update, or delete method of the same noun succeeds, or the service is
+	reset
+
+	class MyService(Service):
+
+		@cached(300, session = 'user._id')
+		def permissions_read(self, req):
+			...
+
+	Arguments:
+		ttl (float): Optional, the number of seconds a Response is cached
+		session (bool | str): Optional, False to share Responses between
+			every session, True to key them by the session, or the dot
+			separated path of a value in the session to key them by, e.g.
+			'user._id'. Requests without it aren't cached
+
+	Raises:
+		ValueError
+
+	Returns:
+		callable
+	"""
+
+	# Validate the settings
+	try:
+		fTTL = float(ttl)
+		if fTTL <= 0: raise ValueError()
+	except (TypeError, ValueError):
+		raise ValueError('ttl', 'must be a number greater than 0')
+	if not isinstance(session, (bool, str)) or session == '':
+		raise ValueError('session', 'must be a bool or a path in the session')
+
+	def decorator(func: Callable) -> Callable:
+
+		# Get the noun from the name of the method
+		if not func.__name__.endswith('_read'):
+			raise ValueError('func', 'must be the read method of a noun')
+		sNoun = func.__name__[:-5]
+
+		# If the method is async, wait for it
+		if inspect.iscoroutinefunction(func):
+			@wraps(func)
+			async def wrapper(self, req: dict) -> Response:
+				sKey, oResponse = _lookup(self._name, sNoun, session, req)
+				if oResponse is None:
+					tGeneration = _generation(self._name, sNoun)
+					oResponse = await func(self, req)
+					if sKey is not None:
+						_store(
+							self._name, sNoun, tGeneration, sKey, fTTL,
+							oResponse
+						)
+				return oResponse
+
+		# Else, just call it
+		else:
+			@wraps(func)
+			def wrapper(self, req: dict) -> Response:
+				sKey, oResponse = _lookup(self._name, sNoun, session, req)
+				if oResponse is None:
+					tGeneration = _generation(self._name, sNoun)
+					oResponse = func(self, req)
+					if sKey is not None:
+						_store(
+							self._name, sNoun, tGeneration, sKey, fTTL,
+							oResponse
+						)
+				return oResponse
+
+		# Store the settings on the wrapper and return it
+		setattr(wrapper, ATTRIBUTE, { 'session': session, 'ttl': fTTL })
+		return wrapper
+
+	return decorator
+
+def clear(service: str | None = None, noun: str | None = None):
+	"""Clear
+
+	Removes every cached Response, or those of one service, or those of one
+	noun of one service
+
+	Arguments:
+		service (str): Optional, the name of the service
+		noun (str): Optional, the noun
+
+	Returns:
+		None
+	"""
+
+	# Count the write so reads already running aren't stored
+	if service is None:
+		mKey = None
+	elif noun is None:
+		mKey = service
+	else:
+		mKey = ( service, noun )
+	with __lock:
+		__generations[mKey] = __generations.get(mKey, 0) + 1
+
+	# If there's no cache yet, there's nothing to remove
+	if __cache is None:
+		return
+
+	# Remove the Responses
+	__cache.clear(service is not None and _prefix(service, noun) or None)
+
+def invalidates(service: str, noun: str, func: Callable) -> Callable:
+	"""Invalidates
+
+	Returns a version of a noun's create, update, or delete method that
+	removes the cached Responses of the noun once it succeeds
+
+	Arguments:
+		service (str): The name of the service
+		noun (str): The noun
+		func (callable): The method
+
+	Returns:
+		callable
+	"""
+	# If the method is async, wait for it
+	if inspect.iscoroutinefunction(func):
+		@wraps(func)
+		async def wrapper(req: dict) -> Response:
+			oResponse = await func(req)
+			if not isinstance(oResponse, Response) or not oResponse.error:
+				clear(service, noun)
+			return oResponse
+
+	# Else, just call it
+	else:
+		@wraps(func)
+		def wrapper(req: dict) -> Response:
+			oResponse = func(req)
+			if not isinstance(oResponse, Response) or not oResponse.error:
+				clear(service, noun)
+			return oResponse
+
+	# Return the new method
+	return wrapper
+
+def settings(func: Callable) -> dict | None:
+	"""Settings
+
+	Returns the settings stored on a noun's read method by the decorator, or
+	None if it wasn't decorated
+
+	Arguments:
+		func (callable): The method
+
+	Returns:
+		dict | None
+	"""
+	return getattr(func, ATTRIBUTE, None)
+
+def stats() -> dict:
+	"""Stats
+
+	Returns the current statistics of the cache, see body.cache.Cache.stats
+
+	Returns:
+		dict
+	"""
+	return _cache().stats()
\ No newline at end of file
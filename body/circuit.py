@@ -0,0 +1,264 @@
+# coding=utf8
+"""Circuit
+
+Holds the class used to stop sending requests to a service that is failing
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'Circuit' ]
+
+# Python imports
+from threading import Lock
+from time import monotonic
+
+class Circuit(object):
+	"""Circuit
+
+	A circuit breaker. Keeps track of successes and failures over a rolling
+	window of seconds, and once the rate of failures crosses the threshold the
+	circuit opens and no requests are allowed. After the cooldown a limited
+	number of probes are allowed through, half open, and if they succeed the
+	circuit closes again, else it re-opens
+	"""
+
+	CLOSED = 'closed'
+	"""Requests are allowed"""
+
+	HALF_OPEN = 'half_open'
+	"""Only probe requests are allowed"""
+
+	OPEN = 'open'
+	"""No requests are allowed"""
+
+	def __init__(self,
+		threshold: float = 0.5,
+		minimum: int = 20,
+		window: int = 10,
+		cooldown: float = 5,
+		probes: int = 1
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			threshold (float): The rate of failures, 0 to 1, that opens the
+				circuit
+			minimum (uint): The minimum number of requests in the window before
+				the rate is checked
+			window (uint): The number of seconds to keep track of
+			cooldown (float): The number of seconds the circuit stays open
+				before allowing probes
+			probes (uint): The number of requests allowed at once while half
+				open
+
+		Raises:
+			ValueError
+
+		Returns:
+			Circuit
+		"""
+
+		# Validate the settings
+		try:
+			self._threshold = float(threshold)
+			if not 0 < self._threshold <= 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('threshold', 'must be a number from 0 to 1')
+		for k, v in ( ( 'minimum', minimum ), ( 'window', window ),
+					( 'probes', probes ) ):
+			try:
+				if int(v) < 1: raise ValueError()
+			except (TypeError, ValueError):
+				raise ValueError(k, 'must be an int greater than 0')
+		try:
+			self._cooldown = float(cooldown)
+			if self._cooldown < 0: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('cooldown', 'must be a number of 0 or greater')
+
+		# Store the rest of the settings
+		self._minimum = int(minimum)
+		self._window = int(window)
+		self._probes = int(probes)
+
+		# Init the state
+		self._lock = Lock()
+		self._state = self.CLOSED
+		self._opened = 0.0
+		self._probing = 0
+		self._trips = 0
+		self._rejected = 0
+
+		# Init the buckets, one per second in the window, each is the second
+		#	it represents, the total requests, and the failures
+		self._buckets = [ [ 0, 0, 0 ] for i in range(self._window) ]
+
+	def _bucket(self, now: float) -> list:
+		"""Bucket
+
+		Returns the bucket for the current second, resetting it if it was last
+		used for an older second. Assumes the lock is held
+
+		Arguments:
+			now (float): The current time
+
+		Returns:
+			list
+		"""
+		iSecond = int(now)
+		l = self._buckets[iSecond % self._window]
+		if l[0] != iSecond:
+			l[0] = iSecond
+			l[1] = 0
+			l[2] = 0
+		return l
+
+	def _counts(self, now: float) -> tuple:
+		"""Counts
+
+		Returns the total requests and failures within the window. Assumes the
+		lock is held
+
+		Arguments:
+			now (float): The current time
+
+		Returns:
+			( uint, uint )
+		"""
+		iOldest = int(now) - self._window
+		iTotal = 0
+		iFailed = 0
+		for l in self._buckets:
+			if l[0] > iOldest:
+				iTotal += l[1]
+				iFailed += l[2]
+		return ( iTotal, iFailed )
+
+	def allow(self) -> bool:
+		"""Allow
+
+		Returns True if a request can be made. Every call that returns True
+		must be followed by a call to success() or failure()
+
+		Returns:
+			bool
+		"""
+		with self._lock:
+
+			# If we're closed, everything is allowed
+			if self._state == self.CLOSED:
+				return True
+
+			# If we're open
+			if self._state == self.OPEN:
+
+				# If the cooldown hasn't passed, reject the request
+				if monotonic() - self._opened < self._cooldown:
+					self._rejected += 1
+					return False
+
+				# Else, switch to half open
+				self._state = self.HALF_OPEN
+				self._probing = 0
+
+			# We're half open, if we have room for another probe
+			if self._probing < self._probes:
+				self._probing += 1
+				return True
+
+			# Else, reject the request
+			self._rejected += 1
+			return False
+
+	def failure(self):
+		"""Failure
+
+		Records a failed request
+
+		Returns:
+			None
+		"""
+		fNow = monotonic()
+		with self._lock:
+
+			# If we're probing, the probe failed, re-open the circuit
+			if self._state == self.HALF_OPEN:
+				self._state = self.OPEN
+				self._opened = fNow
+				self._probing = 0
+				self._trips += 1
+				return
+
+			# Add the failure to the current bucket
+			l = self._bucket(fNow)
+			l[1] += 1
+			l[2] += 1
+
+			# If we're closed, and we have enough requests to check the rate
+			if self._state == self.CLOSED:
+				iTotal, iFailed = self._counts(fNow)
+				if iTotal >= self._minimum and \
+					(iFailed / iTotal) >= self._threshold:
+					self._state = self.OPEN
+					self._opened = fNow
+					self._trips += 1
+
+	@property
+	def state(self) -> str:
+		"""State
+
+		Returns the current state of the circuit
+
+		Returns:
+			'closed' | 'half_open' | 'open'
+		"""
+		return self._state
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the current state, the requests and failures in the window,
+		the number of times the circuit has opened, and the number of requests
+		rejected
+
+		Returns:
+			dict
+		"""
+		with self._lock:
+			iTotal, iFailed = self._counts(monotonic())
+			return {
+				'failures': iFailed,
+				'rejected': self._rejected,
+				'requests': iTotal,
+				'state': self._state,
+				'trips': self._trips
+			}
+
+	def success(self):
+		"""Success
+
+		Records a successful request
+
+		Returns:
+			None
+		"""
+		fNow = monotonic()
+		with self._lock:
+
+			# If we're probing, the service is back, close the circuit and
+			#	forget the old failures
+			if self._state == self.HALF_OPEN:
+				self._state = self.CLOSED
+				self._probing = 0
+				for l in self._buckets:
+					l[0] = 0
+
+			# Add the success to the current bucket
+			self._bucket(fNow)[1] += 1
\ No newline at end of file
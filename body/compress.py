@@ -0,0 +1,178 @@
+# coding=utf8
+"""Compress
+
+Registry of the codecs used to compress request and response bodies sent
+between services
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'codecs', 'compress', 'decompress', 'negotiate', 'register' ]
+
+# Python imports
+from collections.abc import Callable
+import zlib
+
+def _zlib(wbits: int) -> tuple:
+	"""ZLib
+
+	Generates the compress and decompress functions for one of the formats
+	supported by zlib
+
+	Arguments:
+		wbits (int): The zlib window bits, which decide the format
+
+	Returns:
+		( callable, callable )
+	"""
+
+	# Compress
+	def compress(data: bytes, level: int) -> bytes:
+		o = zlib.compressobj(level, zlib.DEFLATED, wbits)
+		return o.compress(data) + o.flush()
+
+	# Decompress, limited to a maximum size so a small body can't become a
+	#	huge one
+	def decompress(data: bytes, limit: int | None) -> bytes:
+		o = zlib.decompressobj(wbits)
+		b = o.decompress(data, limit or 0)
+		if not o.unconsumed_tail:
+			b += o.flush()
+		if o.unconsumed_tail or (limit and len(b) > limit):
+			raise ValueError('decompressed data is larger than %d bytes' % limit)
+		return b
+
+	# Return both
+	return ( compress, decompress )
+
+__codecs = {
+	'gzip': _zlib(31),
+	'deflate': _zlib(15)
+}
+"""Registered codecs by their Content-Encoding name, in order of preference"""
+
+def codecs() -> list:
+	"""Codecs
+
+	Returns the names of all registered codecs in order of preference
+
+	Returns:
+		str[]
+	"""
+	return list(__codecs.keys())
+
+def compress(name: str, data: bytes, level: int = 6) -> bytes:
+	"""Compress
+
+	Compresses the data using the named codec
+
+	Arguments:
+		name (str): The name of the codec
+		data (bytes): The data to compress
+		level (int): The level of compression, meaning depends on the codec
+
+	Raises:
+		KeyError: if the codec doesn't exist
+
+	Returns:
+		bytes
+	"""
+	return __codecs[name][0](data, level)
+
+def decompress(name: str, data: bytes, limit: int | None = None) -> bytes:
+	"""Decompress
+
+	Decompresses the data using the named codec
+
+	Arguments:
+		name (str): The name of the codec
+		data (bytes): The data to decompress
+		limit (uint): Optional, the maximum size of the decompressed data
+
+	Raises:
+		KeyError: if the codec doesn't exist
+		ValueError: if the data is invalid or too large
+
+	Returns:
+		bytes
+	"""
+	try:
+		return __codecs[name.strip().lower()][1](data, limit)
+	except zlib.error as e:
+		raise ValueError(str(e))
+
+def negotiate(accept: str | None) -> str | None:
+	"""Negotiate
+
+	Returns the name of the registered codec to use based on the value of an
+	Accept-Encoding header, or None if there isn't one in common
+
+	Arguments:
+		accept (str): The value of the Accept-Encoding header
+
+	Returns:
+		str | None
+	"""
+
+	# If there's no header, nothing is accepted
+	if not accept:
+		return None
+
+	# Go through each encoding and store its quality
+	dQuality = {}
+	for s in accept.split(','):
+		l = s.strip().lower().split(';')
+		fQuality = 1.0
+		for p in l[1:]:
+			p = p.strip()
+			if p.startswith('q='):
+				try: fQuality = float(p[2:])
+				except ValueError: fQuality = 0.0
+		dQuality[l[0].strip()] = fQuality
+
+	# Find the best codec we have, ties go to our preferred order
+	sBest = None
+	fBest = 0.0
+	for sName in __codecs:
+		fQuality = dQuality.get(sName, dQuality.get('*', 0.0))
+		if fQuality > fBest:
+			sBest = sName
+			fBest = fQuality
+
+	# Return the best, if any
+	return sBest
+
+def register(
+	name: str,
+	compress: Callable[[bytes, int], bytes],
+	decompress: Callable[[bytes, int | None], bytes]
+):
+	"""Register
+
+	Adds a codec, or replaces an existing one. Newly added codecs are
+	preferred over existing ones when negotiating
+
+	register('br',
+		lambda data, level: brotli.compress(data, quality = level),
+		lambda data, limit: brotli.decompress(data)
+	)
+
+	Arguments:
+		name (str): The Content-Encoding name of the codec
+		compress (callable): Takes the data and level, returns the compressed
+			data
+		decompress (callable): Takes the data and maximum size, returns the
+			decompressed data
+
+	Returns:
+		None
+	"""
+	global __codecs
+	__codecs = { name.lower(): ( compress, decompress ), **{
+		k: v for k,v in __codecs.items() if k != name.lower()
+	} }
\ No newline at end of file
@@ -0,0 +1,145 @@
+# coding=utf8
+"""Conditional
+
+Holds the decorator used to declare how clients can cache the reads of a
+noun, and the functions used to generate and compare ETags
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'conditional', 'generate', 'matches', 'settings', 'versioned' ]
+
+# Python imports
+from collections.abc import Callable
+from hashlib import blake2b
+
+ATTRIBUTE = '_body_conditional'
+"""The attribute the settings are stored under on the noun's method"""
+
+def conditional(
+	cache_control: str | None = None,
+	etag: bool = True,
+	version: Callable[[any, dict], str | None] | None = None
+) -> Callable:
+	"""Conditional
+
+	Decorator used on the read method of a noun to declare the Cache-Control
+	header sent with it, and whether it gets an ETag. If a client sends the
+	ETag back in an If-None-Match header and it still matches, it gets a 304
+	with no body
+
+	class MyService(Service):
+
+		def _config_version(self, req):
+			return self._config_version
+
+		@conditional('public, max-age=60', version = _config_version)
+		def config_read(self, req):
+			...
+
+	Arguments:
+		cache_control (str): Optional, the value of the Cache-Control header
+		etag (bool): Optional, set to False to never send an ETag
+		version (callable): Optional, called with the service instance and
+			the request details before the method is called, returns a string
+			that changes whenever the Response would, or None if it doesn't
+			know. If the client already has the version the method isn't
+			called at all. Without it, the ETag is generated from the encoded
+			Response
+
+	Returns:
+		callable
+	"""
+
+	# Store the settings on the method and return it as is
+	def decorator(func: Callable) -> Callable:
+		setattr(func, ATTRIBUTE, {
+			'cache_control': cache_control,
+			'etag': bool(etag),
+			'version': version
+		})
+		return func
+	return decorator
+
+def generate(body: bytes | str) -> str:
+	"""Generate
+
+	Returns a weak ETag generated from the hash of the encoded Response. The
+	ETags are weak as the same Response can be sent compressed or not
+
+	Arguments:
+		body (bytes | str): The encoded Response
+
+	Returns:
+		str
+	"""
+	if isinstance(body, str):
+		body = body.encode('utf-8')
+	return 'W/"%s"' % blake2b(body, digest_size = 16).hexdigest()
+
+def matches(header: str | None, etag: str) -> bool:
+	"""Matches
+
+	Returns True if the value of an If-None-Match header matches the ETag,
+	using weak comparison
+
+	Arguments:
+		header (str): The value of the If-None-Match header
+		etag (str): The current ETag
+
+	Returns:
+		bool
+	"""
+
+	# If there's no header, there's nothing to match
+	if not header:
+		return False
+
+	# Strip the weak indicator from our ETag
+	if etag.startswith('W/'):
+		etag = etag[2:]
+
+	# Go through each ETag in the header and look for ours
+	for s in header.split(','):
+		s = s.strip()
+		if s == '*':
+			return True
+		if s.startswith('W/'):
+			s = s[2:]
+		if s == etag:
+			return True
+
+	# Not found
+	return False
+
+def settings(func: Callable) -> dict | None:
+	"""Settings
+
+	Returns the settings stored on a noun's method by the decorator, or None
+	if it wasn't decorated
+
+	Arguments:
+		func (callable): The method
+
+	Returns:
+		dict | None
+	"""
+	return getattr(func, ATTRIBUTE, None)
+
+def versioned(version: any) -> str:
+	"""Versioned
+
+	Returns a weak ETag generated from a version supplied by the noun
+
+	Arguments:
+		version (any): The version, converted to a string
+
+	Returns:
+		str
+	"""
+	return 'W/"%s"' % str(version).replace('"', '')
\ No newline at end of file
@@ -17,4 +17,12 @@ EMPTY_UUID = '00000000-0000-4000-8000-000000000000'
 SECONDS_HOUR = 3600
 SECONDS_DAY = 86400
 SECONDS_WEEK = 604800
-"""Seconds related constants"""
\ No newline at end of file
+"""Seconds related constants"""
+
+LIST_ERRORS = 'List-Errors'
+"""The meta a __list request is sent with to get every request's Response,
+errors included, whatever the service is set to do with them"""
+
+MANY = '__many'
+"""The last part of the URI of a noun's create_many, update_many, and
+delete_many requests, it can't be mistaken for a noun"""
\ No newline at end of file
@@ -0,0 +1,118 @@
+# coding=utf8
+"""Deadline
+
+Keeps track of the time by which the current request must be done, so that it
+can be passed along to any other services called while handling it
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'current', 'expired', 'META', 'pop', 'push', 'remaining', 'within' ]
+
+# Python imports
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from time import time
+
+META = 'Deadline'
+"""The meta key, and X-Body- header, used to pass the deadline"""
+
+__current = ContextVar('body.deadline', default = None)
+"""The deadline of the current context, as a unix timestamp"""
+
+def current() -> float | None:
+	"""Current
+
+	Returns the deadline of the current context as a unix timestamp, or None
+	if there isn't one
+
+	Returns:
+		float | None
+	"""
+	return __current.get()
+
+def expired() -> bool:
+	"""Expired
+
+	Returns True if there is a deadline and it has passed
+
+	Returns:
+		bool
+	"""
+	fDeadline = __current.get()
+	return fDeadline is not None and fDeadline <= time()
+
+def pop(token: Token):
+	"""Pop
+
+	Restores the deadline that existed before the push that returned the token
+
+	Arguments:
+		token (Token): The value returned by push()
+
+	Returns:
+		None
+	"""
+	__current.reset(token)
+
+def push(until: float | None) -> Token:
+	"""Push
+
+	Sets the deadline for the current context. A deadline can only ever get
+	shorter, so if the current one is earlier, it's kept
+
+	Arguments:
+		until (float): The unix timestamp by which the work must be done
+
+	Returns:
+		Token: To pass to pop()
+	"""
+
+	# Keep the earlier of the two
+	fDeadline = __current.get()
+	if until is not None and (fDeadline is None or until < fDeadline):
+		fDeadline = until
+
+	# Set the deadline and return the token
+	return __current.set(fDeadline)
+
+def remaining() -> float | None:
+	"""Remaining
+
+	Returns the number of seconds left before the deadline, which can be
+	negative if it's passed, or None if there is no deadline
+
+	Returns:
+		float | None
+	"""
+	fDeadline = __current.get()
+	if fDeadline is None:
+		return None
+	return fDeadline - time()
+
+@contextmanager
+def within(seconds: float):
+	"""Within
+
+	Context manager that limits any requests made inside of it to the number
+	of seconds passed, or less if the current deadline is earlier
+
+	with deadline.within(2):
+		body.read('myservice', 'user', { 'data': { '_id': _id } })
+
+	Arguments:
+		seconds (float): The number of seconds allowed
+
+	Returns:
+		None
+	"""
+	oToken = push(time() + seconds)
+	try:
+		yield
+	finally:
+		pop(oToken)
\ No newline at end of file
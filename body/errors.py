@@ -14,6 +14,7 @@ REST_CONTENT_TYPE = 101
 REST_AUTHORIZATION = 102
 REST_LIST_TO_LONG = 103
 REST_LIST_INVALID_URI = 104
+REST_DEADLINE = 105
 """REST related errors"""
 
 SERVICE_ACTION = 200
@@ -26,6 +27,7 @@ SERVICE_TO_BE_USED_LATER = 206
 SERVICE_CRASHED = 207
 SERVICE_NO_DATA = 208
 SERVICE_NO_SESSION = 209
+SERVICE_TIMEOUT = 210
 """Service related errors"""
 
 RIGHTS = 1000
@@ -11,8 +11,11 @@ __email__		= "chris@ouroboroscoding.com"
 __created__		= "2025-04-06"
 
 __all__ = [
-	'create', 'delete', 'read', 'register_service', 'request', 'service_info',
-	'update'
+	'balancer_stats', 'batch', 'batch_stats', 'cache_clear', 'cache_stats',
+	'circuit_stats', 'coalesce_stats', 'create', 'create_many', 'delete',
+	'delete_many', 'gather', 'pool_stats', 'prewarm', 'read',
+	'register_service', 'reload_hosts', 'request', 'service_info',
+	'set_hosts', 'stream', 'update', 'update_many'
 ]
 
 # Ouroboros imports
@@ -22,96 +25,2095 @@ import jsonb
 import undefined
 
 # Python imports
-from copy import copy
-from time import sleep
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+import contextvars
+from copy import copy, deepcopy
+from functools import partial
+import inspect
+import os
+from random import random
+from threading import current_thread, Lock
+from time import monotonic, perf_counter, sleep, time
 
 # Pip imports
 import requests
-from typing import TYPE_CHECKING, MutableMapping
+from typing import List, TYPE_CHECKING, MutableMapping
 
 # Local imports
-from body import errors
-from body.response import Error, Response, ResponseException
+from body import compress, deadline, errors, formats, loop, metrics, \
+	stream as _stream
+from body.balancer import Balancer
+from body.batch import Batch, Window
+from body.cache import Cache, canonical
+from body.circuit import Circuit
+from body.constants import LIST_ERRORS, MANY
+from body.flight import Flight
+from body.response import Error, RawResponse, Response, \
+	ResponseException
 if TYPE_CHECKING:
 	from body.service import Service
 
 __services = None
 """Registered Services"""
 
-__action_to_request = {
-	'create': [ requests.post, 'POST' ],
-	'delete': [ requests.delete, 'DELETE' ],
-	'read': [ requests.get, 'GET' ],
-	'update': [ requests.put, 'PUT' ]
+__executor = None
+"""Shared pool of threads used to make requests concurrently"""
+
+__executor_lock = Lock()
+"""Lock used to make sure only one executor is ever created"""
+
+__cache = None
+"""Cache of read responses from external services"""
+
+__cache_keys = [ 'paths', 'session', 'stale', 'ttl' ]
+"""Valid keys in the cache section of a service"""
+
+__refreshing = set()
+"""Keys of stale cache values currently being refreshed"""
+
+__refreshing_lock = Lock()
+"""Lock used to modify the set of refreshing keys"""
+
+__flight = Flight()
+"""Coalesces identical reads in progress at the same time"""
+
+__call = contextvars.ContextVar('body_external_call', default = None)
+"""The details of the call currently being measured, if any"""
+
+__action_to_method = {
+	'create': 'POST',
+	'create_many': 'POST',
+	'delete': 'DELETE',
+	'delete_many': 'DELETE',
+	'read': 'GET',
+	'update': 'PUT',
+	'update_many': 'PUT'
+}
+"""Map actions to HTTP methods"""
+
+__pool_keys = [ 'block', 'keep_alive', 'prewarm', 'size' ]
+"""Valid keys in the pool section of a service"""
+
+__balance_defaults = {
+	'cooldown': 30,
+	'failures': 5,
+	'strategy': Balancer.ROUND_ROBIN
+}
+"""Default load balancing settings, and the valid keys in the balance section
+of a service"""
+
+__host_keys = [ 'domain', 'port', 'protocol' ]
+"""Valid keys in each host of a service"""
+
+__batch_defaults = { 'path': '__list', 'size': 10, 'window': 0 }
+"""Default batching settings, and the valid keys in the batch section of a
+service"""
+
+__isolation_modes = [ 'deep', 'none', 'shallow' ]
+"""Valid isolation modes for services running in the same process"""
+
+__batch_skip = [
+	'Content-Encoding', 'Content-Length', 'X-Body-%s' % deadline.META
+]
+"""Headers that don't stop reads from being sent together"""
+
+__retry_defaults = {
+	'actions': [
+		'create', 'create_many', 'delete', 'delete_many', 'read', 'update',
+		'update_many'
+	],
+	'attempts': 3,
+	'backoff': 0.1,
+	'errors': [ 'connection' ],
+	'jitter': 1.0,
+	'max': 1.0,
+	'multiplier': 2.0,
+	'statuses': []
 }
-"""Map actions to request methods"""
+"""Default retry policy, and the valid keys in the retry section of a
+service"""
+
+__retry_errors = [ 'connection', 'timeout' ]
+"""Valid types of errors that can be retried"""
+
+__compress_keys = [ 'codec', 'level', 'threshold' ]
+"""Valid keys in the compress section of a service"""
+
+__timeout_defaults = { 'connect': 5.0, 'read': 30.0 }
+"""Default timeouts, and the valid keys in the timeouts section of a
+service"""
+
+def _cache() -> Cache:
+	"""Cache
+
+	Returns the cache shared by all services, creating it if necessary from
+	config.body.external.cache
+
+	Returns:
+		Cache
+	"""
+
+	global __cache
+
+	# If we don't have one yet, create it
+	if __cache is None:
+		dConf = config.body.external.cache({
+			'max_bytes': 67108864,
+			'max_entries': None
+		})
+		try:
+			__cache = Cache(dConf['max_bytes'], dConf['max_entries'])
+		except ValueError as e:
+			raise ValueError(
+				'config.body.external.cache.%s' % e.args[0], e.args[1]
+			)
+
+	# Return the cache
+	return __cache
+
+def _cache_config(name: str, conf: dict | None) -> dict | None:
+	"""Cache Config
+
+	Validates and normalises the cache section of a service's config
+
+	Arguments:
+		name (str): The name of the service
+		conf (dict): The cache section of the service's config
+
+	Raises:
+		ValueError
+
+	Returns:
+		dict | None
+	"""
+
+	# If there's no section, the service isn't cached
+	if not conf:
+		return None
+
+	# Make sure we got a dict with valid keys
+	sName = 'config.body.rest.services.%s.cache' % name
+	if not isinstance(conf, dict):
+		raise ValueError(sName, 'must be a dict')
+	for k in conf:
+		if k not in __cache_keys:
+			raise ValueError('%s.%s' % (sName, k), 'invalid key')
+
+	# Generate the defaults for every path in the service
+	dRet = {
+		'ttl': float(conf.get('ttl', 0)),
+		'stale': float(conf.get('stale', 0)),
+		'session': bool(conf.get('session', True)),
+		'paths': {}
+	}
+
+	# Go through each path
+	dPaths = conf.get('paths', {})
+	if not isinstance(dPaths, dict):
+		raise ValueError('%s.paths' % sName, 'must be a dict')
+	for k,v in dPaths.items():
+
+		# If we got a number, it's just the ttl
+		if isinstance(v, (int, float)):
+			v = { 'ttl': v }
+
+		# Else, if we didn't get a dict
+		elif not isinstance(v, dict):
+			raise ValueError(
+				'%s.paths.%s' % (sName, k), 'must be a number or a dict'
+			)
+
+		# Store the path using the service values as defaults
+		dRet['paths'][k] = {
+			'ttl': float(v.get('ttl', dRet['ttl'])),
+			'stale': float(v.get('stale', dRet['stale'])),
+			'session': bool(v.get('session', dRet['session']))
+		}
+
+	# Return the settings
+	return dRet
+
+def _cache_settings(service: str, path: str) -> dict | None:
+	"""Cache Settings
+
+	Returns the cache settings for a specific path on a service, or None if
+	reads of the path are not cached
+
+	Arguments:
+		service (str): The name of the service
+		path (str): The path on the service
+
+	Returns:
+		dict | None
+	"""
+
+	# If the service has no cache settings
+	dCache = __services[service].get('cache')
+	if not dCache:
+		return None
+
+	# Get the settings for the path, or the service defaults
+	dSettings = dCache['paths'].get(path, dCache)
+
+	# Return the settings if we have a ttl
+	return dSettings['ttl'] > 0 and dSettings or None
+
+def _cached(
+	service: str,
+	path: str,
+	req: MutableMapping,
+	settings: dict,
+	data: str,
+	headers: dict,
+	until: float | None = None
+) -> Response:
+	"""Cached
+
+	Returns a read from the cache if it exists, else makes the request and
+	stores the result in the cache. Stale values are returned immediately
+	while a new copy is fetched in the background
+
+	Arguments:
+		service (str): The name of the service
+		path (str): The path on the service
+		req (dict): The request details
+		settings (dict): The cache settings for the path
+		data (str): The encoded data to send
+		headers (dict): The headers to send
+		until (float): Optional, the unix timestamp the request must be done
+			by
+
+	Returns:
+		Response
+	"""
+
+	# Generate the key from the service, path, data, and headers, optionally
+	#	without the session
+	sKey = _read_key(service, path, req, headers, settings['session'])
+
+	# Look for the value in the cache, including any expired copy, which
+	#	can still be revalidated if the service sent an ETag with it. If it
+	#	didn't, the copy is useless, remove it so it doesn't take up room
+	#	if the read fails
+	oCache = _cache()
+	tRaw, iState = oCache.get(sKey, True)
+	if iState == Cache.EXPIRED and not tRaw[2]:
+		oCache.delete(sKey)
+		tRaw, iState = None, None
+
+	# If we have nothing, fetch it, or if we have an expired copy, ask the
+	#	service if it's still current, then store it and return it. Only one
+	#	thread needs to make the request, the rest can wait for the result
+	if iState is None or iState == Cache.EXPIRED:
+		oResponse, tRaw = _coalesced(
+			service, path, sKey, req, data, headers, until, tRaw
+		)
+		if tRaw is not None and not oResponse.error:
+			oCache.set(
+				sKey, tRaw, settings['ttl'], settings['stale'],
+				Cache.size(tRaw[1])
+			)
+		return oResponse
+
+	# If it's stale, refresh it in the background
+	if iState == Cache.STALE:
+		_stale(sKey, service, path, settings, req, data, headers, tRaw)
+
+	# If the call is being measured, mark it as coming from the cache
+	dCall = __call.get()
+	if dCall is not None:
+		dCall['cached'] = True
+
+	# Return a new Response from the cached value
+	return RawResponse(tRaw[1], tRaw[0])
+
+def _coalesced(
+	service: str,
+	path: str,
+	key: str,
+	req: MutableMapping,
+	data: str,
+	headers: dict,
+	until: float | None = None,
+	raw: tuple | None = None
+) -> tuple:
+	"""Coalesced
+
+	Makes a read request unless an identical one is already in progress, in
+	which case it waits for it, until the deadline. Every caller gets its own
+	copy of the Response
+
+	Arguments:
+		service (str): The name of the service
+		path (str): The path on the service
+		key (str): The key that identifies the read
+		req (dict): The request details
+		data (str): The encoded data to send
+		headers (dict): The headers to send
+		until (float): Optional, the unix timestamp the request must be done
+			by
+		raw (tuple): Optional, an expired copy of the read to revalidate
+			instead of fetching a new one
+
+	Returns:
+		( Response, ( str, bytes | str, str | None ) | None )
+	"""
+
+	# Make the request, or wait for the one in progress, but no longer than
+	#	our own deadline allows
+	try:
+		if raw is None:
+			( oResponse, tRaw ), bShared = __flight.run(
+				key, _read, service, path, req, data, headers, until,
+				until = until
+			)
+		else:
+			( oResponse, tRaw ), bShared = __flight.run(
+				key, _revalidate, raw, service, path, data, headers, until,
+				until = until
+			)
+	except TimeoutError:
+		return ( Error(
+			errors.SERVICE_TIMEOUT,
+			'%s:read %s deadline exceeded' % ( service, path )
+		), None )
+
+	# If there's no body, the Response was generated locally, make sure no one
+	#	gets the original as it could be shared
+	if tRaw is None:
+		oResponse = Response.from_dict(deepcopy(oResponse.to_dict()))
+
+	# Else, if we got it from another call, make a copy so that nothing one
+	#	caller does to the Response affects the others
+	elif bShared:
+		oResponse = RawResponse(tRaw[1], tRaw[0])
+
+	# Return the Response and raw body
+	return ( oResponse, tRaw )
+
+def _read_key(
+	service: str,
+	path: str,
+	req: MutableMapping,
+	headers: dict,
+	session: bool = True
+) -> str:
+	"""Read Key
+
+	Generates the key that identifies identical reads from the service, path,
+	data, and every header they're sent with, e.g. the session and meta, but
+	not the deadline, which is different for every call. See _batch_key
+
+	Arguments:
+		service (str): The name of the service
+		path (str): The path on the service
+		req (dict): The request details
+		headers (dict): The headers the read is sent with
+		session (bool): Optional, set to False to ignore the session
+
+	Returns:
+		str
+	"""
+
+	# If the session is ignored, so is the header it's sent in
+	if not session:
+		headers = {
+			k: v for k,v in headers.items() if k != 'Authorization'
+		}
+
+	# Generate the key
+	return '\n'.join([
+		service,
+		path,
+		('data' in req and req['data']) and \
+			jsonb.encode(canonical(req['data'])) or '',
+		_batch_key(headers)
+	])
+
+def _refresh(
+	key: str,
+	service: str,
+	path: str,
+	settings: dict,
+	req: MutableMapping,
+	data: str,
+	headers: dict,
+	raw: tuple
+):
+	"""Refresh
+
+	Fetches a new copy of a stale cache value and stores it, or if the
+	service sent an ETag with it, asks the service if it's still current
+
+	Arguments:
+		key (str): The key of the value in the cache
+		service (str): The name of the service
+		path (str): The path on the service
+		settings (dict): The cache settings for the path
+		req (dict): The request details
+		data (str): The encoded data to send
+		headers (dict): The headers to send
+		raw (tuple): The stale copy
+
+	Returns:
+		None
+	"""
+	try:
+		if raw[2]:
+			oResponse, tRaw = _revalidate(raw, service, path, data, headers)
+		else:
+			oResponse, tRaw = _read(service, path, req, data, headers)
+		if tRaw is not None and not oResponse.error:
+			_cache().set(
+				key, tRaw, settings['ttl'], settings['stale'],
+				Cache.size(tRaw[1])
+			)
+	finally:
+		with __refreshing_lock:
+			__refreshing.discard(key)
+
+def _stale(
+	key: str,
+	service: str,
+	path: str,
+	settings: dict,
+	req: MutableMapping,
+	data: str,
+	headers: dict,
+	raw: tuple
+):
+	"""Stale
+
+	Starts fetching a new copy of a stale cache value in the background,
+	unless it's already being refreshed
+
+	Arguments:
+		key (str): The key of the value in the cache
+		service (str): The name of the service
+		path (str): The path on the service
+		settings (dict): The cache settings for the path
+		req (dict): The request details
+		data (str): The encoded data to send
+		headers (dict): The headers to send
+		raw (tuple): The stale copy
+
+	Returns:
+		None
+	"""
+
+	# If it's already being refreshed, there's nothing to do
+	with __refreshing_lock:
+		if key in __refreshing:
+			return
+		__refreshing.add(key)
+
+	# The refresh isn't bound by the caller's deadline
+	dHeaders = headers.copy()
+	dHeaders.pop('X-Body-%s' % deadline.META, None)
+
+	# Start the refresh
+	_executor().submit(
+		_refresh, key, service, path, settings, req, data, dHeaders, raw
+	)
+
+def _revalidate(
+	raw: tuple,
+	service: str,
+	path: str,
+	data: str,
+	headers: dict,
+	until: float | None = None
+) -> tuple:
+	"""Revalidate
+
+	Asks the service if a copy of a read is still current by sending its
+	ETag. If it is, the copy is returned, else whatever the service sent
+
+	Arguments:
+		raw (tuple): The copy, ( Content-Type, raw body, ETag )
+		service (str): The name of the service
+		path (str): The path on the service
+		data (str): The encoded data to send
+		headers (dict): The headers to send
+		until (float): Optional, the unix timestamp the request must be done
+			by
+
+	Returns:
+		( Response, ( str, bytes | str, str | None ) | None )
+	"""
+
+	# Send the request with the ETag
+	dHeaders = headers.copy()
+	dHeaders['If-None-Match'] = raw[2]
+	oResponse, tRaw = _send(service, 'read', path, data, dHeaders, until)
+
+	# If the copy is still current, use it
+	if oResponse is None:
+		return ( RawResponse(raw[1], raw[0]), raw )
+
+	# Else, return the new Response
+	return ( oResponse, tRaw )
+
+def _retry_config(name: str, conf: dict | None) -> dict:
+	"""Retry Config
+
+	Validates and normalises the retry section of a service's config
+
+	Arguments:
+		name (str): The name of the service
+		conf (dict): The retry section of the service's config
+
+	Raises:
+		ValueError
+
+	Returns:
+		dict
+	"""
+
+	# Start with the defaults
+	dRet = deepcopy(__retry_defaults)
+
+	# If there's no section, use the defaults
+	if not conf:
+		return dRet
+
+	# Make sure we got a dict with valid keys
+	sName = 'config.body.rest.services.%s.retry' % name
+	if not isinstance(conf, dict):
+		raise ValueError(sName, 'must be a dict')
+	for k in conf:
+		if k not in __retry_defaults:
+			raise ValueError('%s.%s' % (sName, k), 'invalid key')
+
+	# Go through each of the numeric values
+	for k in [ 'attempts', 'backoff', 'max', 'multiplier' ]:
+		if k in conf:
+			try:
+				dRet[k] = k == 'attempts' and int(conf[k]) or float(conf[k])
+				if dRet[k] < (k == 'attempts' and 1 or 0): raise ValueError()
+			except (TypeError, ValueError):
+				raise ValueError('%s.%s' % (sName, k), 'invalid value')
+
+	# The jitter can be a bool or the fraction of the delay that is random
+	if 'jitter' in conf:
+		if isinstance(conf['jitter'], bool):
+			dRet['jitter'] = conf['jitter'] and 1.0 or 0.0
+		else:
+			try:
+				dRet['jitter'] = float(conf['jitter'])
+				if not 0 <= dRet['jitter'] <= 1: raise ValueError()
+			except (TypeError, ValueError):
+				raise ValueError(
+					'%s.jitter' % sName, 'must be a bool or a number from 0 to 1'
+				)
+
+	# Go through each of the list values
+	for k, l in ( ( 'actions', __action_to_method ),
+				( 'errors', __retry_errors ), ( 'statuses', None ) ):
+		if k in conf:
+			if not isinstance(conf[k], list):
+				raise ValueError('%s.%s' % (sName, k), 'must be a list')
+			for v in conf[k]:
+				if (l is not None and v not in l) or \
+					(l is None and not isinstance(v, int)):
+					raise ValueError('%s.%s' % (sName, k), 'invalid value: %s' % v)
+			dRet[k] = conf[k]
+
+	# Return the policy
+	return dRet
+
+def _retry_delay(policy: dict, attempt: int) -> float:
+	"""Retry Delay
+
+	Returns the number of seconds to wait before the next attempt, based on
+	exponential backoff with optional jitter
+
+	Arguments:
+		policy (dict): The retry policy of the service
+		attempt (uint): The attempt that just failed, starting at 1
+
+	Returns:
+		float
+	"""
+
+	# Calculate the exponential delay, limited to the max
+	fDelay = min(
+		policy['max'],
+		policy['backoff'] * (policy['multiplier'] ** (attempt - 1))
+	)
+
+	# Remove a random part of the delay so that clients don't all retry at the
+	#	same moment
+	return fDelay * (1 - (policy['jitter'] * random()))
+
+def _balance_config(name: str, conf: dict | str | None) -> dict:
+	"""Balance Config
+
+	Validates and normalises the balance section of a service's config
+
+	Arguments:
+		name (str): The name of the service
+		conf (dict | str): The balance section of the service's config
+
+	Raises:
+		ValueError
+
+	Returns:
+		dict
+	"""
+
+	# If there's no section, use the defaults
+	if conf is None:
+		return __balance_defaults.copy()
+
+	# If we got a string, it's just the strategy
+	sName = 'config.body.rest.services.%s.balance' % name
+	if isinstance(conf, str):
+		conf = { 'strategy': conf }
+
+	# Make sure we got a dict with valid keys
+	if not isinstance(conf, dict):
+		raise ValueError(sName, 'must be a string or a dict')
+	for k in conf:
+		if k not in __balance_defaults:
+			raise ValueError('%s.%s' % (sName, k), 'invalid key')
+
+	# Merge the defaults with the section and return it, the values are
+	#	validated by the Balancer
+	return { **__balance_defaults, **conf }
+
+def _batch_config(name: str, conf: dict | float | None) -> dict | None:
+	"""Batch Config
+
+	Validates and normalises the batch section of a service's config
+
+	Arguments:
+		name (str): The name of the service
+		conf (dict | float): The batch section of the service's config
+
+	Raises:
+		ValueError
+
+	Returns:
+		dict | None
+	"""
+
+	# If batching is turned off
+	if conf is False:
+		return None
+
+	# If there's no section, use the defaults
+	if conf is None:
+		return __batch_defaults.copy()
+
+	# If we got a single number, it's the window
+	sName = 'config.body.rest.services.%s.batch' % name
+	if isinstance(conf, (int, float)) and not isinstance(conf, bool):
+		conf = { 'window': conf }
+
+	# Make sure we got a dict with valid keys
+	if not isinstance(conf, dict):
+		raise ValueError(sName, 'must be a number, a dict, or false')
+	for k in conf:
+		if k not in __batch_defaults:
+			raise ValueError('%s.%s' % (sName, k), 'invalid key')
+
+	# Merge the defaults with the section
+	dRet = { **__batch_defaults, **conf }
+
+	# Make sure the numbers are valid
+	try:
+		dRet['size'] = int(dRet['size'])
+		if dRet['size'] < 1: raise ValueError()
+	except (TypeError, ValueError):
+		raise ValueError('%s.size' % sName, 'must be an int greater than 0')
+	try:
+		dRet['window'] = float(dRet['window'])
+		if dRet['window'] < 0: raise ValueError()
+	except (TypeError, ValueError):
+		raise ValueError('%s.window' % sName, 'must be a number of 0 or greater')
+
+	# Return the settings
+	return dRet
+
+def _batch_key(headers: dict) -> str:
+	"""Batch Key
+
+	Generates the key that identifies reads that can be sent together, those
+	with the same session, meta, and format
+
+	Arguments:
+		headers (dict): The headers the read would be sent with
+
+	Returns:
+		str
+	"""
+	return '\n'.join([
+		'%s:%s' % ( k, headers[k] )
+		for k in sorted(headers.keys())
+		if k not in __batch_skip
+	])
+
+def _batched(service: str, reads: list) -> list:
+	"""Batched
+
+	Sends a list of reads to a service using as few requests as possible, and
+	returns their Responses in the same order. Used by batch(). Reads of
+	cached paths are returned from the cache if they're in it, and stored in
+	it if they aren't. If the path is cached, or the service coalesces reads,
+	identical reads are only sent once, and each gets its own copy of the
+	Response
+
+	Arguments:
+		service (str): The name of the service
+		reads (list): The list of ( path, req )
+
+	Returns:
+		Response[]
+	"""
+
+	# If we haven't already, generate the list of services
+	if __services is None:
+		_generate_services()
+
+	# If the service is in this process, or doesn't batch, there's nothing to
+	#	gain, just make the requests
+	dService = __services[service]
+	if 'instance' in dService or not dService['batch']:
+		return [ request(service, 'read', t[0], t[1]) for t in reads ]
+
+	# Go through each read and group them by the headers they need
+	lRet = [ None ] * len(reads)
+	dGroups = {}
+	dKeys = {}
+	fNow = time()
+	for i in range(len(reads)):
+		sPath, dReq = reads[i]
+
+		# If the caller has already given up, don't bother
+		fDeadline = _deadline(dReq)
+		if fDeadline is not None and fDeadline <= fNow:
+			lRet[i] = Error(
+				errors.SERVICE_TIMEOUT,
+				'%s:read %s deadline exceeded' % ( service, sPath )
+			)
+			continue
+
+		# Generate the headers, and if the path is cached, or identical reads
+		#	are coalesced, the key that identifies the read
+		dHeaders = _headers(service, dReq)
+		dSettings = _cache_settings(service, sPath)
+		sKey = None
+		if dSettings:
+			sKey = _read_key(
+				service, sPath, dReq, dHeaders, dSettings['session']
+			)
+		elif dService['coalesce']:
+			sKey = _read_key(service, sPath, dReq, dHeaders)
+
+		# If the path is cached, and we have it, use it, refreshing it in the
+		#	background if it's stale
+		if dSettings:
+			tRaw, iState = _cache().get(sKey)
+			if tRaw is not None:
+				if iState == Cache.STALE:
+					dRefresh = dHeaders.copy()
+					_stale(
+						sKey, service, sPath, dSettings, dReq,
+						_encode(service, dReq.get('data'), dRefresh),
+						dRefresh, tRaw
+					)
+				lRet[i] = RawResponse(tRaw[1], tRaw[0])
+				continue
+
+		# If an identical read is already being sent, wait for it instead
+		if sKey is not None and sKey in dKeys:
+			dKeys[sKey][1].append(i)
+			continue
+
+		# Add the read to its group
+		tRead = ( i, sPath, dReq.get('data'), dHeaders, fDeadline )
+		if sKey is not None:
+			dKeys[sKey] = ( dSettings, [] )
+		try:
+			dGroups[_batch_key(dHeaders)].append(( tRead, sKey ))
+		except KeyError:
+			dGroups[_batch_key(dHeaders)] = [ ( tRead, sKey ) ]
+
+	# Go through each group, in chunks no bigger than the service allows
+	iSize = dService['batch']['size']
+	for lGroup in dGroups.values():
+		for iStart in range(0, len(lGroup), iSize):
+			lChunk = [ t[0] for t in lGroup[iStart:iStart + iSize] ]
+
+			# The chunk must be done by the earliest deadline
+			lUntil = [ t[4] for t in lChunk if t[4] is not None ]
+			fUntil = lUntil and min(lUntil) or None
+
+			# Send the chunk
+			lResults = _measure(
+				service, 'read', dService['batch']['path'], _list,
+				service, [ ( t[1], t[2] ) for t in lChunk ], lChunk[0][3],
+				fUntil
+			)
+
+			# Go through each Response
+			for j in range(len(lChunk)):
+				oResponse, tRaw = lResults[j]
+				lRet[lChunk[j][0]] = oResponse
+
+				# If the read has no key, there's nothing else to do
+				sKey = lGroup[iStart + j][1]
+				if sKey is None:
+					continue
+
+				# If the path is cached, and the read worked, store it
+				dSettings, lSame = dKeys[sKey]
+				if dSettings and tRaw is not None and not oResponse.error:
+					_cache().set(
+						sKey, tRaw, dSettings['ttl'], dSettings['stale'],
+						Cache.size(tRaw[1])
+					)
+
+				# Give every identical read its own copy of the Response
+				for k in lSame:
+					if tRaw is None:
+						lRet[k] = Response.from_dict(
+							deepcopy(oResponse.to_dict())
+						)
+					else:
+						lRet[k] = RawResponse(tRaw[1], tRaw[0])
+
+	# Return the Responses
+	return lRet
+
+def _list(service: str, reads: list, headers: dict, until: float | None) -> list:
+	"""List
+
+	Sends several reads to a service as a single request to its list path,
+	and returns each Response along with the Content-Type and raw body it
+	can be regenerated from, without an ETag. If the service doesn't have
+	the list path, the reads are sent one at a time instead
+
+	Arguments:
+		service (str): The name of the service
+		reads (list): The list of ( path, data )
+		headers (dict): The headers shared by every read
+		until (float): The unix timestamp the request must be done by
+
+	Returns:
+		list: ( Response, ( str, bytes | str, str | None ) | None )[]
+	"""
+
+	# Copy the headers without the ones that depend on the body, and add the
+	#	deadline
+	dHeaders = { k: v for k,v in headers.items() if k not in __batch_skip }
+	if until is not None:
+		dHeaders['X-Body-%s' % deadline.META] = '%.3f' % until
+
+	# If there's only one, send it as is
+	if len(reads) == 1:
+		return [ _send(
+			service, 'read', reads[0][0],
+			_encode(service, reads[0][1], dHeaders), dHeaders, until
+		) ]
+
+	# Send the list of paths, with their data if they have any, asking for
+	#	the Response of every read, so one that fails doesn't fail the rest
+	dList = dHeaders.copy()
+	dList['X-Body-%s' % LIST_ERRORS] = 'collect'
+	oResponse, tRaw = _send(
+		service, 'read', __services[service]['batch']['path'],
+		_encode(service, [
+			d and [ p, d ] or p for p, d in reads
+		], dList),
+		dList,
+		until
+	)
+
+	# If we got back a Response for each read, split them up
+	if tRaw is not None and not oResponse.error and \
+		isinstance(oResponse.data, list) and \
+		len(oResponse.data) == len(reads):
+		oFormat = formats.by_mime(tRaw[0])
+		return [ (
+			Response.from_dict(l[1]),
+			( oFormat.mime, oFormat.encode(l[1]), None )
+		) for l in oResponse.data ]
+
+	# If the service answered with an error for the entire list, other than
+	#	not having the list path, e.g. it's failing, or it's too old to
+	#	collect errors, sending each read again would only add to its load,
+	#	give every read its own copy of the error
+	if oResponse.error and not _list_missing(oResponse.error):
+		return [
+			( Response.from_dict(deepcopy(oResponse.to_dict())), None )
+			for t in reads
+		]
+
+	# Else, the service doesn't have a list path, or it doesn't accept this
+	#	one, send them one at a time
+	lRet = []
+	for sPath, mData in reads:
+		dRead = dHeaders.copy()
+		lRet.append(_send(
+			service, 'read', sPath, _encode(service, mData, dRead), dRead,
+			until
+		))
+	return lRet
+
+def _list_missing(error: dict) -> bool:
+	"""List Missing
+
+	Returns True if the error of a list request means the service can't
+	handle it, because it doesn't have the list path, the list is too long,
+	or it doesn't know one of the paths, and so the reads should be sent one
+	at a time
+
+	Arguments:
+		error (dict): The error of the list request's Response
+
+	Returns:
+		bool
+	"""
+	if error['code'] == errors.SERVICE_STATUS:
+		return str(error['msg'])[:4] in [ '404:', '405:' ]
+	return error['code'] in [
+		errors.REST_LIST_INVALID_URI, errors.REST_LIST_TO_LONG,
+		errors.REST_REQUEST_DATA, errors.SERVICE_CONTENT_TYPE
+	]
+
+def _windowed(service: str, key: str, reads: list) -> list:
+	"""Windowed
+
+	Called by the service's Window with the reads collected during the
+	window, sends them together
+
+	Arguments:
+		service (str): The name of the service
+		key (str): The key shared by the reads
+		reads (list): The list of ( path, data, encoded data, headers, until )
+
+	Returns:
+		list: ( Response, ( str, bytes | str, str | None ) | None )[]
+	"""
+
+	# If no one else showed up, send the read as is
+	if len(reads) == 1:
+		t = reads[0]
+		return [ _send(service, 'read', t[0], t[2], t[3], t[4]) ]
+
+	# The list must be done by the earliest deadline
+	lUntil = [ t[4] for t in reads if t[4] is not None ]
+	fUntil = lUntil and min(lUntil) or None
+
+	# Send the reads as a list
+	return _list(
+		service, [ ( t[0], t[1] ) for t in reads ], reads[0][3], fUntil
+	)
+
+def _hosts_config(name: str, parts: dict, port_mod: int) -> List[str]:
+	"""Hosts Config
+
+	Validates the hosts section of a service's config and returns the base
+	url of each host. If the service has no hosts section, the service itself
+	is the only host
+
+	Arguments:
+		name (str): The name of the service
+		parts (dict): The service's config merged with the defaults
+		port_mod (int): The value added to any port set on a host
+
+	Raises:
+		ValueError
+
+	Returns:
+		str[]
+	"""
+
+	# If there's no list of hosts, use the service's own domain and port
+	sName = 'config.body.rest.services.%s.hosts' % name
+	lHosts = parts.get('hosts', [ {} ])
+	if not isinstance(lHosts, list) or not lHosts:
+		raise ValueError(sName, 'must be a list with at least one host')
+
+	# Go through each host
+	lRet = []
+	for i, m in enumerate(lHosts):
+
+		# If we got a string, split it into the domain and port
+		if isinstance(m, str):
+			l = m.rsplit(':', 1)
+			if len(l) == 1:
+				m = { 'domain': l[0] }
+			else:
+				m = { 'domain': l[0], 'port': l[1] }
+
+		# Else, make sure we got a dict with valid keys
+		elif isinstance(m, dict):
+			for k in m:
+				if k not in __host_keys:
+					raise ValueError('%s.%d.%s' % (sName, i, k), 'invalid key')
+
+		# Else, it's invalid
+		else:
+			raise ValueError('%s.%d' % (sName, i), 'must be a string or a dict')
+
+		# If the host has its own port, add the modifier to it, else use the
+		#	service's
+		if 'port' in m:
+			try:
+				iPort = int(m['port']) + port_mod
+			except (TypeError, ValueError):
+				raise ValueError('%s.%d.port' % (sName, i), 'must be an int')
+		else:
+			iPort = parts.get('port')
+
+		# Generate the URL and add it to the list
+		lRet.append('%s://%s%s/%s' % (
+			m.get('protocol', parts['protocol']),
+			m.get('domain', parts['domain']),
+			iPort is not None and ":%d" % iPort or '',
+			parts['path']
+		))
+
+	# Return the URLs
+	return lRet
+
+def _compress_config(name: str, conf: dict | int | None) -> dict | None:
+	"""Compress Config
+
+	Validates and normalises the compress section of a service's config
+
+	Arguments:
+		name (str): The name of the service
+		conf (dict | uint): The compress section of the service's config
+
+	Raises:
+		ValueError
+
+	Returns:
+		dict | None
+	"""
+
+	# If there's no section, bodies are sent as is
+	if conf is None or conf is False:
+		return None
+
+	# If we got a single number, it's the threshold
+	sName = 'config.body.rest.services.%s.compress' % name
+	if isinstance(conf, int) and not isinstance(conf, bool):
+		conf = { 'threshold': conf }
+
+	# Make sure we got a dict with valid keys
+	if not isinstance(conf, dict):
+		raise ValueError(sName, 'must be an int or a dict')
+	for k in conf:
+		if k not in __compress_keys:
+			raise ValueError('%s.%s' % (sName, k), 'invalid key')
+
+	# Make sure the codec exists
+	dRet = {
+		'codec': conf.get('codec', 'gzip'),
+		'level': int(conf.get('level', 6)),
+		'threshold': int(conf.get('threshold', 1024))
+	}
+	if dRet['codec'] not in compress.codecs():
+		raise ValueError('%s.codec' % sName, 'invalid codec')
+
+	# Return the settings
+	return dRet
+
+def _encode(service: str, data: any, headers: dict) -> bytes | str:
+	"""Encode
+
+	Encodes the data in the service's format, and compresses it if the
+	service accepts compressed bodies and it's big enough. Sets the
+	Content-Length, and if needed, Content-Encoding headers
+
+	Arguments:
+		service (str): The name of the service
+		data (any): The data to encode
+		headers (dict): The headers to update
+
+	Returns:
+		bytes | str
+	"""
+
+	# If there's no data, there's nothing to send
+	headers['Content-Length'] = '0'
+	headers.pop('Content-Encoding', None)
+	if not data:
+		return ''
+
+	# Encode the data and store the length
+	sData = __services[service]['format'].encode(data)
+	headers['Content-Length'] = str(len(sData))
+
+	# If the service accepts compressed bodies, and the data is big enough
+	dCompress = __services[service]['compress']
+	if dCompress and len(sData) >= dCompress['threshold']:
+		sData = compress.compress(
+			dCompress['codec'],
+			isinstance(sData, str) and sData.encode('utf-8') or sData,
+			dCompress['level']
+		)
+		headers['Content-Encoding'] = dCompress['codec']
+		headers['Content-Length'] = str(len(sData))
+
+	# Return the data
+	return sData
+
+def _headers(
+	service: str,
+	req: MutableMapping,
+	until: float | None = None
+) -> dict:
+	"""Headers
+
+	Generates the headers, minus the Content-Length, needed to send a request
+	to an external service
+
+	Arguments:
+		service (str): The name of the service
+		req (dict): The request details
+		until (float): Optional, the unix timestamp the request must be done
+			by
+
+	Returns:
+		dict
+	"""
+
+	# Get the format the service uses
+	oFormat = __services[service]['format']
+
+	# Add the content type, and if we use a format other than JSON, ask for
+	#	it back, but accept JSON in case the service doesn't support it
+	dHeaders = { 'Content-Type': oFormat.content_type }
+	if oFormat is not formats.JSON:
+		dHeaders['Accept'] = '%s, %s; q=0.5' % (
+			oFormat.mime, formats.JSON.mime
+		)
+
+	# If we have a session, add the ID to the headers
+	if 'session' in req and req['session']:
+		dHeaders['Authorization'] = req['session'].key()
+
+	# If we received any meta vars
+	if 'meta' in req and req['meta']:
+		for k,v in req['meta'].items():
+			dHeaders['X-Body-%s' % k] = v
+
+	# If we have a deadline, pass it along
+	if until is not None:
+		dHeaders['X-Body-%s' % deadline.META] = '%.3f' % until
+
+	# Return the headers
+	return dHeaders
+
+def _read(
+	service: str,
+	path: str,
+	req: MutableMapping,
+	data: bytes | str,
+	headers: dict,
+	until: float | None = None
+) -> tuple:
+	"""Read
+
+	Sends a read to an external service, waiting for other reads to send
+	with it if the service batches reads
+
+	Arguments:
+		service (str): The name of the service
+		path (str): The path on the service
+		req (dict): The request details
+		data (str): The encoded data to send
+		headers (dict): The headers to send
+		until (float): Optional, the unix timestamp the request must be done
+			by
+
+	Returns:
+		( Response, ( str, bytes | str, str | None ) | None )
+	"""
+
+	# If the service doesn't batch reads, just send it
+	oWindow = __services[service]['window']
+	if oWindow is None:
+		return _send(service, 'read', path, data, headers, until)
+
+	# Else, wait for any others
+	return oWindow.run(
+		_batch_key(headers),
+		( path, req.get('data'), data, headers, until )
+	)
+
+def _isolate(req: MutableMapping, mode: str) -> jobject:
+	"""Isolate
+
+	Returns the request details to pass to a service running in the same
+	process, copied as much as the isolation mode requires. The session is
+	always shared
+
+	Arguments:
+		req (dict): The request details
+		mode (str): 'none' to pass the details as is, 'shallow' to copy the
+			data and meta, but not anything in them, 'deep' to copy
+			everything in the data and meta
+
+	Returns:
+		jobject
+	"""
+
+	# If there's no isolation, use the details as is, only converting them
+	#	if they haven't been already
+	if mode == 'none':
+		if type(req) is jobject:
+			return req
+		return jobject(req)
+
+	# Else, copy the top level, and any data or meta
+	bDeep = mode == 'deep'
+	dRet = {}
+	for k,v in req.items():
+		if k in [ 'data', 'meta' ] and isinstance(v, (dict, list)):
+			v = bDeep and deepcopy(v) or copy(v)
+		dRet[k] = v
+
+	# Return the copy
+	return jobject(dRet)
+
+def _deadline(req: MutableMapping) -> float | None:
+	"""Deadline
+
+	Returns the earliest of the current deadline, the deadline passed in the
+	request's meta, and the timeout passed in the request, as a unix timestamp
+
+	Arguments:
+		req (dict): The request details
+
+	Returns:
+		float | None
+	"""
+
+	# Start with the deadline of the current context
+	fDeadline = deadline.current()
+
+	# Init the list of other possible deadlines
+	lOthers = []
+
+	# If one was passed in the meta
+	if 'meta' in req and req['meta'] and deadline.META in req['meta']:
+		try:
+			lOthers.append(float(req['meta'][deadline.META]))
+		except (TypeError, ValueError):
+			pass
+
+	# If a timeout was passed
+	if 'timeout' in req and req['timeout']:
+		lOthers.append(time() + float(req['timeout']))
+
+	# Return the earliest
+	for f in lOthers:
+		if fDeadline is None or f < fDeadline:
+			fDeadline = f
+	return fDeadline
+
+def _timeouts_config(name: str, conf: dict | float | None) -> dict:
+	"""Timeouts Config
+
+	Validates and normalises the timeouts section of a service's config
+
+	Arguments:
+		name (str): The name of the service
+		conf (dict | float): The timeouts section of the service's config
+
+	Raises:
+		ValueError
+
+	Returns:
+		dict
+	"""
+
+	# Start with the defaults
+	dRet = __timeout_defaults.copy()
+
+	# If there's no section, use the defaults
+	if conf is None:
+		return dRet
+
+	# If we got a single number, use it for both
+	sName = 'config.body.rest.services.%s.timeouts' % name
+	if isinstance(conf, (int, float)) and not isinstance(conf, bool):
+		conf = { 'connect': conf, 'read': conf }
+
+	# Make sure we got a dict with valid keys
+	if not isinstance(conf, dict):
+		raise ValueError(sName, 'must be a number or a dict')
+	for k in conf:
+		if k not in __timeout_defaults:
+			raise ValueError('%s.%s' % (sName, k), 'invalid key')
+
+		# None means no timeout at all
+		if conf[k] is None:
+			dRet[k] = None
+			continue
+
+		# Else, make sure it's a positive number
+		try:
+			dRet[k] = float(conf[k])
+			if dRet[k] <= 0: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError(
+				'%s.%s' % (sName, k), 'must be a number greater than 0'
+			)
+
+	# Return the timeouts
+	return dRet
+
+def balancer_stats(name: str | None = None) -> dict:
+	"""Balancer Stats
+
+	Returns the load balancing strategy, and the state of each host, for a
+	single service, or for all services by name if no name is passed. See
+	Balancer.stats for the details
+
+	Arguments:
+		name (str): Optional, the name of the service
+
+	Raises:
+		KeyError if the name doesn't match a service
+
+	Returns:
+		dict
+	"""
+
+	global __services
+
+	# If we haven't already, generate the list of services
+	if __services is None:
+		_generate_services()
+
+	# If we got a name, return just the one
+	if name is not None:
+		return __services[name]['balancer'].stats()
+
+	# Else, return all of them
+	return {
+		k: d['balancer'].stats()
+		for k,d in __services.items()
+	}
+
+def batch() -> Batch:
+	"""Batch
+
+	Returns a context manager that collects reads and sends them once the
+	block is done, using the list path of each service so that up to the
+	service's batch size of reads are sent as a single request. Reads with
+	different sessions or meta are never sent together. Reads of cached
+	paths use the cache, and identical reads are only sent once
+
+	with body.external.batch() as oBatch:
+		oUser = oBatch.read('user', 'user', { 'data': { '_id': _id } })
+		oPerms = oBatch.read('user', 'permissions', { 'data': { '_id': _id } })
+	dUser = oUser.result().data
+
+	Returns:
+		Batch
+	"""
+	return Batch(_batched, _executor(), 'body.external')
+
+def batch_stats(name: str | None = None) -> dict:
+	"""Batch Stats
+
+	Returns the number of list requests made, and the reads sent in them, by
+	the batching window of a single service, or for all services that have
+	one by name if no name is passed
+
+	Arguments:
+		name (str): Optional, the name of the service
+
+	Raises:
+		KeyError if the name doesn't match a service
+
+	Returns:
+		dict | None
+	"""
+
+	global __services
+
+	# If we haven't already, generate the list of services
+	if __services is None:
+		_generate_services()
+
+	# If we got a name, return just the one
+	if name is not None:
+		oWindow = __services[name]['window']
+		return oWindow and oWindow.stats() or None
+
+	# Else, return all of them
+	return {
+		k: d['window'].stats()
+		for k,d in __services.items()
+		if d['window']
+	}
+
+def cache_clear(service: str | None = None, path: str | None = None):
+	"""Cache Clear
+
+	Removes cached reads, either all of them, all of them for a service, or
+	only those for a specific path on a service
+
+	Arguments:
+		service (str): Optional, the name of the service
+		path (str): Optional, the path on the service, requires service
+
+	Returns:
+		None
+	"""
+
+	# If we have no service, clear everything
+	if service is None:
+		_cache().clear()
+
+	# Else, clear only the matching keys
+	else:
+		_cache().clear(
+			path is None and ('%s\n' % service) or \
+				('%s\n%s\n' % (service, path))
+		)
+
+def cache_stats() -> dict:
+	"""Cache Stats
+
+	Returns the hits, misses, stale hits, evictions, and current size of the
+	cache of reads
+
+	Returns:
+		dict
+	"""
+	return _cache().stats()
+
+def circuit_stats(name: str | None = None) -> dict:
+	"""Circuit Stats
+
+	Returns the state of the circuit breaker for a single service, or for all
+	services by name if no name is passed. See Circuit.stats for the details
+
+	Arguments:
+		name (str): Optional, the name of the service
+
+	Raises:
+		KeyError if the name doesn't match a service
+
+	Returns:
+		dict
+	"""
+
+	global __services
+
+	# If we haven't already, generate the list of services
+	if __services is None:
+		_generate_services()
+
+	# If we got a name, return just the one
+	if name is not None:
+		oCircuit = __services[name]['circuit']
+		return oCircuit and oCircuit.stats() or None
+
+	# Else, return all of them
+	return {
+		k: d['circuit'].stats()
+		for k,d in __services.items()
+		if d['circuit']
+	}
+
+def coalesce_stats() -> dict:
+	"""Coalesce Stats
+
+	Returns the number of reads sent, the number that waited on an identical
+	read instead, and the number currently in progress
+
+	Returns:
+		dict
+	"""
+	return __flight.stats()
+
+def create(
+	service: str,
+	path: str,
+	req: dict = {}
+):
+	"""Create
+
+	Make a POST request
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response
+	"""
+	return request(service, 'create', path, req)
+
+def create_many(
+	service: str,
+	path: str,
+	req: dict = {}
+):
+	"""Create Many
+
+	Make a POST request to create many items of a noun at once, the data is
+	the list of items
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
 
-def create(
+	Returns:
+		Response: see body.response.Many
+	"""
+	return request(service, 'create_many', path, req)
+
+def delete(
 	service: str,
 	path: str,
 	req: dict = {}
 ):
-	"""Create
+	"""Delete
 
-	Make a POST request
+	Make a DELETE request
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response
+	"""
+	return request(service, 'delete', path, req)
+
+def delete_many(
+	service: str,
+	path: str,
+	req: dict = {}
+):
+	"""Delete Many
+
+	Make a DELETE request to delete many items of a noun at once, the data is
+	the list of items
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response: see body.response.Many
+	"""
+	return request(service, 'delete_many', path, req)
+
+def gather(
+	calls: List[tuple],
+	timeout: float | None = None
+) -> List[Response]:
+	"""Gather
+
+	Makes several requests at the same time using the shared pool of threads
+	and returns the Responses in the same order the requests were passed.
+	Requests to services registered in the same process are still called
+	directly, in the current thread, while the others are in progress
+
+	gather([
+		( 'myservice', 'read', 'user', { 'data': { '_id': _id } } ),
+		( 'myotherservice', 'read', 'permissions', { 'data': { 'user': _id } } )
+	], timeout = 5)
+
+	Arguments:
+		calls (tuple[]): A list of ( service, action, path[, req] ) tuples
+		timeout (float): Optional, the maximum number of seconds to wait for
+			the entire batch. Any request not done in time will get a
+			SERVICE_TIMEOUT Error
+
+	Raises:
+		KeyError: if a service doesn't exist
+		ValueError: if a request is not a valid tuple
+
+	Returns:
+		Response[]
+	"""
+
+	global __services
+
+	# If we haven't already, generate the list of services
+	if __services is None:
+		_generate_services()
+
+	# Make sure each request is valid, and fill in the missing req
+	lRequests = []
+	for i, t in enumerate(calls):
+		if not isinstance(t, (list, tuple)) or len(t) not in (3, 4):
+			raise ValueError(
+				'calls.%d' % i, 'must be ( service, action, path[, req] )'
+			)
+		lRequests.append(len(t) == 3 and ( *t, {} ) or tuple(t))
+
+	# If we are already running in one of the shared threads, waiting on other
+	#	threads in the same pool could dead lock it, so just run them one after
+	#	the other
+	if current_thread().name.startswith('body.external'):
+		return [ request(*t) for t in lRequests ]
+
+	# Note when we started so the timeout covers the entire batch
+	fStart = monotonic()
+
+	# Init the list of results, and the futures by index
+	lResults = [ None ] * len(lRequests)
+	dFutures = {}
+
+	# Go through each request that goes to an external service and start it on
+	#	the executor using a copy of the current context
+	oExecutor = _executor()
+	for i, t in enumerate(lRequests):
+		if 'instance' not in __services[t[0]]:
+			dFutures[i] = oExecutor.submit(
+				contextvars.copy_context().run, request, *t
+			)
+
+	# Go through each request that goes to a service in this process and call
+	#	it directly
+	for i, t in enumerate(lRequests):
+		if i not in dFutures:
+			lResults[i] = request(*t)
+
+	# If we have a timeout, figure out how much of it is left
+	if timeout is not None:
+		timeout = max(0, timeout - (monotonic() - fStart))
+
+	# Wait for the futures to finish
+	wait(dFutures.values(), timeout = timeout)
+
+	# Go through each future and store the result
+	for i, oFuture in dFutures.items():
+
+		# If it's done, store the result
+		if oFuture.done():
+			lResults[i] = oFuture.result()
+
+		# Else, it took too long, cancel it in case it hasn't started, and
+		#	store a timeout error in its place
+		else:
+			oFuture.cancel()
+			lResults[i] = Error(
+				errors.SERVICE_TIMEOUT,
+				'%s:%s %s' % ( lRequests[i][0], lRequests[i][1], lRequests[i][2] )
+			)
+
+	# Return the results
+	return lResults
+
+def read(
+	service: str,
+	path: str,
+	req: dict = {}
+):
+	"""Read
+
+	Make a GET request
 
 	Arguments:
 		service (str): The service to call
 		path (str): The path on the service
 		req (dict): The request details, which can include 'data' and 'session'
 
-	Returns:
-		Response
+	Returns:
+		Response
+	"""
+	return request(service, 'read', path, req)
+
+def register_service(name: str, instance: Service):
+	"""Register Service
+
+	Marks a service as internal so that any create, read, update, delete request
+	will call the local instance instead of attempting an http request
+
+	Arguments:
+		name (str): The name of the service and how others will contact it
+		instance (Service): The created instance of the servce
+	"""
+
+	global __services
+
+	# If we haven't already, generate the list of services
+	if __services is None:
+		_generate_services()
+
+	# Add the instance and init the paths
+	__services[name]['instance'] = instance
+	__services[name]['paths'] = {}
+
+	# Go through all the request methods in the service
+	for dMethod in instance.requests:
+
+		# Generate the URL
+		sUri = dMethod['name'].replace('_', '/')
+
+		# Store the url and action
+		try:
+			__services[name]['paths'][sUri][dMethod['action']] = dMethod['func']
+		except KeyError:
+			__services[name]['paths'][sUri] = {
+				dMethod['action']: dMethod['func']
+			}
+
+	# Return the service
+	return __services[name]
+
+def reload_hosts() -> dict:
+	"""Reload Hosts
+
+	Reloads the config files and updates the hosts of every external service
+	without touching anything else. Connections to hosts that are still in
+	the config are kept, requests already sent to hosts that were removed
+	finish normally. Services added or removed from the config are ignored
+
+	Raises:
+		ValueError
+
+	Returns:
+		dict: The URLs of the hosts by service name
+	"""
+
+	global __services
+
+	# If we haven't generated the services yet, there's nothing to reload,
+	#	they will be generated with the latest config
+	if __services is None:
+		config.reload()
+		_generate_services()
+		return { k: d['hosts'] for k,d in __services.items() }
+
+	# Reload the config, and fetch the REST section
+	config.reload()
+	dRest, iPortMod = _rest_config()
+
+	# Generate all the URLs first so that a mistake in the config doesn't
+	#	leave us with some services updated and others not
+	dHosts = {}
+	for s in __services:
+		if s in dRest['services'] and 'instance' not in __services[s]:
+			dHosts[s] = _hosts_config(
+				s, _service_parts(dRest, s, iPortMod), iPortMod
+			)
+
+	# Update each service
+	for s, l in dHosts.items():
+		set_hosts(s, l)
+
+	# Return the URLs
+	return dHosts
+
+def _rest_config() -> tuple:
+	"""REST Config
+
+	Fetches the REST config and pulls the port modifier out of the defaults
+
+	Raises:
+		ValueError
+
+	Returns:
+		( dict, int )
+	"""
+
+	# Fetch the REST config
+	dRest = config.body.rest({
+		'allowed': None,
+		'default': {
+			'domain': 'localhost',
+			'host': '0.0.0.0',
+			'port': 9000,
+			'protocol': 'http',
+			'workers': 1
+		}
+	})
+
+	# If we didn't get a list of services
+	if 'services' not in dRest:
+		raise ValueError('config.body.rest.services', 'missing')
+
+	# Init the defaults if none are found
+	if 'defaults' not in dRest:
+		dRest['defaults'] = {}
+
+	# Port values are not modified by default
+	iPortMod = 0
+
+	# If there is a port modifier
+	if 'port' in dRest['default']:
+
+		# Make sure it's an integer
+		try:
+			iPortMod = int(dRest['default']['port'])
+			del dRest['default']['port']
+		except ValueError:
+			raise ValueError('config.body.rest.default.port', 'must be an int')
+
+	# Return the config and the modifier
+	return ( dRest, iPortMod )
+
+def _service_parts(rest: dict, name: str, port_mod: int) -> dict:
+	"""Service Parts
+
+	Returns the config of a single service merged with the defaults
+
+	Arguments:
+		rest (dict): The REST config returned by _rest_config()
+		name (str): The name of the service
+		port_mod (int): The port modifier returned by _rest_config()
+
+	Raises:
+		ValueError
+
+	Returns:
+		dict
+	"""
+
+	# If the service doesn't point to a dict
+	if not isinstance(rest['services'][name], dict):
+		raise ValueError(
+			'config.body.rest.services.%s' % name, 'must be a dict'
+		)
+
+	# Start with the default values
+	dParts = rest['default'].copy()
+
+	# Then add the service values
+	dParts.update(rest['services'][name])
+
+	# If we have no port
+	if 'port' not in dParts:
+
+		# But we have a modifier, assume we add to 80
+		if port_mod: dParts['port'] = 80 + port_mod
+
+	# Else add the modifier to the port passed
+	else:
+		dParts['port'] += port_mod
+
+	# Set defaults for any missing parts
+	if not dParts['protocol']: dParts['protocol'] = 'http'
+	if not dParts['domain']: dParts['domain'] = 'localhost'
+	if 'path' not in dParts: dParts['path'] = ''
+	else: dParts['path'] = '%s/' % str(dParts['path'])
+
+	# Return the parts
+	return dParts
+
+def _generate_services():
+	"""Generate Services
+
+	Fetches the service information from the config and generates the URLs for
+	all available services
+	"""
+
+	# Pull in the global services
+	global __services
+
+	# Fetch the REST config
+	dRest, iPortMod = _rest_config()
+
+	# If we already have services, close any existing connections
+	if __services:
+		for d in __services.values():
+			if 'balancer' in d:
+				d['balancer'].close()
+
+	# Reset the dict of services
+	__services = {}
+
+	# Loop through the list of services in the rest config
+	for s in dRest['services']:
+
+		# Get the service's config merged with the defaults
+		dParts = _service_parts(dRest, s, iPortMod)
+
+		# Store the parts for the service
+		__services[s] = dParts.copy()
+
+		# Generate the URL of each host and store them, the first is the URL
+		#	of the service
+		__services[s]['hosts'] = _hosts_config(s, dParts, iPortMod)
+		__services[s]['url'] = __services[s]['hosts'][0]
+
+		# If we still have no port, default to 80
+		if 'port' not in __services[s]:
+			__services[s]['port'] = 80
+
+		# Get the pool settings, if there are any
+		dPool = 'pool' in dParts and dParts['pool'] or {}
+		if not isinstance(dPool, dict):
+			raise ValueError(
+				'config.body.rest.services.%s.pool' % s, 'must be a dict'
+			)
+		for k in dPool:
+			if k not in __pool_keys:
+				raise ValueError(
+					'config.body.rest.services.%s.pool.%s' % (s, k),
+					'invalid key'
+				)
+
+		# Store the cache settings for the service
+		__services[s]['cache'] = _cache_config(s, dParts.get('cache'))
+
+		# Identical reads in progress at the same time are coalesced unless
+		#	turned off
+		__services[s]['coalesce'] = bool(dParts.get('coalesce', True))
+
+		# Store the retry policy for the service
+		__services[s]['retry'] = _retry_config(s, dParts.get('retry'))
+
+		# Store the format used to talk to the service
+		try:
+			__services[s]['format'] = formats.by_name(
+				dParts.get('format', 'json')
+			)
+		except KeyError:
+			raise ValueError(
+				'config.body.rest.services.%s.format' % s,
+				'must be one of %s' % ', '.join(formats.names())
+			)
+
+		# Store the compression settings for the service
+		__services[s]['compress'] = _compress_config(s, dParts.get('compress'))
+
+		# Store how isolated the service is from callers when it's running in
+		#	the same process
+		__services[s]['isolation'] = dParts.get('isolation', 'none')
+		if __services[s]['isolation'] not in __isolation_modes:
+			raise ValueError(
+				'config.body.rest.services.%s.isolation' % s,
+				'must be one of %s' % ', '.join(__isolation_modes)
+			)
+
+		# Store the batch settings for the service, and if reads are batched
+		#	automatically, create the window that collects them
+		__services[s]['batch'] = _batch_config(s, dParts.get('batch'))
+		__services[s]['window'] = None
+		dBatch = __services[s]['batch']
+		if dBatch and dBatch['window']:
+			__services[s]['window'] = Window(
+				partial(_windowed, s), dBatch['size'], dBatch['window']
+			)
+
+		# Store the timeouts for the service
+		__services[s]['timeouts'] = _timeouts_config(s, dParts.get('timeouts'))
+
+		# Create the circuit breaker for the service, unless it's turned off
+		dCircuit = dParts.get('circuit', {})
+		if dCircuit is False:
+			__services[s]['circuit'] = None
+		elif not isinstance(dCircuit, dict):
+			raise ValueError(
+				'config.body.rest.services.%s.circuit' % s,
+				'must be a dict or false'
+			)
+		else:
+			try:
+				__services[s]['circuit'] = Circuit(**dCircuit)
+			except TypeError as e:
+				raise ValueError(
+					'config.body.rest.services.%s.circuit' % s, str(e)
+				)
+			except ValueError as e:
+				raise ValueError(
+					'config.body.rest.services.%s.circuit.%s' % (s, e.args[0]),
+					e.args[1]
+				)
+
+		# Create the load balancer, and a connection pool for each host, for
+		#	the service
+		try:
+			__services[s]['balancer'] = Balancer(
+				__services[s]['hosts'],
+				dPool,
+				**_balance_config(s, dParts.get('balance'))
+			)
+		except ValueError as e:
+			raise ValueError(
+				'config.body.rest.services.%s.%s.%s' % (
+					s, e.args[0] in __pool_keys and 'pool' or 'balance',
+					e.args[0]
+				),
+				e.args[1]
+			)
+
+def _after_fork():
+	"""After Fork
+
+	Called in child processes after a fork so that they never share open
+	sockets with the parent process, or try to use its threads
 	"""
-	return request(service, 'create', path, req)
-
-def delete(
-	service: str,
-	path: str,
-	req: dict = {}
-):
-	"""Delete
 
-	Make a DELETE request
+	global __executor, __executor_lock
 
-	Arguments:
-		service (str): The service to call
-		path (str): The path on the service
-		req (dict): The request details, which can include 'data' and 'session'
+	# If we have services, reset each pool
+	if __services:
+		for d in __services.values():
+			if 'balancer' in d:
+				d['balancer'].reset()
 
-	Returns:
-		Response
-	"""
-	return request(service, 'delete', path, req)
+	# Threads don't survive a fork, drop the executor and its lock
+	__executor = None
+	__executor_lock = Lock()
 
-def read(
-	service: str,
-	path: str,
-	req: dict = {}
-):
-	"""Read
+# Make sure forked processes get their own connections and threads
+os.register_at_fork(after_in_child = _after_fork)
 
-	Make a GET request
+def _executor() -> ThreadPoolExecutor:
+	"""Executor
 
-	Arguments:
-		service (str): The service to call
-		path (str): The path on the service
-		req (dict): The request details, which can include 'data' and 'session'
+	Returns the pool of threads shared by everything that needs to make
+	requests concurrently. The number of threads is set by
+	config.body.external.threads, defaults to 32
 
 	Returns:
-		Response
+		ThreadPoolExecutor
 	"""
-	return request(service, 'read', path, req)
 
-def register_service(name: str, instance: Service):
-	"""Register Service
+	global __executor
 
-	Marks a service as internal so that any create, read, update, delete request
-	will call the local instance instead of attempting an http request
+	# If we don't have one yet, create it
+	if __executor is None:
+		with __executor_lock:
+			if __executor is None:
+				__executor = ThreadPoolExecutor(
+					max_workers = int(config.body.external.threads(32)),
+					thread_name_prefix = 'body.external'
+				)
+
+	# Return the executor
+	return __executor
+
+def pool_stats(name: str | None = None) -> dict:
+	"""Pool Stats
+
+	Returns the connection counters for a single service, or for all services
+	by name if no name is passed. Services with several hosts return the
+	counters of every host added together. See Pool.stats for the details
 
 	Arguments:
-		name (str): The name of the service and how others will contact it
-		instance (Service): The created instance of the servce
+		name (str): Optional, the name of the service
+
+	Raises:
+		KeyError if the name doesn't match a service
+
+	Returns:
+		dict
 	"""
 
 	global __services
@@ -120,120 +2122,132 @@ def register_service(name: str, instance: Service):
 	if __services is None:
 		_generate_services()
 
-	# Add the instance and init the paths
-	__services[name]['instance'] = instance
-	__services[name]['paths'] = {}
-
-	# Go through all the request methods in the service
-	for dMethod in instance.requests:
-
-		# Generate the URL
-		sUri = dMethod['name'].replace('_', '/')
+	# If we got a name, return just the one
+	if name is not None:
+		return __services[name]['balancer'].pool_stats()
 
-		# Store the url and action
-		try:
-			__services[name]['paths'][sUri][dMethod['action']] = dMethod['func']
-		except KeyError:
-			__services[name]['paths'][sUri] = {
-				dMethod['action']: dMethod['func']
-			}
+	# Else, return all of them
+	return {
+		k: d['balancer'].pool_stats()
+		for k,d in __services.items()
+	}
 
-	# Return the service
-	return __services[name]
+def prewarm() -> dict:
+	"""Prewarm
 
-def _generate_services():
-	"""Generate Services
+	Opens the configured number of connections (pool.prewarm) to every host of
+	every external service so that the first requests don't pay for the handshakes.
+	Should be called once per process, after any forking has been done. If
+	no services are configured there's nothing to open
 
-	Fetches the service information from the config and generates the URLs for
-	all available services
+	Returns:
+		dict: The number of connections opened by service name
 	"""
 
-	# Pull in the global services
 	global __services
 
-	# Fetch the REST config
-	dRest = config.body.rest({
-		'allowed': None,
-		'default': {
-			'domain': 'localhost',
-			'host': '0.0.0.0',
-			'port': 9000,
-			'protocol': 'http',
-			'workers': 1
-		}
-	})
-
-	# If we didn't get a list of services
-	if 'services' not in dRest:
-		raise ValueError('config.body.rest.services', 'missing')
-
-	# Init the defaults if none are found
-	if 'defaults' not in dRest:
-		dRest['defaults'] = {}
-
-	# Port values are not modified by default
-	iPortMod = 0
-
-	# If there is a port modifier
-	if 'port' in dRest['default']:
-
-		# Make sure it's an integer
-		try:
-			iPortMod = int(dRest['default']['port'])
-			del dRest['default']['port']
-		except ValueError:
-			raise ValueError('config.body.rest.default.port', 'must be an int')
-
-	# Reset the dict of services
-	__services = {}
+	# If we haven't already, generate the list of services, unless there
+	#	aren't any
+	if __services is None:
+		if config.body.rest.services() is None:
+			return {}
+		_generate_services()
 
-	# Loop through the list of services in the rest config
-	for s in dRest['services']:
+	# Go through each service that isn't running in this process and prewarm
+	#	its connections
+	return {
+		k: d['balancer'].prewarm()
+		for k,d in __services.items()
+		if 'instance' not in d
+	}
 
-		# If the service doesn't point to a dict
-		if not isinstance(dRest['services'][s], dict):
-			raise ValueError(
-				'config.body.rest.services.%s' % s, 'must be a dict'
-			)
+def _measure(
+	service: str,
+	action: str,
+	path: str,
+	func: Callable,
+	*args
+) -> any:
+	"""Measure
 
-		# Start with the default values
-		dParts = dRest['default'].copy()
+	Calls the function with the arguments and returns its result. If metrics
+	are on, or there are hooks, the time it took is recorded along with the
+	details the function stored about the call
 
-		# Then add the service values
-		dParts.update(dRest['services'][s])
+	Arguments:
+		service (str): The name of the service
+		action (str): The action taken on the service
+		path (str): The path of the request
+		func (callable): The function making the call
+		*args (any): The arguments passed to the function
 
-		# If we have no port
-		if 'port' not in dParts:
+	Returns:
+		any
+	"""
 
-			# But we have a modifier, assume we add to 80
-			if iPortMod: dParts['port'] = 80 + iPortMod
+	# If nothing is being recorded, just make the call
+	if not metrics.active():
+		return func(*args)
+
+	# Init the details of the call and make them available to anything the
+	#	function calls
+	dCall = {
+		'action': action,
+		'attempts': 0,
+		'cached': False,
+		'error': None,
+		'local': False,
+		'path': path,
+		'received': 0,
+		'sent': 0,
+		'service': service,
+		'status': None
+	}
+	oToken = __call.set(dCall)
+
+	# Make the call, and whatever happens, stop measuring it
+	fStart = perf_counter()
+	try:
+		mRet = func(*args)
+	finally:
+		__call.reset(oToken)
+
+	# Store how long it took and any error, then record it
+	dCall['duration'] = perf_counter() - fStart
+	if isinstance(mRet, Response) and mRet.error:
+		dCall['error'] = mRet.error['code']
+	metrics.record(dCall)
+
+	# Return the result
+	return mRet
 
-		# Else add the modifier to the port passed
-		else:
-			dParts['port'] += iPortMod
+def request(
+	service: str,
+	action: str,
+	path: str,
+	req: MutableMapping = {}
+):
+	"""Request
 
-		# Set defaults for any missing parts
-		if not dParts['protocol']: dParts['protocol'] = 'http'
-		if not dParts['domain']: dParts['domain'] = 'localhost'
-		if 'path' not in dParts: dParts['path'] = ''
-		else: dParts['path'] = '%s/' % str(dParts['path'])
+	Method to convert REST requests into HTTP requests, recording the details
+	of the call if metrics are on. See _request
 
-		# Store the parts for the service
-		__services[s] = dParts.copy()
+	Arguments:
+		service (str): The service we are requesting data from
+		action (str): The action to take on the service
+		path (str): The path of the request
+		req (dict): The request details: 'data', 'session', 'meta', and
+			optionally 'timeout', the maximum number of seconds to wait
 
-		# Generate a URL from the parts and store it
-		__services[s]['url'] = '%s://%s%s/%s' % (
-			dParts['protocol'],
-			dParts['domain'],
-			'port' in dParts and ":%d" % dParts['port'] or '',
-			dParts['path']
-		)
+	Raises:
+		KeyError: if the service or action don't exist
 
-		# If we still have no port, default to 80
-		if 'port' not in __services[s]:
-			__services[s]['port'] = 80
+	Return:
+		Response
+	"""
+	return _measure(service, action, path, _request, service, action, path, req)
 
-def request(
+def _request(
 	service: str,
 	action: str,
 	path: str,
@@ -247,7 +2261,8 @@ def request(
 		service (str): The service we are requesting data from
 		action (str): The action to take on the service
 		path (str): The path of the request
-		req (dict): The request details: 'data', 'session', and 'enviroment'
+		req (dict): The request details: 'data', 'session', 'meta', and
+			optionally 'timeout', the maximum number of seconds to wait
 
 	Raises:
 		KeyError: if the service or action don't exist
@@ -262,28 +2277,24 @@ def request(
 	if __services is None:
 		_generate_services()
 
-	# Init the data and headers
-	sData = ''
-	dHeaders = {}
+	# Figure out when the request has to be done by
+	fDeadline = _deadline(req)
 
-	# Add the default content length and type
-	dHeaders['Content-Length'] = '0'
-	dHeaders['Content-Type'] = 'application/json; charset=utf-8'
-
-	# If the data was passed
-	if 'data' in req and req['data']:
-
-		# Convert the data to JSON and store the length
-		sData = jsonb.encode(req['data'])
-		dHeaders['Content-Length'] = str(len(sData))
-
-	# If we have a session, add the ID to the headers
-	if 'session' in req and req['session']:
-		dHeaders['Authorization'] = req['session'].key()
+	# If the caller has already given up, don't bother
+	if fDeadline is not None and fDeadline <= time():
+		return Error(
+			errors.SERVICE_TIMEOUT,
+			'%s:%s %s deadline exceeded' % ( service, action, path )
+		)
 
 	# If we got a service instance
 	if 'instance' in __services[service]:
 
+		# If the call is being measured, mark it as in process
+		dCall = __call.get()
+		if dCall is not None:
+			dCall['local'] = True
+
 		# Try to find the method
 		try:
 			f = __services[service]['paths'][path][action]
@@ -297,9 +2308,17 @@ def request(
 			else:
 				raise e
 
-		# Try to call the method
+		# Get how much the service is isolated from the caller
+		sIsolation = __services[service]['isolation']
+
+		# Pass the deadline on to anything the method calls
+		oToken = deadline.push(fDeadline)
+
+		# Try to call the method, waiting for it if it's async
 		try:
-			return f(jobject(req))
+			oResponse = f(_isolate(req, sIsolation))
+			if inspect.isawaitable(oResponse):
+				oResponse = loop.run(oResponse)
 
 		# If we got a KeyError
 		except (AttributeError, KeyError) as e:
@@ -310,71 +2329,271 @@ def request(
 			else:
 				raise e
 
-		# If we got a response exception, return the Response
+		# If we got a response exception, use the Response
 		except ResponseException as e:
-			return e.args[0]
+			oResponse = e.args[0]
+
+		# Whatever happens, restore the previous deadline
+		finally:
+			deadline.pop(oToken)
+
+		# If the method returned an iterator of items, it's the data
+		if _stream.is_stream(oResponse):
+			oResponse = Response(oResponse)
+
+		# If the service is fully isolated, make sure the caller can't change
+		#	anything the service kept a reference to
+		if sIsolation == 'deep':
+			if _stream.is_stream(oResponse.data):
+				oResponse.data = map(deepcopy, oResponse.data)
+			else:
+				oResponse = Response.from_dict(deepcopy(oResponse.to_dict()))
+
+		# Return the Response
+		return oResponse
 
 	# Else, this is an external service
 	else:
 
-		# If we received any meta vars
-		if 'meta' in req and req['meta']:
-			for k,v in req['meta'].items():
-				dHeaders['X-Body-%s' % k] = v
-
-		# Loop requests so we don't fail just because of a network hiccup
-		iAttempts = 0
-		while True:
+		# Generate the headers, then encode the data
+		dHeaders = _headers(service, req, fDeadline)
+		sData = _encode(service, req.get('data'), dHeaders)
 
-			# Increase the attempts
-			iAttempts += 1
+		# If it's a read
+		if action == 'read':
 
-			# Make the request using the services URL and the current path, then
-			#	store the response
-			try:
-				oRes = __action_to_request[action][0](
-					__services[service]['url'] + path,
-					data = sData,
-					headers = dHeaders
+			# If the path is cached, use the cache
+			dSettings = _cache_settings(service, path)
+			if dSettings:
+				return _cached(
+					service, path, req, dSettings, sData, dHeaders, fDeadline
 				)
 
-				# If the request wasn't successful
-				if oRes.status_code != 200:
+			# If identical reads are coalesced, only send one at a time
+			if __services[service]['coalesce']:
+				return _coalesced(
+					service, path, _read_key(service, path, req, dHeaders),
+					req, sData, dHeaders, fDeadline
+				)[0]
 
-					# If we got a 401
-					if oRes.status_code == 401:
-						return Response.from_json(oRes.content)
-					else:
-						return Error(
-							errors.SERVICE_STATUS,
-							'%d: %s' % (oRes.status_code, oRes.content)
-						)
+			# Make the request and return the Response
+			return _read(
+				service, path, req, sData, dHeaders, fDeadline
+			)[0]
 
-				# If we got the wrong content type
-				if oRes.headers['Content-Type'].lower() != \
-					'application/json; charset=utf-8':
-					return Error(
-						errors.SERVICE_CONTENT_TYPE,
-						'%s' % oRes.headers['content-type']
-					)
+		# Make the request and return the Response
+		return _send(service, action, path, sData, dHeaders, fDeadline)[0]
+
+def _send(
+	service: str,
+	action: str,
+	path: str,
+	data: str,
+	headers: dict,
+	until: float | None = None,
+	stream: bool = False
+) -> tuple:
+	"""Send
+
+	Makes the HTTP request to an external service and returns the Response
+	along with the Content-Type, raw body, and ETag it was generated from, if
+	there was any. If the headers include If-None-Match, and the service
+	replies that it still matches, there's no Response, only ( None, None )
+
+	Arguments:
+		service (str): The name of the service
+		action (str): The action to take on the service
+		path (str): The path of the request
+		data (str): The encoded data to send
+		headers (dict): The headers to send
+		until (float): Optional, the unix timestamp the request must be done
+			by
+		stream (bool): Optional, set to True if the service can send its
+			items one at a time, in which case the data of the Response is an
+			iterator and there's no raw body
+
+	Returns:
+		( Response, ( str, bytes | str, str | None ) | None )
+	"""
+
+	# Get the service, its retry policy, its circuit breaker, and its load
+	#	balancer
+	dService = __services[service]
+	dRetry = dService['retry']
+	oCircuit = dService['circuit']
+	oBalancer = dService['balancer']
+
+	# Is the action one that can be retried
+	bRetry = action in dRetry['actions']
+
+	# Get the details of the call if it's being measured
+	dCall = __call.get()
+
+	# Requests for many items of a noun have their own URI
+	sPath = action.endswith('_many') and ('%s/%s' % ( path, MANY )) or path
+
+	# Loop requests so we don't fail just because of a network hiccup
+	iAttempts = 0
+	while True:
+
+		# Increase the attempts
+		iAttempts += 1
+
+		# Start with the service's timeouts
+		fConnect = dService['timeouts']['connect']
+		fRead = dService['timeouts']['read']
+
+		# If we have a deadline
+		if until is not None:
+
+			# If it's passed, don't bother trying
+			fLeft = until - time()
+			if fLeft <= 0:
+				return ( Error(
+					errors.SERVICE_TIMEOUT,
+					'%s:%s %s deadline exceeded' % ( service, action, path )
+				), None )
+
+			# Make sure the timeouts don't go past it
+			fConnect = fConnect is None and fLeft or min(fConnect, fLeft)
+			fRead = fRead is None and fLeft or min(fRead, fLeft)
+
+		# If the service has been failing, don't bother trying
+		if oCircuit and not oCircuit.allow():
+			return ( Error(
+				errors.SERVICE_UNREACHABLE,
+				'%s: circuit open' % service
+			), None )
+
+		# Pick the host to send the request to
+		oHost = oBalancer.pick()
+
+		# If the call is being measured, count the attempt and what's sent
+		if dCall is not None:
+			dCall['attempts'] += 1
+			dCall['sent'] += len(data or b'')
+
+		# Make the request using the host's URL and the current path, then
+		#	store the response
+		try:
+			oRes = oHost.pool.request(
+				__action_to_method[action],
+				oHost.url + sPath,
+				data = data,
+				headers = headers,
+				timeout = ( fConnect, fRead ),
+				stream = stream
+			)
 
-				# Turn the content into a Response and return it
-				return Response.from_json(oRes.text)
+		# If we couldn't connect to the service, or it took too long
+		except (requests.ConnectionError, requests.Timeout) as e:
 
-			# If we couldn't connect to the service
-			except requests.ConnectionError as e:
+			# Let the circuit and balancer know
+			if oCircuit:
+				oCircuit.failure()
+			oBalancer.release(oHost, False)
 
-				# If we haven't exhausted attempts
-				if iAttempts < 3:
+			# Figure out the type of error
+			bTimeout = isinstance(e, requests.ReadTimeout)
 
-					# Wait for a second
-					sleep(1)
+			# If the error can be retried, and we haven't exhausted attempts
+			if bRetry and iAttempts < dRetry['attempts'] and \
+				(bTimeout and 'timeout' or 'connection') in dRetry['errors']:
+
+				# If waiting won't put us past the deadline, wait, then loop
+				#	back around
+				fDelay = _retry_delay(dRetry, iAttempts)
+				if until is None or (time() + fDelay) < until:
+					sleep(fDelay)
+					continue
 
-					# Loop back around
+			# We've tried enough, return an error
+			return ( Error(
+				bTimeout and errors.SERVICE_TIMEOUT or errors.SERVICE_UNREACHABLE,
+				str(e)
+			), None )
+
+		# If anything else went wrong, count it as a failure, so that a
+		#	probe of the circuit isn't left waiting forever, and make sure the
+		#	host isn't left busy
+		except Exception:
+			if oCircuit:
+				oCircuit.failure()
+			oBalancer.release(oHost, None)
+			raise
+
+		# If the call is being measured, store the status and what was
+		#	received, unless it's being streamed and hasn't been read yet
+		if dCall is not None:
+			dCall['status'] = oRes.status_code
+			sLength = oRes.headers.get('Content-Length')
+			if sLength is not None:
+				dCall['received'] += int(sLength)
+			elif not stream:
+				dCall['received'] += len(oRes.content)
+
+		# Let the circuit and balancer know if the service is failing or not
+		if oCircuit:
+			if oRes.status_code >= 500:
+				oCircuit.failure()
+			else:
+				oCircuit.success()
+		oBalancer.release(oHost, oRes.status_code < 500)
+
+		# If we asked if a copy is still current, and it is, there's nothing
+		#	else to return
+		if oRes.status_code == 304 and 'If-None-Match' in headers:
+			return ( None, None )
+
+		# If the request wasn't successful
+		if oRes.status_code != 200:
+
+			# If the status can be retried, and we haven't exhausted attempts
+			if bRetry and iAttempts < dRetry['attempts'] and \
+				oRes.status_code in dRetry['statuses']:
+
+				# If waiting won't put us past the deadline, release the
+				#	connection, wait, then loop back around
+				fDelay = _retry_delay(dRetry, iAttempts)
+				if until is None or (time() + fDelay) < until:
+					oRes.close()
+					sleep(fDelay)
 					continue
 
-				# We've tried enough, return an error
-				return Error(errors.SERVICE_UNREACHABLE, str(e))
+			# If we got a 401
+			if oRes.status_code == 401:
+				return ( Response.from_json(oRes.content), None )
+			else:
+				return ( Error(
+					errors.SERVICE_STATUS,
+					'%d: %s' % (oRes.status_code, oRes.content)
+				), None )
+
+		# If we got a stream, return a Response that reads it as the items
+		#	are iterated over
+		sContentType = oRes.headers.get('Content-Type', '').lower()
+		if stream and sContentType == _stream.CONTENT_TYPE:
+			return ( Response(_stream.items(oRes)), None )
+
+		# If we got a content type we don't understand, or JSON that isn't
+		#	utf-8
+		oFormat = formats.by_mime(sContentType)
+		if oFormat is None or (
+			oFormat is formats.JSON and
+			sContentType != formats.JSON.content_type
+		):
+			return ( Error(
+				errors.SERVICE_CONTENT_TYPE,
+				'%s' % sContentType
+			), None )
+
+		# Get the raw body, as bytes, which every format decodes directly,
+		#	along with the ETag, if there is one
+		tRaw = ( oFormat.mime, oRes.content, oRes.headers.get('ETag') )
+
+		# Turn the content into a Response, one that's only decoded if it's
+		#	looked at, and return it along with the raw body
+		return ( RawResponse(tRaw[1], tRaw[0]), tRaw )
 
 def service_info(name: str) -> dict:
 	"""Service Info
@@ -400,6 +2619,125 @@ def service_info(name: str) -> dict:
 	# Return a shallow copy of the info for the service
 	return copy(__services[name])
 
+def set_hosts(name: str, hosts: List[str]):
+	"""Set Hosts
+
+	Replaces the hosts of a single external service with a list of base URLs,
+	e.g. [ 'http://10.0.0.1:9001/', 'http://10.0.0.2:9001/' ]. Connections
+	to hosts that are in both lists are kept, requests already sent to hosts
+	that were removed finish normally
+
+	Arguments:
+		name (str): The name of the service
+		hosts (str[]): The base URL of each host
+
+	Raises:
+		KeyError if the name doesn't match a service
+		ValueError if the list is empty
+
+	Returns:
+		None
+	"""
+
+	global __services
+
+	# If we haven't already, generate the list of services
+	if __services is None:
+		_generate_services()
+
+	# Make sure every URL ends in a slash so paths can be added to it
+	lHosts = [ s.endswith('/') and s or ('%s/' % s) for s in hosts ]
+
+	# Update the balancer, then the details of the service
+	__services[name]['balancer'].update(lHosts)
+	__services[name]['hosts'] = lHosts
+	__services[name]['url'] = lHosts[0]
+
+def stream(
+	service: str,
+	path: str,
+	req: dict = {}
+) -> Response:
+	"""Stream
+
+	Make a GET request to a noun that returns its items one at a time. If
+	there's no error, the data of the Response is an iterator that yields
+	each item as it arrives, without ever holding all of them in memory.
+	Nouns that return a list instead still work, the data is just the list
+
+	oRes = body.external.stream('myservice', 'export', { 'data': { ... } })
+	if oRes.error:
+		return oRes
+	for dItem in oRes.data:
+		...
+
+	If the stream fails part way through, iterating raises a
+	ResponseException with the error
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data', 'session',
+			'meta', and 'timeout'
+
+	Returns:
+		Response
+	"""
+	return _measure(service, 'read', path, _stream_request, service, path, req)
+
+def _stream_request(
+	service: str,
+	path: str,
+	req: dict = {}
+) -> Response:
+	"""Stream Request
+
+	Makes the request for stream()
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details
+
+	Returns:
+		Response
+	"""
+
+	global __services
+
+	# If we haven't already, generate the list of services
+	if __services is None:
+		_generate_services()
+
+	# If the service is in this process, the method returns the iterator
+	#	itself
+	if 'instance' in __services[service]:
+		return _request(service, 'read', path, req)
+
+	# Figure out when the request has to be done by
+	fDeadline = _deadline(req)
+
+	# If the caller has already given up, don't bother
+	if fDeadline is not None and fDeadline <= time():
+		return Error(
+			errors.SERVICE_TIMEOUT,
+			'%s:read %s deadline exceeded' % ( service, path )
+		)
+
+	# Generate the headers, ask for a stream before anything else, then
+	#	encode the data
+	dHeaders = _headers(service, req, fDeadline)
+	dHeaders['Accept'] = '%s, %s; q=0.9' % (
+		_stream.MIME, dHeaders.get('Accept', formats.JSON.mime)
+	)
+	sData = _encode(service, req.get('data'), dHeaders)
+
+	# Make the request and return the Response, streams are never cached or
+	#	coalesced
+	return _send(
+		service, 'read', path, sData, dHeaders, fDeadline, True
+	)[0]
+
 def update(
 	service: str,
 	path: str,
@@ -417,4 +2755,24 @@ def update(
 	Returns:
 		Response
 	"""
-	return request(service, 'update', path, req)
\ No newline at end of file
+	return request(service, 'update', path, req)
+
+def update_many(
+	service: str,
+	path: str,
+	req: dict = {}
+):
+	"""Update Many
+
+	Make a PUT request to update many items of a noun at once, the data is
+	the list of items
+
+	Arguments:
+		service (str): The service to call
+		path (str): The path on the service
+		req (dict): The request details, which can include 'data' and 'session'
+
+	Returns:
+		Response: see body.response.Many
+	"""
+	return request(service, 'update_many', path, req)
\ No newline at end of file
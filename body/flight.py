@@ -0,0 +1,146 @@
+# coding=utf8
+"""Flight
+
+Holds the class used to make sure identical calls made at the same time only
+run once
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'Flight' ]
+
+# Python imports
+from threading import Event, Lock
+from time import time
+
+class _Call(object):
+	"""Call
+
+	A private class used to hold the details of a single call in flight
+	"""
+
+	__slots__ = ( 'error', 'event', 'result' )
+
+	def __init__(self):
+		"""Constructor
+
+		Creates a new instance
+
+		Returns:
+			_Call
+		"""
+		self.error = None
+		self.event = Event()
+		self.result = None
+
+class Flight(object):
+	"""Flight
+
+	Single flight, coalesces identical calls, by key, so that while one is in
+	progress any others wait for it and share its result instead of running
+	again
+	"""
+
+	def __init__(self):
+		"""Constructor
+
+		Creates a new instance
+
+		Returns:
+			Flight
+		"""
+		self._calls = {}
+		self._lock = Lock()
+		self._coalesced = 0
+		self._runs = 0
+
+	def run(self,
+		key: str,
+		func: callable,
+		*args,
+		until: float | None = None,
+		**kwargs
+	) -> tuple:
+		"""Run
+
+		Calls the function unless a call with the same key is already in
+		progress, in which case it waits for that call and returns its result.
+		If the call raises an exception, every caller gets it
+
+		Arguments:
+			key (str): The key that identifies identical calls
+			func (callable): The function to call
+			*args (any): The arguments to pass to the function
+			until (float): Optional, the unix timestamp to stop waiting for
+				a call in progress at, the call itself isn't stopped
+			**kwargs (any): The named arguments to pass to the function
+
+		Raises:
+			TimeoutError: If the call in progress isn't done by until
+
+		Returns:
+			( any, bool ): The result, and True if it came from another call
+		"""
+
+		with self._lock:
+
+			# If the call is already in progress, count it and wait for it
+			try:
+				oCall = self._calls[key]
+				self._coalesced += 1
+				bLeader = False
+
+			# Else, we make the call
+			except KeyError:
+				oCall = _Call()
+				self._calls[key] = oCall
+				self._runs += 1
+				bLeader = True
+
+		# If someone else is making the call, wait for it, but no longer than
+		#	we were given
+		if not bLeader:
+			if until is None:
+				oCall.event.wait()
+			elif not oCall.event.wait(max(0, until - time())):
+				raise TimeoutError(key)
+			if oCall.error is not None:
+				raise oCall.error
+			return ( oCall.result, True )
+
+		# Make the call
+		try:
+			oCall.result = func(*args, **kwargs)
+		except BaseException as e:
+			oCall.error = e
+			raise
+
+		# Whatever happens, remove the call and let anyone waiting know
+		finally:
+			with self._lock:
+				del self._calls[key]
+			oCall.event.set()
+
+		# Return the result
+		return ( oCall.result, False )
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the number of calls made, the number of calls that waited on
+		another instead, and the number currently in progress
+
+		Returns:
+			dict
+		"""
+		with self._lock:
+			return {
+				'coalesced': self._coalesced,
+				'in_flight': len(self._calls),
+				'runs': self._runs
+			}
\ No newline at end of file
@@ -0,0 +1,326 @@
+# coding=utf8
+"""Formats
+
+Registry of the formats, and their Content-Types, that requests and responses
+can be encoded in. JSON is always available, and uses orjson if it's installed,
+MessagePack is added if the msgpack module is installed
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [
+	'by_mime', 'by_name', 'Format', 'JSON', 'json_backend', 'names',
+	'negotiate', 'register'
+]
+
+# Ouroboros imports
+from config import config
+import jsonb
+
+# Python imports
+from collections.abc import Callable
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+class Format(object):
+	"""Format
+
+	Holds the details of a single format
+	"""
+
+	__slots__ = ( 'content_type', 'decode', 'encode', 'mime', 'name' )
+
+	def __init__(self,
+		name: str,
+		mime: str,
+		encode: Callable[[Any], bytes | str],
+		decode: Callable[[bytes | str], Any],
+		charset: str | None = None
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			name (str): The short name of the format, e.g. 'json'
+			mime (str): The mime type of the format, e.g. 'application/json'
+			encode (callable): Takes any value and returns the encoded bytes or
+				str
+			decode (callable): Takes the encoded bytes or str and returns the
+				value
+			charset (str): Optional, the charset to add to the Content-Type
+
+		Returns:
+			Format
+		"""
+		self.name = name
+		self.mime = mime.lower()
+		self.content_type = charset and \
+			('%s; charset=%s' % (self.mime, charset)) or \
+			self.mime
+		self.encode = encode
+		self.decode = decode
+
+def _simplify(val: Any) -> Any:
+	"""Simplify
+
+	Used by binary formats to convert any value they don't understand, like
+	Decimal or datetime, into the same value JSON would have sent
+
+	Arguments:
+		val (any): The value to simplify
+
+	Returns:
+		any
+	"""
+	return jsonb.decode(jsonb.encode(val))
+
+def _jsonb_encode(val: Any) -> bytes:
+	"""JSONB Encode
+
+	Encodes a value as JSON using jsonb
+
+	Arguments:
+		val (any): The value to encode
+
+	Returns:
+		bytes
+	"""
+	return jsonb.encode(val).encode('utf-8')
+
+# If orjson is installed, set up the functions to use it
+try:
+	import orjson
+
+	__orjson_options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+	"""Keys that aren't strings are converted, like json does, and dates and
+	times are passed to the default, so they're sent the same as with jsonb"""
+
+	def _orjson_default(val: Any) -> str:
+		"""orjson Default
+
+		Converts the values orjson can't, Decimal and datetime, exactly as
+		jsonb does. Anything else, e.g. a class added with jsonb.add_class,
+		raises, so that the entire value is encoded by jsonb instead
+
+		Arguments:
+			val (any): The value to convert
+
+		Raises:
+			TypeError
+
+		Returns:
+			str
+		"""
+		if isinstance(val, Decimal):
+			return '{0:f}'.format(val)
+		if isinstance(val, datetime):
+			return val.strftime('%Y-%m-%d %H:%M:%S')
+		raise TypeError(type(val).__name__)
+
+	def _orjson_encode(val: Any) -> bytes:
+		"""orjson Encode
+
+		Encodes a value as JSON using orjson, or jsonb if orjson can't, e.g.
+		because of an int larger than 64 bits, or a class only jsonb knows.
+		Unlike jsonb, NaN and Infinity are encoded as null
+
+		Arguments:
+			val (any): The value to encode
+
+		Returns:
+			bytes
+		"""
+		try:
+			return orjson.dumps(
+				val, default = _orjson_default, option = __orjson_options
+			)
+		except orjson.JSONEncodeError:
+			return _jsonb_encode(val)
+
+except ImportError:
+	orjson = None
+
+JSON = Format('json', 'application/json', _jsonb_encode, jsonb.decode, 'utf-8')
+"""The JSON format, the default for everything. Encodes to bytes, and decodes
+bytes or str, see json_backend"""
+
+__by_mime = { JSON.mime: JSON }
+"""Formats by mime type"""
+
+__by_name = { JSON.name: JSON }
+"""Formats by short name"""
+
+def by_mime(content_type: str | None) -> Format | None:
+	"""By Mime
+
+	Returns the format associated with a Content-Type header, ignoring any
+	parameters like charset, or None if the type isn't registered
+
+	Arguments:
+		content_type (str): The value of the Content-Type header
+
+	Returns:
+		Format | None
+	"""
+	if not content_type:
+		return None
+	return __by_mime.get(content_type.split(';', 1)[0].strip().lower())
+
+def by_name(name: str) -> Format:
+	"""By Name
+
+	Returns the format associated with the short name
+
+	Arguments:
+		name (str): The short name of the format
+
+	Raises:
+		KeyError: if the format doesn't exist
+
+	Returns:
+		Format
+	"""
+	return __by_name[name]
+
+def json_backend(
+	backend: str = 'auto',
+	decimal: bool = True
+) -> str:
+	"""JSON Backend
+
+	Sets the module used to encode and decode JSON. 'orjson' is much faster,
+	but can't decode numbers with decimals as Decimal, like jsonb does, so it
+	only decodes if decimal is False, in which case they're floats. Encoded
+	JSON is the same either way, minus the spaces, except for NaN and
+	Infinity, which orjson encodes as null, and jsonb as NaN and Infinity,
+	which aren't valid JSON
+
+	Arguments:
+		backend (str): 'auto' to use orjson if it's installed, 'orjson', or
+			'jsonb'
+		decimal (bool): Set to False to decode numbers with decimals as
+			floats, allowing orjson to decode as well
+
+	Raises:
+		ValueError
+
+	Returns:
+		str: The backend now in use
+	"""
+
+	# Check the backend
+	if backend not in [ 'auto', 'jsonb', 'orjson' ]:
+		raise ValueError('backend', 'must be "auto", "jsonb", or "orjson"')
+	if backend == 'orjson' and orjson is None:
+		raise ValueError('backend', 'orjson is not installed')
+
+	# Set the functions
+	if backend == 'jsonb' or orjson is None:
+		JSON.encode = _jsonb_encode
+		JSON.decode = jsonb.decode
+		return 'jsonb'
+	JSON.encode = _orjson_encode
+	JSON.decode = decimal and jsonb.decode or orjson.loads
+	return 'orjson'
+
+def names() -> list:
+	"""Names
+
+	Returns the short names of all registered formats
+
+	Returns:
+		str[]
+	"""
+	return list(__by_name.keys())
+
+def negotiate(accept: str | None) -> Format:
+	"""Negotiate
+
+	Returns the format to use based on the value of an Accept header. Only
+	types explicitly listed are considered, anything else, including no header
+	or wildcards, gets JSON, so browsers are never sent anything else
+
+	Arguments:
+		accept (str): The value of the Accept header
+
+	Returns:
+		Format
+	"""
+
+	# If there's no header, use JSON
+	if not accept:
+		return JSON
+
+	# Go through each type and find the one with the best quality, ties go to
+	#	the first one listed
+	oBest = JSON
+	fBest = 0.0
+	for s in accept.split(','):
+		l = s.split(';')
+		oFormat = __by_mime.get(l[0].strip().lower())
+		if oFormat is None:
+			continue
+		fQuality = 1.0
+		for p in l[1:]:
+			p = p.strip()
+			if p.startswith('q='):
+				try: fQuality = float(p[2:])
+				except ValueError: fQuality = 0.0
+		if fQuality > fBest:
+			oBest = oFormat
+			fBest = fQuality
+
+	# Return the best
+	return oBest
+
+def register(
+	name: str,
+	mime: str,
+	encode: Callable[[Any], bytes | str],
+	decode: Callable[[bytes | str], Any],
+	charset: str | None = None
+) -> Format:
+	"""Register
+
+	Adds a format, or replaces an existing one with the same name or mime
+
+	Arguments:
+		name (str): The short name of the format, e.g. 'json'
+		mime (str): The mime type of the format, e.g. 'application/json'
+		encode (callable): Takes any value and returns the encoded bytes or str
+		decode (callable): Takes the encoded bytes or str and returns the value
+		charset (str): Optional, the charset to add to the Content-Type
+
+	Returns:
+		Format
+	"""
+	oFormat = Format(name, mime, encode, decode, charset)
+	__by_mime[oFormat.mime] = oFormat
+	__by_name[oFormat.name] = oFormat
+	return oFormat
+
+# Set the JSON backend from the config
+try:
+	__json = config.body.json({ 'backend': 'auto', 'decimal': True })
+	json_backend(__json.get('backend', 'auto'), __json.get('decimal', True))
+except ValueError as e:
+	raise ValueError('config.body.json.%s' % e.args[0], e.args[1])
+
+# If msgpack is installed, register it
+try:
+	import msgpack
+	register(
+		'msgpack',
+		'application/msgpack',
+		lambda val: msgpack.packb(val, default = _simplify),
+		lambda val: msgpack.unpackb(val, strict_map_key = False)
+	)
+except ImportError:
+	pass
\ No newline at end of file
@@ -0,0 +1,553 @@
+# coding=utf8
+"""Ingest
+
+Holds the decorator used to let a noun receive a large request body one item
+at a time, and the classes and functions used to spill the body to a
+temporary file and read the items back out of it
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'Items', 'settings', 'spool', 'streamed' ]
+
+# Python imports
+import codecs
+from collections.abc import Callable
+import json
+import re
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO
+import zlib
+
+# Local imports
+from body import formats
+from body.errors import REST_REQUEST_DATA
+from body.response import Error, ResponseException
+
+ATTRIBUTE = '_body_streamed'
+"""The attribute the settings are stored under on the noun's method"""
+
+CHUNK = 65536
+"""The number of bytes read at a time"""
+
+SPOOLED = 'body.spooled'
+"""The key set in the WSGI environment when the server has already spooled
+the body, see body.asgi"""
+
+def settings(func: Callable) -> dict | None:
+	"""Settings
+
+	Returns the settings stored on a noun's method by the decorator, or None
+	if it wasn't decorated
+
+	Arguments:
+		func (callable): The method
+
+	Returns:
+		dict | None
+	"""
+	return getattr(func, ATTRIBUTE, None)
+
+def spool(
+	source: BinaryIO,
+	length: int | None,
+	max_bytes: int | None = None,
+	memory: int = 1048576,
+	spooled: bool = False
+) -> SpooledTemporaryFile:
+	"""Spool
+
+	Copies a body, one chunk at a time, into a file that's kept in memory
+	until it's larger than `memory` bytes, and is then moved to disk. The
+	file returned is at its start. A body that's already been spooled is
+	returned as is, rather than copied again
+
+	Arguments:
+		source (file): The body, e.g. wsgi.input
+		length (uint): The number of bytes to read, or None to read until
+			there's nothing left
+		max_bytes (uint): Optional, the maximum size of the body
+		memory (uint): Optional, the maximum number of bytes kept in memory
+		spooled (bool): Optional, True if the source is already a spooled
+			file at its start, of exactly length bytes
+
+	Raises:
+		ValueError: If the body is larger than max_bytes, or shorter than
+			its length
+
+	Returns:
+		SpooledTemporaryFile
+	"""
+
+	# If we know the length, and it's too big, don't bother reading it
+	if length is not None and max_bytes is not None and length > max_bytes:
+		raise ValueError('body', 'larger than %d bytes' % max_bytes)
+
+	# If it's already been spooled, there's nothing to copy
+	if spooled:
+		return source
+
+	# Copy the body one chunk at a time
+	oFile = SpooledTemporaryFile(max_size = memory)
+	iTotal = 0
+	try:
+		while length is None or iTotal < length:
+			b = source.read(
+				length is None and CHUNK or min(CHUNK, length - iTotal)
+			)
+			if not b:
+				break
+			iTotal += len(b)
+			if max_bytes is not None and iTotal > max_bytes:
+				raise ValueError('body', 'larger than %d bytes' % max_bytes)
+			oFile.write(b)
+
+		# If we didn't get all of it
+		if length is not None and iTotal < length:
+			raise ValueError('body', 'ended after %d bytes' % iTotal)
+
+	# If anything went wrong, don't leave the file behind
+	except Exception:
+		oFile.close()
+		raise
+
+	# Go back to the start and return the file
+	oFile.seek(0)
+	return oFile
+
+def streamed(
+	max_bytes: int | None = None,
+	memory: int = 1048576
+) -> Callable:
+	"""Streamed
+
+	Decorator used on the create, update, or delete method of a noun to
+	receive the body one item at a time. Instead of being decoded all at once,
+	the body is spilled to a temporary file, and the data of the request is
+	an Items instance that decodes each element of the JSON array, or each
+	line of newline delimited JSON, as it's iterated over. Memory stays the
+	same no matter how large the body is
+
+	class MyService(Service):
+
+		@streamed(max_bytes = 1073741824)
+		def products_create(self, req):
+			for d in req.data:
+				...
+
+	When the method is called in the same process, the data is whatever the
+	caller sent, so only iterate over it
+
+	Arguments:
+		max_bytes (uint): Optional, the maximum size of the body, after it's
+			decompressed
+		memory (uint): Optional, the maximum number of bytes of the body kept
+			in memory before it's moved to disk
+
+	Raises:
+		ValueError
+
+	Returns:
+		callable
+	"""
+
+	# Validate the settings
+	if max_bytes is not None:
+		try:
+			max_bytes = int(max_bytes)
+			if max_bytes < 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('max_bytes', 'must be an int greater than 0')
+	try:
+		iMemory = int(memory)
+		if iMemory < 0: raise ValueError()
+	except (TypeError, ValueError):
+		raise ValueError('memory', 'must be an int of 0 or greater')
+
+	def decorator(func: Callable) -> Callable:
+
+		# Reads get their data from the query string, not the body
+		if func.__name__.endswith('_read'):
+			raise ValueError('func', 'can not be the read method of a noun')
+
+		# Store the settings on the method and return it as is
+		setattr(func, ATTRIBUTE, {
+			'max_bytes': max_bytes,
+			'memory': iMemory
+		})
+		return func
+
+	return decorator
+
+
+class Items(object):
+	"""Items
+
+	Iterates over the elements of a JSON array, or the lines of newline
+	delimited JSON, stored in a file, reading and decoding only as much as
+	is needed for the next item. If the body is invalid, a ResponseException
+	with a REST_REQUEST_DATA error is raised once the invalid part is reached,
+	the items before it have already been returned
+	"""
+
+	__blank = re.compile(r'[ \t\r]*')
+	"""Matches the whitespace allowed after the value on a line"""
+
+	__encodings = {
+		'deflate': 15,
+		'gzip': 31
+	}
+	"""The zlib window bits of the Content-Encodings that can be decompressed
+	one chunk at a time"""
+
+	__scan = re.compile(r'[\[\]{},"\\]')
+	"""Finds the next character that could end an element of the array, or
+	change where it ends"""
+
+	__space = re.compile(r'[ \t\n\r]*')
+	"""Matches whitespace"""
+
+	def __init__(self,
+		file: BinaryIO,
+		lines: bool = False,
+		encoding: str | None = None,
+		max_bytes: int | None = None
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			file (file): The file the body is in, at its start
+			lines (bool): Optional, True if the body is newline delimited
+				JSON, else it's a JSON array
+			encoding (str): Optional, the Content-Encoding of the body
+			max_bytes (uint): Optional, the maximum size of the body once
+				decompressed
+
+		Raises:
+			KeyError: If the Content-Encoding can't be decompressed one chunk
+				at a time
+
+		Returns:
+			Items
+		"""
+
+		# Store the file and format
+		self._file = file
+		self._lines = lines
+		self._max = max_bytes
+
+		# If the body is compressed, get a decompressor
+		self._zlib = None
+		if encoding and encoding.strip().lower() != 'identity':
+			self._zlib = zlib.decompressobj(
+				self.__encodings[encoding.strip().lower()]
+			)
+
+		# Characters can be split between chunks, so decode them as they come
+		self._utf8 = codecs.getincrementaldecoder('utf-8')()
+
+		# Decode the items the same way the JSON format would, keeping floats
+		#	as Decimals if it does
+		oFloat = type(formats.JSON.decode(b'0.5'))
+		self._decoder = json.JSONDecoder(
+			parse_float = oFloat is not float and oFloat or None
+		)
+
+		# Init the state, lines are always waiting for a value, arrays for
+		#	the opening bracket
+		self._buffer = ''
+		self._done = False
+		self._eof = False
+		self._pos = 0
+		self._state = lines and 'value' or 'open'
+		self._total = 0
+
+		self.count = 0
+		"""The number of items returned so far"""
+
+	def __enter__(self) -> Items:
+		"""Enter (__enter__)
+
+		Python magic method called when the instance is used with `with`
+
+		Returns:
+			Items
+		"""
+		return self
+
+	def __exit__(self, *args):
+		"""Exit (__exit__)
+
+		Python magic method called when leaving the `with`, closes the file
+
+		Returns:
+			None
+		"""
+		self.close()
+
+	def __iter__(self) -> Items:
+		"""Iterator (__iter__)
+
+		Python magic method that returns the iterator
+
+		Returns:
+			Items
+		"""
+		return self
+
+	def __next__(self) -> any:
+		"""Next (__next__)
+
+		Python magic method that returns the next item
+
+		Raises:
+			ResponseException: If the body is invalid
+			StopIteration: If there are no more items
+
+		Returns:
+			any
+		"""
+
+		# If we already found the end, there's nothing left
+		if self._done:
+			raise StopIteration
+
+		# Get the next item
+		try:
+			m = self._next()
+		except ValueError as e:
+			self._done = True
+			raise ResponseException(Error(
+				REST_REQUEST_DATA, 'item %d: %s' % ( self.count, str(e) )
+			))
+
+		# Count it and return it
+		self.count += 1
+		return m
+
+	def _complete(self) -> bool:
+		"""Complete
+
+		Returns True if the item at the current position ends somewhere in
+		the buffer, meaning it failed to decode because it's invalid, and not
+		because the rest of it hasn't been read yet
+
+		Returns:
+			bool
+		"""
+
+		# Lines can't contain a new line, except escaped in a string
+		if self._lines:
+			return self._buffer.find('\n', self._pos) != -1
+
+		# Look for a comma or closing bracket outside of any string, object,
+		#	or array
+		iDepth = 0
+		bString = False
+		i = self._pos
+		while True:
+			m = self.__scan.search(self._buffer, i)
+			if m is None:
+				return False
+			c = m.group()
+			i = m.end()
+
+			# Skip anything escaped, and look for the end of strings
+			if c == '\\':
+				i += 1
+			elif c == '"':
+				bString = not bString
+
+			# Track the depth outside of strings, and look for the end
+			elif not bString:
+				if c in '[{':
+					iDepth += 1
+				elif iDepth == 0 and c in ',]':
+					return True
+				elif c in ']}':
+					iDepth -= 1
+
+	def _grow(self) -> bool:
+		"""Grow
+
+		Reads until what's left of the buffer is at least twice as long, so
+		that items larger than a chunk are decoded a few times, not once per
+		chunk
+
+		Raises:
+			ValueError: If the body is too large, or can't be decompressed
+
+		Returns:
+			bool: False if there was nothing left to read
+		"""
+		iWant = 2 * (len(self._buffer) - self._pos)
+		bRead = False
+		while self._read():
+			bRead = True
+			if len(self._buffer) >= iWant:
+				break
+		return bRead
+
+	def _next(self) -> any:
+		"""Next
+
+		Returns the next item
+
+		Raises:
+			StopIteration: If there are no more items
+			ValueError: If the body is invalid
+
+		Returns:
+			any
+		"""
+		while True:
+
+			# Skip any whitespace, on lines, only up to the end of the line
+			self._pos = (
+				(self._lines and self._state == 'next') and
+				self.__blank or self.__space
+			).match(self._buffer, self._pos).end()
+
+			# If we're at the end of the buffer, read more
+			if self._pos == len(self._buffer):
+				if self._read():
+					continue
+
+				# There's nothing left, lines and arrays that were closed are
+				#	done, anything else ended too soon
+				if self._lines or self._state == 'end':
+					self._done = True
+					raise StopIteration
+				raise ValueError(
+					self._state == 'open' and 'must be a JSON array' or
+					'unexpected end of data'
+				)
+
+			# Get the next character
+			c = self._buffer[self._pos]
+
+			# If the last value was found, the next character must end it
+			if self._state == 'next':
+				if self._lines:
+					if c != '\n':
+						raise ValueError('more than one value on the line')
+					self._state = 'value'
+				elif c == ',':
+					self._state = 'value'
+				elif c == ']':
+					self._state = 'end'
+				else:
+					raise ValueError('expected "," or "]"')
+				self._pos += 1
+				continue
+
+			# If we're waiting for the array to start, or it's done
+			if self._state == 'open':
+				if c != '[':
+					raise ValueError('must be a JSON array')
+				self._state = 'first'
+				self._pos += 1
+				continue
+			if self._state == 'end':
+				raise ValueError('data after the array')
+
+			# If the array ends, or the value is missing
+			if c == ']' and self._state == 'first':
+				self._state = 'end'
+				self._pos += 1
+				continue
+			if c in ',]' and not self._lines:
+				raise ValueError('missing element')
+
+			# Decode the value, if it fails because it isn't all there yet,
+			#	read more and try again
+			try:
+				m, iEnd = self._decoder.raw_decode(self._buffer, self._pos)
+			except json.JSONDecodeError as e:
+				if not self._complete() and self._grow():
+					continue
+				raise ValueError(e.msg)
+
+			# If the value ends with the buffer, e.g. a number, it could
+			#	continue in the next chunk
+			if iEnd == len(self._buffer) and self._grow():
+				continue
+
+			# Move past the value and return it
+			self._pos = iEnd
+			self._state = 'next'
+			return m
+
+	def _read(self) -> bool:
+		"""Read
+
+		Adds the next chunk of the body to the buffer, decompressing and
+		decoding it, and drops anything that's already been returned
+
+		Raises:
+			ValueError: If the body is too large, or can't be decompressed or
+				decoded
+
+		Returns:
+			bool: False if there's nothing left
+		"""
+
+		# Drop what's no longer needed
+		if self._pos:
+			self._buffer = self._buffer[self._pos:]
+			self._pos = 0
+
+		# Keep reading until we get something, or there's nothing left
+		while not self._eof:
+
+			# If the body is compressed, decompress what's left of the last
+			#	chunk, or the next one, never more than a chunk at a time
+			if self._zlib is not None:
+				try:
+					bRaw = self._zlib.unconsumed_tail or \
+						self._file.read(CHUNK)
+					if bRaw:
+						b = self._zlib.decompress(bRaw, CHUNK)
+					else:
+						b = self._zlib.flush()
+						self._eof = True
+				except zlib.error as e:
+					raise ValueError(str(e))
+
+			# Else, read the next chunk
+			else:
+				b = self._file.read(CHUNK)
+				if not b:
+					self._eof = True
+
+			# Make sure it isn't too large
+			self._total += len(b)
+			if self._max is not None and self._total > self._max:
+				raise ValueError('larger than %d bytes' % self._max)
+
+			# Decode the characters, if there's a full one, add them
+			s = self._utf8.decode(b, self._eof)
+			if s:
+				self._buffer += s
+				return True
+
+		# Nothing left
+		return False
+
+	def close(self):
+		"""Close
+
+		Closes the file, removing it from disk if it was moved there
+
+		Returns:
+			None
+		"""
+		self._done = True
+		self._file.close()
@@ -0,0 +1,379 @@
+# coding=utf8
+"""Log
+
+Holds the class used to log requests and responses without slowing them down.
+Records are sampled, queued, and written by a background thread
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'Log' ]
+
+# Ouroboros imports
+import jsonb
+
+# Python imports
+import atexit
+from collections.abc import Callable
+import os
+from queue import Empty, Full, Queue
+from random import random
+import sys
+from threading import Lock, Thread
+import traceback
+
+class Log(object):
+	"""Log
+
+	Decides which requests are logged, and writes their records, one JSON
+	object per line, from a background thread. If records come in faster than
+	they can be written, and the queue fills up, new ones are dropped rather
+	than making requests wait
+	"""
+
+	def __init__(self,
+		sample: float = 1.0,
+		errors: float = 1.0,
+		payloads: bool = True,
+		truncate: int | None = 1024,
+		services: dict = {},
+		paths: dict = {},
+		queue: int = 10000,
+		file: str | None = None,
+		callback: Callable[[dict], None] | None = None
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			sample (float): The fraction of requests logged, from 0 to 1
+			errors (float): The fraction of requests that returned an error
+				logged, from 0 to 1
+			payloads (bool): Set to False to leave the request and response
+				data out of the records
+			truncate (uint): The maximum length of each payload once encoded,
+				None or 0 for no limit
+			services (dict): Overrides by service name, False to never log
+				the service, True to use the defaults, or a number to use as
+				its sample rate
+			paths (dict): Overrides by path, e.g. '/user/session', same as
+				services, and take precedence over them
+			queue (uint): The maximum number of records waiting to be written
+			file (str): Optional, the path of the file to append records to,
+				defaults to stdout
+			callback (callable): Optional, called with each record instead of
+				writing it
+
+		Raises:
+			ValueError
+
+		Returns:
+			Log
+		"""
+
+		# Validate the rates
+		self._sample = self._rate('sample', sample)
+		self._errors = self._rate('errors', errors)
+
+		# Validate the overrides
+		for sName, dOverrides in [ ( 'services', services ), ( 'paths', paths ) ]:
+			if not isinstance(dOverrides, dict):
+				raise ValueError(sName, 'must be an object')
+			for k, v in dOverrides.items():
+				if not isinstance(v, bool):
+					self._rate('%s.%s' % ( sName, k ), v)
+
+		# Validate the sizes
+		try:
+			self._truncate = truncate and int(truncate) or None
+			if self._truncate is not None and self._truncate < 0:
+				raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('truncate', 'must be an int of 0 or greater')
+		try:
+			self._size = int(queue)
+			if self._size < 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('queue', 'must be an int greater than 0')
+
+		# Store the rest of the settings
+		self.payloads = bool(payloads)
+		self._services = services
+		self._paths = paths
+		self._file = file
+		self._callback = callback
+
+		# Init the state
+		self._lock = Lock()
+		self._rates = {}
+		self._pid = None
+		self._queue = None
+		self._thread = None
+		self._dropped = 0
+		self._written = 0
+
+	@staticmethod
+	def _rate(name: str, value: any) -> float:
+		"""Rate
+
+		Validates a sample rate and returns it as a float
+
+		Arguments:
+			name (str): The name of the setting
+			value (any): The value to validate
+
+		Raises:
+			ValueError
+
+		Returns:
+			float
+		"""
+		try:
+			fRet = float(value)
+			if fRet < 0 or fRet > 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError(name, 'must be a number from 0 to 1')
+		return fRet
+
+	def _rates_for(self, service: str, path: str) -> tuple:
+		"""Rates For
+
+		Returns the sample rate of successful requests and of requests with
+		errors for a service and path, after overrides
+
+		Arguments:
+			service (str): The name of the service
+			path (str): The path of the request
+
+		Returns:
+			( float, float )
+		"""
+
+		# If we already figured them out, return them
+		tKey = ( service, path )
+		try:
+			return self._rates[tKey]
+		except KeyError:
+			pass
+
+		# Find the override, if there is one
+		if path in self._paths:
+			mOverride = self._paths[path]
+		elif service in self._services:
+			mOverride = self._services[service]
+		else:
+			mOverride = True
+
+		# Turn it into the two rates and store them
+		if mOverride is False:
+			tRet = ( 0.0, 0.0 )
+		elif mOverride is True:
+			tRet = ( self._sample, self._errors )
+		else:
+			tRet = ( float(mOverride), self._errors )
+		self._rates[tKey] = tRet
+		return tRet
+
+	def _start(self):
+		"""Start
+
+		Creates the queue and starts the thread that writes the records. Done
+		on the first record, and again after a fork, as threads don't survive
+		one
+
+		Returns:
+			None
+		"""
+		with self._lock:
+			if self._pid != os.getpid():
+				self._queue = Queue(self._size)
+				self._thread = Thread(
+					target = self._write, args = ( self._queue, ),
+					name = 'body.log', daemon = True
+				)
+				self._thread.start()
+				if self._pid is None:
+					atexit.register(self.close)
+				self._pid = os.getpid()
+
+	def _encode(self, value: any) -> str:
+		"""Encode
+
+		Encodes a payload and cuts it down to the maximum length
+
+		Arguments:
+			value (any): The payload to encode
+
+		Returns:
+			str
+		"""
+		try:
+			s = jsonb.encode(value)
+		except Exception:
+			s = str(value)
+		if self._truncate and len(s) > self._truncate:
+			s = '%s...' % s[:self._truncate]
+		return s
+
+	def _write(self, q: Queue):
+		"""Write
+
+		Runs in the background, writing records as they're added until it gets
+		None
+
+		Arguments:
+			q (Queue): The queue to read the records from
+
+		Returns:
+			None
+		"""
+
+		# Open the file, or use stdout
+		oFile = self._file and open(self._file, 'a', encoding = 'utf-8') or \
+			sys.stdout
+
+		try:
+			bRunning = True
+			while bRunning:
+
+				# Wait for a record, then take any others already waiting
+				lRecords = [ q.get() ]
+				try:
+					while len(lRecords) < 256:
+						lRecords.append(q.get_nowait())
+				except Empty:
+					pass
+
+				# If we were told to stop, write what's left and stop
+				if None in lRecords:
+					lRecords = [ d for d in lRecords if d is not None ]
+					bRunning = False
+
+				# Encode the payloads of each record
+				for d in lRecords:
+					for s in [ 'request', 'response' ]:
+						if s in d:
+							d[s] = self._encode(d[s])
+
+				# Pass the records to the callback, or write them
+				try:
+					if self._callback:
+						for d in lRecords:
+							self._callback(d)
+					else:
+						oFile.write(''.join([
+							'%s\n' % jsonb.encode(d) for d in lRecords
+						]))
+						oFile.flush()
+				except Exception:
+					print(traceback.format_exc(), file = sys.stderr)
+
+				# Let anyone waiting know the records are done
+				self._written += len(lRecords)
+				for _ in lRecords:
+					q.task_done()
+				if not bRunning:
+					q.task_done()
+
+		# Whatever happens, close the file if we opened it
+		finally:
+			if oFile is not sys.stdout:
+				oFile.close()
+
+	def add(self, record: dict):
+		"""Add
+
+		Queues a record to be written, or drops it if the queue is full. Any
+		'request' or 'response' payload is encoded by the background thread,
+		so it must not be changed once added
+
+		Arguments:
+			record (dict): The record to write
+
+		Returns:
+			None
+		"""
+
+		# If the thread isn't running in this process, start it
+		if self._pid != os.getpid():
+			self._start()
+
+		# Add the record, unless there's no room
+		try:
+			self._queue.put_nowait(record)
+		except Full:
+			with self._lock:
+				self._dropped += 1
+
+	def close(self):
+		"""Close
+
+		Writes any records left and stops the background thread
+
+		Returns:
+			None
+		"""
+		with self._lock:
+			if self._pid != os.getpid():
+				return
+			self._pid = None
+		self._queue.put(None)
+		self._thread.join(5)
+
+	def flush(self):
+		"""Flush
+
+		Waits until every record added so far has been written
+
+		Returns:
+			None
+		"""
+		if self._pid == os.getpid():
+			self._queue.join()
+
+	def sampled(self,
+		service: str,
+		path: str,
+		error: bool = False,
+		roll: float | None = None
+	) -> bool:
+		"""Sampled
+
+		Returns True if a request should be logged
+
+		Arguments:
+			service (str): The name of the service
+			path (str): The path of the request
+			error (bool): True if the response has an error
+			roll (float): Optional, the random number, from 0 to 1, to compare
+				to the rate, so that the same request can be checked before
+				and after it's known if it failed, defaults to a new one
+
+		Returns:
+			bool
+		"""
+		fRate = self._rates_for(service, path)[error and 1 or 0]
+		if roll is None:
+			roll = random()
+		return fRate >= 1 or (fRate > 0 and roll < fRate)
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the number of records written, waiting to be written, and
+		dropped because the queue was full
+
+		Returns:
+			dict
+		"""
+		return {
+			'dropped': self._dropped,
+			'queued': self._pid == os.getpid() and self._queue.qsize() or 0,
+			'written': self._written
+		}
\ No newline at end of file
@@ -0,0 +1,136 @@
+# coding=utf8
+"""Loop
+
+Runs coroutines, e.g. the results of async noun methods, from synchronous
+code, on the event loop serving requests if there is one, else on a loop
+running in a background thread
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'run', 'use' ]
+
+# Python imports
+import asyncio
+from collections.abc import Awaitable
+import os
+from threading import Lock, Thread
+
+__loop = None
+"""The loop coroutines are run on"""
+
+__owned = False
+"""True if the loop was created here, False if it was passed to use()"""
+
+__lock = Lock()
+"""Lock used to create the loop"""
+
+def _after_fork():
+	"""After Fork
+
+	Called in child processes after a fork, threads, and the loops running
+	in them, don't survive one, so start over
+
+	Returns:
+		None
+	"""
+	global __lock, __loop, __owned
+	__loop = None
+	__owned = False
+	__lock = Lock()
+
+# Make sure forked processes get their own loop
+os.register_at_fork(after_in_child = _after_fork)
+
+def _loop() -> asyncio.AbstractEventLoop:
+	"""Loop
+
+	Returns the loop coroutines are run on, starting one in a background
+	thread if none was passed to use()
+
+	Returns:
+		asyncio.AbstractEventLoop
+	"""
+	global __loop, __owned
+
+	# If we don't have one yet, start one
+	if __loop is None:
+		with __lock:
+			if __loop is None:
+				oLoop = asyncio.new_event_loop()
+				Thread(
+					target = oLoop.run_forever, name = 'body.loop',
+					daemon = True
+				).start()
+				__loop = oLoop
+				__owned = True
+
+	# Return the loop
+	return __loop
+
+def run(awaitable: Awaitable) -> any:
+	"""Run
+
+	Runs a coroutine, or any other awaitable, and waits for its result. The
+	coroutine is run with a copy of the caller's context, so that context
+	variables, like the deadline, are passed on to it
+
+	Arguments:
+		awaitable (Awaitable): The awaitable to run
+
+	Raises:
+		RuntimeError: If called from the thread running the loop, which
+			would block it forever
+		Any exception raised by the awaitable
+
+	Returns:
+		any
+	"""
+
+	# Get the loop, and make sure we aren't running on it
+	oLoop = _loop()
+	try:
+		bSame = asyncio.get_running_loop() is oLoop
+	except RuntimeError:
+		bSame = False
+	if bSame:
+		if asyncio.iscoroutine(awaitable):
+			awaitable.close()
+		raise RuntimeError(
+			'body.loop.run can not be called from the event loop, await it'
+		)
+
+	# Make sure we have a coroutine
+	if not asyncio.iscoroutine(awaitable):
+		async def wrapper(a):
+			return await a
+		awaitable = wrapper(awaitable)
+
+	# Start the task, it's created in a copy of the current context, then
+	#	wait for it and return the result
+	return asyncio.run_coroutine_threadsafe(awaitable, oLoop).result()
+
+def use(loop: asyncio.AbstractEventLoop | None):
+	"""Use
+
+	Sets the loop coroutines are run on, e.g. the one serving requests, so
+	that async methods called from other threads share it. Pass None to go
+	back to a loop in a background thread
+
+	Arguments:
+		loop (asyncio.AbstractEventLoop): The loop to use
+
+	Returns:
+		None
+	"""
+	global __loop, __owned
+	with __lock:
+		if __owned and __loop is not loop:
+			__loop.call_soon_threadsafe(__loop.stop)
+		__loop = loop
+		__owned = False
\ No newline at end of file
@@ -0,0 +1,275 @@
+# coding=utf8
+"""Metrics
+
+Records the details of every request made to another service, and passes
+them on to any hooks added, so they can be exported to a metrics system
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [
+	'active', 'add_hook', 'BUCKETS', 'enable', 'Histogram', 'record',
+	'remove_hook', 'reset', 'snapshot'
+]
+
+# Ouroboros imports
+from config import config
+
+# Python imports
+from bisect import bisect_left
+from collections.abc import Callable
+import sys
+from threading import Lock
+import traceback
+
+BUCKETS = (
+	0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+	10.0
+)
+"""The default upper bounds, in seconds, of the latency histogram buckets"""
+
+__enabled = None
+"""True if calls are being recorded, None until first checked"""
+
+__hooks = []
+"""The functions called with the details of every call"""
+
+__lock = Lock()
+"""Lock used to modify the stats"""
+
+__stats = {}
+"""The stats by service, action, and path"""
+
+class Histogram(object):
+	"""Histogram
+
+	Counts values in fixed buckets, along with their total and sum. Not thread
+	safe, the caller is expected to hold a lock
+	"""
+
+	__slots__ = ( '_bounds', '_counts', 'count', 'sum' )
+
+	def __init__(self, bounds: tuple = BUCKETS):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			bounds (float[]): The upper bounds of each bucket, in order. Any
+				value larger than the last goes in an extra bucket
+
+		Returns:
+			Histogram
+		"""
+		self._bounds = bounds
+		self._counts = [ 0 ] * (len(bounds) + 1)
+		self.count = 0
+		self.sum = 0.0
+
+	def observe(self, value: float):
+		"""Observe
+
+		Adds a value to the histogram
+
+		Arguments:
+			value (float): The value to add
+
+		Returns:
+			None
+		"""
+		self._counts[bisect_left(self._bounds, value)] += 1
+		self.count += 1
+		self.sum += value
+
+	def snapshot(self) -> dict:
+		"""Snapshot
+
+		Returns the count of values in each bucket by its upper bound, the
+		last one being 'inf', along with the total count and sum
+
+		Returns:
+			dict
+		"""
+		return {
+			'buckets': [
+				[ self._bounds[i], self._counts[i] ]
+				for i in range(len(self._bounds))
+			] + [ [ 'inf', self._counts[-1] ] ],
+			'count': self.count,
+			'sum': self.sum
+		}
+
+def active() -> bool:
+	"""Active
+
+	Returns True if calls need to be recorded, because metrics are enabled or
+	there are hooks
+
+	Returns:
+		bool
+	"""
+	global __enabled
+	if __enabled is None:
+		__enabled = bool(config.body.external.metrics(True))
+	return __enabled or bool(__hooks)
+
+def add_hook(hook: Callable[[dict], None]):
+	"""Add Hook
+
+	Adds a function to be called with the details of every call once it's
+	done. Hooks are called in the thread that made the call, so they should
+	be quick. Any exception they raise is printed and ignored
+
+	The details are a dict with 'service', 'action', 'path', 'local' (True
+	if the service is in the same process), 'cached' (True if it came from
+	the cache), 'duration' (seconds), 'status' (the HTTP status, if any),
+	'error' (the error code, if any), 'attempts' (the number of HTTP
+	requests made), 'sent', and 'received' (bytes)
+
+	Arguments:
+		hook (callable): The function to call
+
+	Returns:
+		None
+	"""
+	with __lock:
+		if hook not in __hooks:
+			__hooks.append(hook)
+
+def enable(flag: bool):
+	"""Enable
+
+	Turns recording of calls on or off, overriding
+	config.body.external.metrics. Hooks are called either way
+
+	Arguments:
+		flag (bool): True to record calls
+
+	Returns:
+		None
+	"""
+	global __enabled
+	__enabled = bool(flag)
+
+def record(call: dict):
+	"""Record
+
+	Records the details of a single call and passes them to every hook
+
+	Arguments:
+		call (dict): The details of the call, see add_hook
+
+	Returns:
+		None
+	"""
+
+	# If metrics are on, add the call to the stats
+	if __enabled:
+		tKey = ( call['service'], call['action'], call['path'] )
+		with __lock:
+
+			# Get the stats for the key, or create them
+			try:
+				dStats = __stats[tKey]
+			except KeyError:
+				dStats = __stats[tKey] = {
+					'attempts': 0,
+					'cached': 0,
+					'calls': 0,
+					'errors': {},
+					'latency': Histogram(),
+					'local': 0,
+					'received': 0,
+					'retries': 0,
+					'sent': 0,
+					'statuses': {}
+				}
+
+			# Add the call
+			dStats['calls'] += 1
+			dStats['latency'].observe(call['duration'])
+			dStats['attempts'] += call['attempts']
+			if call['attempts'] > 1:
+				dStats['retries'] += call['attempts'] - 1
+			dStats['sent'] += call['sent']
+			dStats['received'] += call['received']
+			if call['local']:
+				dStats['local'] += 1
+			if call['cached']:
+				dStats['cached'] += 1
+			if call['status'] is not None:
+				dStats['statuses'][call['status']] = \
+					dStats['statuses'].get(call['status'], 0) + 1
+			if call['error'] is not None:
+				dStats['errors'][call['error']] = \
+					dStats['errors'].get(call['error'], 0) + 1
+
+	# Pass the call to each hook
+	for f in __hooks:
+		try:
+			f(call)
+		except Exception:
+			print(traceback.format_exc(), file = sys.stderr)
+
+def remove_hook(hook: Callable[[dict], None]):
+	"""Remove Hook
+
+	Removes a function added with add_hook
+
+	Arguments:
+		hook (callable): The function to remove
+
+	Returns:
+		None
+	"""
+	with __lock:
+		try:
+			__hooks.remove(hook)
+		except ValueError:
+			pass
+
+def reset():
+	"""Reset
+
+	Clears all the stats recorded so far
+
+	Returns:
+		None
+	"""
+	with __lock:
+		__stats.clear()
+
+def snapshot(clear: bool = False) -> list:
+	"""Snapshot
+
+	Returns the stats recorded for every service, action, and path called.
+	Each is a dict with 'service', 'action', 'path', 'calls', 'local',
+	'cached', 'attempts', 'retries', 'sent', 'received', 'statuses' (count
+	by HTTP status), 'errors' (count by error code), and 'latency' (see
+	Histogram.snapshot)
+
+	Arguments:
+		clear (bool): Optional, set to True to clear the stats once they've
+			been returned, useful for exporting deltas
+
+	Returns:
+		dict[]
+	"""
+	with __lock:
+		lRet = [ {
+			'service': t[0],
+			'action': t[1],
+			'path': t[2],
+			**d,
+			'errors': d['errors'].copy(),
+			'latency': d['latency'].snapshot(),
+			'statuses': d['statuses'].copy()
+		} for t, d in __stats.items() ]
+		if clear:
+			__stats.clear()
+	return lRet
\ No newline at end of file
@@ -0,0 +1,300 @@
+# coding=utf8
+"""Pool
+
+Holds the class used to keep persistent, pooled, http connections to a single
+service
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'Pool' ]
+
+# Python imports
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock
+
+# Pip imports
+import requests
+from requests.adapters import HTTPAdapter
+
+class Pool(object):
+	"""Pool
+
+	Wraps a keep-alive requests.Session, and its connection pool, so that all
+	requests to the same service share TCP connections instead of opening a
+	new one on every call
+	"""
+
+	def __init__(self,
+		url: str,
+		size: int = 10,
+		keep_alive: bool = True,
+		prewarm: int = 0,
+		block: bool = False
+	):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			url (str): The base url of the service the pool connects to
+			size (uint): The maximum number of connections kept open
+			keep_alive (bool): If False, connections are closed after every
+				request and the pool is only used to limit concurrency
+			prewarm (uint): The number of connections to open when prewarm()
+				is called
+			block (bool): If True, requests wait for a free connection instead
+				of opening temporary ones beyond the size of the pool
+
+		Raises:
+			ValueError
+
+		Returns:
+			Pool
+		"""
+
+		# Make sure the numeric values are valid
+		try:
+			self._size = int(size)
+			if self._size < 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('size', 'must be an int greater than 0')
+		try:
+			self._prewarm = int(prewarm)
+			if self._prewarm < 0: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('prewarm', 'must be an int of 0 or greater')
+
+		# Store the rest of the settings
+		self._url = url
+		self._keep_alive = keep_alive and True or False
+		self._block = block and True or False
+
+		# Init the counters and the lock used to modify them
+		self._connects = 0
+		self._prewarmed = 0
+		self._requests = 0
+		self._lock = Lock()
+
+		# Create the session
+		self._session = None
+		self._adapter = None
+		self.reset()
+
+	def __del__(self):
+		"""Delete (__del__)
+
+		Python magic method called when the instance is being destroyed
+
+		Returns:
+			None
+		"""
+		try: self.close()
+		except Exception: pass
+
+	def _connected(self):
+		"""Connected
+
+		Called every time a socket is opened by one of the pool's connections
+
+		Returns:
+			None
+		"""
+		with self._lock:
+			self._connects += 1
+
+	def _counted(self, pool_cls: type) -> type:
+		"""Counted
+
+		Returns a child of the urllib3 connection pool class passed whose
+		connections let the instance know every time they open a socket. This
+		is the only reliable way to know if a request re-used a connection, as
+		urllib3 silently re-opens connections dropped by the server
+
+		Arguments:
+			pool_cls (type): The urllib3 connection pool class to extend
+
+		Returns:
+			type
+		"""
+
+		# Store the callback so the connection can reach it
+		fConnected = self._connected
+
+		# Create a connection class that counts each connect
+		class _Connection(pool_cls.ConnectionCls):
+			def connect(self):
+				fConnected()
+				return super().connect()
+
+		# Create and return the pool class that uses it
+		return type(pool_cls.__name__, (pool_cls,), {
+			'ConnectionCls': _Connection
+		})
+
+	def close(self):
+		"""Close
+
+		Closes all open connections
+
+		Returns:
+			None
+		"""
+		if self._session is not None:
+			self._session.close()
+
+	def prewarm(self, count: int | None = None) -> int:
+		"""Prewarm
+
+		Opens connections to the service before they are needed so that the
+		first requests don't pay for the handshakes. Meant to be called once
+		per process, after forking
+
+		Arguments:
+			count (uint): Optional, the number of connections to open, defaults
+				to the value passed to the constructor
+
+		Returns:
+			uint: The number of connections actually opened
+		"""
+
+		# If we have no count, use the one from the constructor
+		if count is None:
+			count = self._prewarm
+
+		# Never open more than the pool can hold
+		count = min(count, self._size)
+
+		# If there's nothing to do
+		if count < 1:
+			return 0
+
+		# Get the connection pool associated with the url
+		oPool = self._adapter.poolmanager.connection_from_url(self._url)
+
+		# Open each connection, keep them all out of the pool until they are
+		#	all open so we don't get the same one back
+		lConns = []
+		try:
+			for i in range(count):
+				oConn = oPool._get_conn()
+				oConn.connect()
+				lConns.append(oConn)
+
+		# If we can't connect, ignore it, the requests themselves will report
+		#	the error
+		except Exception:
+			pass
+
+		# Put the connections back into the pool
+		for oConn in lConns:
+			oPool._put_conn(oConn)
+
+		# Store the number opened and return it
+		with self._lock:
+			self._prewarmed += len(lConns)
+		return len(lConns)
+
+	def request(self,
+		method: str,
+		url: str,
+		**kwargs
+	) -> requests.Response:
+		"""Request
+
+		Makes a request using the pooled session
+
+		Arguments:
+			method (str): The HTTP method, e.g. 'GET', 'POST'
+			url (str): The full url to request
+			**kwargs: Any additional arguments accepted by requests
+
+		Returns:
+			requests.Response
+		"""
+
+		# Count the request
+		with self._lock:
+			self._requests += 1
+
+		# Make the request and return the response
+		return self._session.request(method, url, **kwargs)
+
+	def reset(self):
+		"""Reset
+
+		Drops the current session and connections and creates new ones. Used
+		after a fork so that children never share sockets with their parent
+
+		Returns:
+			None
+		"""
+
+		# Create a new adapter using the pool settings
+		self._adapter = HTTPAdapter(
+			pool_connections = 1,
+			pool_maxsize = self._size,
+			pool_block = self._block
+		)
+
+		# Replace the pool classes so we can count the connections opened
+		oManager = self._adapter.poolmanager
+		oManager.pool_classes_by_scheme = {
+			k: self._counted(v)
+			for k,v in oManager.pool_classes_by_scheme.items()
+		}
+
+		# Create a new session and mount the adapter for both protocols
+		self._session = requests.Session()
+		self._session.mount('http://', self._adapter)
+		self._session.mount('https://', self._adapter)
+
+		# Services don't use cookies, don't let one request leak into the next
+		self._session.cookies.set_policy(
+			DefaultCookiePolicy(allowed_domains = [])
+		)
+
+		# If we don't want connections kept alive
+		if not self._keep_alive:
+			self._session.headers['Connection'] = 'close'
+
+		# Reset the counters
+		with self._lock:
+			self._connects = 0
+			self._prewarmed = 0
+			self._requests = 0
+
+	def stats(self) -> dict:
+		"""Stats
+
+		Returns the counters for the pool. `opened` is the number of
+		connections opened fresh by requests, `prewarmed` the number opened by
+		prewarm(), `requests` the total number of requests made, and `reused`
+		the number of requests that used a connection that was already open
+
+		Returns:
+			dict
+		"""
+
+		# Copy the counters so they all come from the same moment
+		with self._lock:
+			iConnects = self._connects
+			iPrewarmed = self._prewarmed
+			iRequests = self._requests
+
+		# Calculate the connections opened fresh by requests
+		iOpened = max(0, iConnects - iPrewarmed)
+
+		# Return the stats
+		return {
+			'opened': iOpened,
+			'prewarmed': iPrewarmed,
+			'requests': iRequests,
+			'reused': max(0, iRequests - iOpened),
+			'size': self._size
+		}
\ No newline at end of file
@@ -10,9 +10,11 @@ __email__		= "chris@ouroboroscoding.com"
 __created__		= "2023-03-15"
 
 # Ouroboros imports
-import jsonb
 import undefined
 
+# Local imports
+from body import formats
+
 class Response(object):
 	"""Response
 
@@ -159,6 +161,36 @@ class Response(object):
 		# Return the instance
 		return o
 
+	@classmethod
+	def from_format(cls, val, content_type: str):
+		"""From Format
+
+		Converts a string or bytes in any registered format back into a
+		Response
+
+		Arguments:
+			val (bytes | str): The encoded Response
+			content_type (str): The Content-Type of the value
+
+		Raises:
+			ValueError
+
+		Returns:
+			Response
+		"""
+
+		# Find the format
+		oFormat = formats.by_mime(content_type)
+		if oFormat is None:
+			raise ValueError('content_type', 'invalid: %s' % content_type)
+
+		# Try to convert the value to a dict
+		try: d = oFormat.decode(val)
+		except Exception as e: raise ValueError('val', str(e))
+
+		# Return the fromDict result
+		return cls.from_dict(d)
+
 	@classmethod
 	def from_json(cls, val):
 		"""From JSON
@@ -166,14 +198,14 @@ class Response(object):
 		Tries to convert a string made from str() back into an Response
 
 		Arguments:
-			val (str): A valid JSON string
+			val (bytes | str): A valid JSON string
 
 		Returns:
 			Response
 		"""
 
 		# Try to convert the string to a dict
-		try: d = jsonb.decode(val)
+		try: d = formats.JSON.decode(val)
 		except ValueError as e: raise ValueError('val', str(e))
 		except TypeError as e: raise ValueError('val', str(e))
 
@@ -207,6 +239,29 @@ class Response(object):
 		# Return the dict
 		return dRet
 
+	def to_format(self, content_type: str) -> bytes | str:
+		"""To Format
+
+		Returns a representation of the object in any registered format
+
+		Arguments:
+			content_type (str): The Content-Type of the format
+
+		Raises:
+			ValueError
+
+		Returns:
+			bytes | str
+		"""
+
+		# Find the format
+		oFormat = formats.by_mime(content_type)
+		if oFormat is None:
+			raise ValueError('content_type', 'invalid: %s' % content_type)
+
+		# Encode and return the dict
+		return oFormat.encode(self.to_dict())
+
 	def to_json(self):
 		"""To JSON
 
@@ -215,7 +270,7 @@ class Response(object):
 		Returns:
 			str
 		"""
-		return jsonb.encode(self.to_dict())
+		return formats.JSON.encode(self.to_dict()).decode('utf-8')
 
 	def warning_exists(self):
 		"""Warning Exists
@@ -255,6 +310,277 @@ class Error(Response):
 			'msg': msg
 		}
 
+class Many(Response):
+	"""Many
+
+	The Response to a create_many, update_many, or delete_many request. Holds
+	one result for each item sent, in the same order, so that an error can be
+	traced back to the item that caused it, while the items are still written
+	together
+
+	class MyService(Service):
+		def products_create_many(self, req):
+			lResults = []
+			for m in Product.create_many(req.data):
+				if isinstance(m, Exception):
+					m = Error(DB_DUPLICATE, str(m))
+				lResults.append(m)
+			return Many(lResults)
+	"""
+
+	def __init__(self, results: list, warning: any = undefined):
+		"""Constructor
+
+		Initialises a new Many instance
+
+		Arguments:
+			results (list): The result of each item, a Response, e.g. an
+				Error, or the data of the item
+			warning (mixed): If the request returns a warning this should be
+				set
+
+		Returns:
+			Many
+		"""
+
+		# Store each result as a Response, those without data, e.g. Errors,
+		#	are False, so check the type
+		lData = []
+		for m in results:
+			if not isinstance(m, Response):
+				m = Response(m)
+			lData.append(m.to_dict())
+
+		# Call the parent constructor with the results
+		super().__init__(lData, warning = warning)
+
+	@staticmethod
+	def split(response: Response) -> list:
+		"""Split
+
+		Returns a Response for each item sent in a create_many, update_many,
+		or delete_many request, in the same order. If the request itself
+		failed, there are no items, check the error of the Response first
+
+		Arguments:
+			response (Response): The Response to the request
+
+		Returns:
+			Response[]
+		"""
+		if response.error or not isinstance(response.data, list):
+			return []
+		return [ Response.from_dict(d) for d in response.data ]
+
+class RawResponse(Response):
+	"""Raw Response
+
+	A Response received from another service that keeps the encoded body it
+	was received as, and only decodes it once data, error, or warning is
+	accessed. Checking for an error or warning that isn't there doesn't
+	decode it at all. As long as nothing is set, and no dict or list in it
+	has been handed out, where it could have been changed, it's sent on as
+	the original body, without being encoded again
+	"""
+
+	__markers = {
+		'application/json': ( b'"error"', b'"warning"' ),
+		'application/msgpack': ( b'\xa5error', b'\xa7warning' )
+	}
+	"""The encoded keys by format, if the body doesn't contain them, the
+	key can't be in the Response"""
+
+	def __init__(self, raw: bytes, content_type: str):
+		"""Constructor
+
+		Initialises a new RawResponse instance
+
+		Arguments:
+			raw (bytes): The encoded Response
+			content_type (str): The Content-Type of the encoded Response
+
+		Returns:
+			RawResponse
+		"""
+		self._raw = raw
+		self._mime = content_type.split(';', 1)[0].strip().lower()
+		self._decoded = None
+		self._clean = True
+
+	def _decode(self) -> dict:
+		"""Decode
+
+		Decodes the body, if it hasn't been already, and returns the parts
+
+		Raises:
+			ValueError
+
+		Returns:
+			dict
+		"""
+
+		# If we haven't decoded it yet
+		if self._decoded is None:
+
+			# Find the format
+			oFormat = formats.by_mime(self._mime)
+			if oFormat is None:
+				raise ValueError('content_type', 'invalid: %s' % self._mime)
+
+			# Decode it
+			try: d = oFormat.decode(self._raw)
+			except Exception as e: raise ValueError('val', str(e))
+
+			# Store the parts
+			self._decoded = {
+				'data': d.get('data'),
+				'error': d.get('error', False)
+			}
+			if 'warning' in d:
+				self._decoded['warning'] = d['warning']
+
+		# Return the parts
+		return self._decoded
+
+	def _get(self, name: str) -> any:
+		"""Get
+
+		Returns one part of the Response, decoding it if necessary. If the
+		part is a dict or list, the original body can no longer be trusted
+
+		Arguments:
+			name (str): The name of the part
+
+		Raises:
+			AttributeError: If the part doesn't exist
+			ValueError: If the body can't be decoded
+
+		Returns:
+			any
+		"""
+		try:
+			m = self._decode()[name]
+		except KeyError:
+			raise AttributeError(name)
+		if isinstance(m, (dict, list)):
+			self._clean = False
+		return m
+
+	def _missing(self, index: int) -> bool:
+		"""Missing
+
+		Returns True if the body hasn't been decoded, and the key can't be in
+		it because the encoded key isn't anywhere in the body
+
+		Arguments:
+			index (int): 0 for error, 1 for warning
+
+		Returns:
+			bool
+		"""
+		if self._decoded is not None:
+			return False
+		try:
+			return self.__markers[self._mime][index] not in self._raw
+		except KeyError:
+			return False
+
+	def _set(self, name: str, value: any):
+		"""Set
+
+		Sets one part of the Response, the original body is no longer used
+
+		Arguments:
+			name (str): The name of the part
+			value (any): The new value
+
+		Returns:
+			None
+		"""
+		self._decode()[name] = value
+		self._clean = False
+
+	@property
+	def data(self) -> any:
+		"""Data
+
+		The data of the Response
+		"""
+		return self._get('data')
+
+	@data.setter
+	def data(self, value: any):
+		self._set('data', value)
+
+	@property
+	def error(self) -> any:
+		"""Error
+
+		The error of the Response, or False
+		"""
+		if self._missing(0):
+			return False
+		return self._get('error')
+
+	@error.setter
+	def error(self, value: any):
+		self._set('error', value)
+
+	@property
+	def raw(self) -> bytes | None:
+		"""Raw
+
+		The original body, or None if it can no longer be used
+		"""
+		return self._clean and self._raw or None
+
+	@property
+	def warning(self) -> any:
+		"""Warning
+
+		The warning of the Response, doesn't exist if there isn't one
+		"""
+		if self._missing(1):
+			raise AttributeError('warning')
+		return self._get('warning')
+
+	@warning.setter
+	def warning(self, value: any):
+		self._set('warning', value)
+
+	def to_format(self, content_type: str) -> bytes | str:
+		"""To Format
+
+		Returns a representation of the object in any registered format, the
+		original body if it's the same format and can still be used
+
+		Arguments:
+			content_type (str): The Content-Type of the format
+
+		Raises:
+			ValueError
+
+		Returns:
+			bytes | str
+		"""
+		if self._clean and formats.by_mime(content_type) is \
+			formats.by_mime(self._mime):
+			return self._raw
+		return super().to_format(content_type)
+
+	def to_json(self) -> str:
+		"""To JSON
+
+		Returns a JSON representation of the object, the original body if it's
+		JSON and can still be used
+
+		Returns:
+			str
+		"""
+		if self._clean and formats.by_mime(self._mime) is formats.JSON:
+			return self._raw.decode('utf-8')
+		return super().to_json()
+
 class ResponseException(Exception):
 	"""Response Exception
 
@@ -16,15 +16,20 @@ __all__ = [ 'bottle', 'REST' ]
 
 # Ouroboros imports
 from jobject import jobject
-import jsonb
-import memory
-from tools import clone
 
 # Python imports
-from collections.abc import Callable
-from datetime import datetime
+import asyncio
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from copy import deepcopy
+import inspect
+import os
 import re
 import sys
+from threading import Lock
+from random import random
+from time import perf_counter, time
 import traceback
 from typing import List, Literal, TYPE_CHECKING
 
@@ -32,14 +37,135 @@ from typing import List, Literal, TYPE_CHECKING
 import bottle
 
 # Local imports
+from body import compress, conditional, deadline, formats, ingest, loop, \
+	sessions, stream
+from body.constants import LIST_ERRORS, MANY
 from body.errors import \
-	REST_AUTHORIZATION, REST_CONTENT_TYPE, REST_LIST_INVALID_URI, \
-	REST_LIST_TO_LONG, REST_REQUEST_DATA, SERVICE_CRASHED, SERVICE_NO_DATA, \
-	SERVICE_NO_SESSION
-from body.response import Error, Response, ResponseException
+	REST_AUTHORIZATION, REST_CONTENT_TYPE, REST_DEADLINE, \
+	REST_LIST_INVALID_URI, REST_LIST_TO_LONG, REST_REQUEST_DATA, \
+	SERVICE_CRASHED, SERVICE_NO_DATA, SERVICE_NO_SESSION
+from body.external import prewarm
+from body.log import Log
+from body.response import Error, RawResponse, Response, \
+	ResponseException
 if TYPE_CHECKING:
+	from body.asgi import ASGI
 	from body.service import Service
 
+class _View(jobject):
+	"""View
+
+	A private class used to pass each request in a __list request its own
+	data, while sharing everything else, like the session and meta, with the
+	__list request instead of copying it. Shared dicts and lists are only
+	copied the first time the request accesses them, so it can change them
+	without the __list request or any other request seeing it. The session is
+	always shared
+	"""
+
+	def __init__(self, parent: jobject, data: dict | None = None):
+		"""Constructor
+
+		Creates a new instance
+
+		Arguments:
+			parent (jobject): The request details of the __list request
+			data (dict): Optional, the data of this request
+
+		Returns:
+			_View
+		"""
+
+		# Share everything already converted in the parent, without
+		#	converting it again
+		dict.__init__(self, parent)
+
+		# Set the data, or remove the parent's
+		if data is None:
+			dict.pop(self, 'data', None)
+		else:
+			dict.__setitem__(self, 'data', jobject.convert(data))
+
+		# Note the shared values that need to be copied before they're used
+		object.__setattr__(self, '_shared', {
+			k for k,v in dict.items(self)
+			if k not in [ 'data', 'session' ] and isinstance(v, (dict, list))
+		})
+
+	def __delitem__(self, key: any):
+		"""Delete Item
+
+		Removes the key without touching the parent
+
+		Arguments:
+			key (any): The key to delete
+
+		Returns:
+			None
+		"""
+		self._shared.discard(key)
+		dict.__delitem__(self, key)
+
+	def __getitem__(self, key: any) -> any:
+		"""Get Item
+
+		Returns the value of the key, copying it first if it's still shared
+		with the parent
+
+		Arguments:
+			key (any): The key to get
+
+		Raises:
+			KeyError
+
+		Returns:
+			any
+		"""
+
+		# Get the value
+		v = dict.__getitem__(self, key)
+
+		# If it's still shared, copy it and keep the copy
+		if key in self._shared:
+			self._shared.discard(key)
+			v = isinstance(v, dict) and jobject(dict(v)) or list(v)
+			dict.__setitem__(self, key, v)
+
+		# Return the value
+		return v
+
+	def __setitem__(self, key: any, value: any):
+		"""Set Item
+
+		Sets the value of the key without touching the parent
+
+		Arguments:
+			key (any): The key to set
+			value (any): The value to set
+
+		Returns:
+			None
+		"""
+		self._shared.discard(key)
+		jobject.__setitem__(self, key, value)
+
+	def get(self, key: any, default: any = None) -> any:
+		"""Get
+
+		Returns the value of the key, or the default if it doesn't exist
+
+		Arguments:
+			key (any): The key to get
+			default (any): The value to return if the key doesn't exist
+
+		Returns:
+			any
+		"""
+		try:
+			return self[key]
+		except KeyError:
+			return default
+
 class _Route(object):
 	"""Route
 
@@ -49,9 +175,18 @@ class _Route(object):
 	__content_type = re.compile(r'^application\/json; charset=utf-?8$')
 	"""Valid Content-Type"""
 
+	__compress = None
+	"""Compression settings for responses, None for no compression"""
+
 	__cors = None
 	"""CORs regular expression"""
 
+	__etags = False
+	"""Set to True to send an ETag with every read"""
+
+	__etags_default = { 'cache_control': None, 'etag': True, 'version': None }
+	"""The settings of reads whose noun didn't declare any"""
+
 	__key_to_errors = {
 		'data': SERVICE_NO_DATA,
 		'session': SERVICE_NO_SESSION
@@ -73,8 +208,39 @@ class _Route(object):
 	used to keep track of the uris to callbacks for the purposes of __list calls
 	"""
 
-	__verbose = True
-	"""The verbose mode, set to True to view requests/responses"""
+	__list = { 'errors': 'abort', 'limit': 10, 'workers': 4 }
+	"""Settings for __list requests"""
+
+	__list_errors = [ 'abort', 'collect' ]
+	"""Valid ways to handle errors in __list requests"""
+
+	__list_executor = None
+	"""Pool of threads used to run the requests in __list requests"""
+
+	__list_lock = Lock()
+	"""Lock used to make sure only one executor is ever created"""
+
+	__log = None
+	"""The Log requests and responses are added to, None to not log them"""
+
+	@classmethod
+	def compress(cls, threshold: int | None, level: int = 6):
+		"""Compress
+
+		Sets the minimum size of responses that will be compressed, if the
+		client accepts it
+
+		Arguments:
+			threshold (uint): The size in bytes, None or False to never
+				compress
+			level (int): The level of compression
+
+		Returns:
+			None
+		"""
+		cls.__compress = (threshold is not None and threshold is not False) \
+			and { 'threshold': int(threshold), 'level': level } \
+			or None
 
 	@classmethod
 	def cors(cls, cors):
@@ -105,18 +271,83 @@ class _Route(object):
 		cls.__on_error = staticmethod(callback)
 
 	@classmethod
-	def verbose(cls, b: bool):
-		"""Verbose
+	def etags(cls, flag: bool):
+		"""ETags
+
+		Sets whether every read gets an ETag, or only those of nouns that
+		declared it with body.conditional.conditional
+
+		Arguments:
+			flag (bool): True to send an ETag with every read
+
+		Returns:
+			None
+		"""
+		cls.__etags = bool(flag)
+
+	@classmethod
+	def lists(cls, limit: int = 10, workers: int = 4, errors: str = 'abort'):
+		"""Lists
+
+		Sets how __list requests are handled
+
+		Arguments:
+			limit (uint): The maximum number of requests in a single list
+			workers (uint): The maximum number of requests run at the same
+				time, 1 to run them one after the other
+			errors (str): 'abort' to stop and return the error of the first
+				request that raises one, 'collect' to return every request's
+				Response, errors included
+
+		Raises:
+			ValueError
+
+		Returns:
+			None
+		"""
+
+		# Validate the settings
+		try:
+			iLimit = int(limit)
+			if iLimit < 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('limit', 'must be an int greater than 0')
+		try:
+			iWorkers = int(workers)
+			if iWorkers < 1: raise ValueError()
+		except (TypeError, ValueError):
+			raise ValueError('workers', 'must be an int greater than 0')
+		if errors not in cls.__list_errors:
+			raise ValueError(
+				'errors', 'must be one of %s' % ', '.join(cls.__list_errors)
+			)
+
+		# If the number of workers changed, drop the old executor
+		with cls.__list_lock:
+			if iWorkers != cls.__list['workers'] and cls.__list_executor:
+				cls.__list_executor.shutdown(wait = False)
+				cls.__list_executor = None
+
+			# Store the settings
+			cls.__list = {
+				'errors': errors,
+				'limit': iLimit,
+				'workers': iWorkers
+			}
+
+	@classmethod
+	def log(cls, log: Log | None):
+		"""Log
 
-		Set the verbose mode associated with all routes
+		Sets the Log requests and responses to all routes are added to
 
 		Arguments:
-			b (bool): True/False
+			log (Log): The Log, or None to not log anything
 
 		Returns:
 			None
 		"""
-		cls.__verbose = b
+		cls.__log = log
 
 	def __init__(self,
 		service: str,
@@ -140,8 +371,13 @@ class _Route(object):
 		# Set the name for the route
 		self.__name__ = callback == True and 'True' or str(callback)
 
-		# Store the callback
+		# Store the callback, how its reads can be cached by clients, and
+		#	whether it takes its data one item at a time, if it declared them
 		self.__callback = callback
+		self._conditional = callback is not True and \
+			conditional.settings(callback) or None
+		self._streamed = callback is not True and \
+			ingest.settings(callback) or None
 
 		# Get the index of the service
 		try:
@@ -163,42 +399,68 @@ class _Route(object):
 		Returns:
 			str
 		"""
+		return self._drive(self._handle(bottle.request, bottle.response))
+
+	def _handle(self,
+		request: bottle.BaseRequest,
+		response: bottle.BaseResponse
+	) -> Generator:
+		"""Handle
+
+		Handles a request, from the headers to the encoded body. Anything that
+		could wait on I/O, loading the session, and calling the noun, or hold
+		on to the CPU, decoding, encoding, and compressing bodies, is yielded
+		as a tuple of the callable and its arguments, and the result, or the
+		exception raised, is sent back, so that the same steps can be driven
+		by a thread, see _drive, or an event loop, see body.asgi
+
+		Arguments:
+			request (bottle.BaseRequest): The request
+			response (bottle.BaseResponse): The response, to set the status
+				and headers on
+
+		Returns:
+			generator: Which returns the body, str, bytes, or iterator
+		"""
 
 		# If CORS is enabled and the origin matches
 		if self.__cors and \
-			'origin' in bottle.request.headers and \
-			self.__cors.match(bottle.request.headers['origin']):
+			'origin' in request.headers and \
+			self.__cors.match(request.headers['origin']):
 
 			# Add the current origin as acceptable
-			bottle.response.headers['Access-Control-Allow-Origin'] = \
-				bottle.request.headers['origin']
-			bottle.response.headers['Vary'] = 'Origin'
+			response.headers['Access-Control-Allow-Origin'] = \
+				request.headers['origin']
+			response.headers['Vary'] = 'Origin'
 
 		# If the request is OPTIONS
-		if bottle.request.method == 'OPTIONS':
-
-			# If we're in verbose mode, let people know we are handling OPTIONS
-			if self.__verbose:
-				print('%s: %s OPTIONS %s' % (
-					str(datetime.now()),
-					self.__services[self._service],
-					bottle.request.path
-				))
+		if request.method == 'OPTIONS':
+
+			# If requests are being logged, and this one is sampled, add it
+			if self.__log is not None and self.__log.sampled(
+				self.__services[self._service], request.path
+			):
+				self.__log.add({
+					'time': time(),
+					'service': self.__services[self._service],
+					'method': 'OPTIONS',
+					'path': request.path
+				})
 
 			# Set the default headers expected for OPTIONS
-			bottle.response.headers['Access-Control-Allow-Methods'] = \
+			response.headers['Access-Control-Allow-Methods'] = \
 				'DELETE, GET, POST, PUT, OPTIONS'
-			bottle.response.headers['Access-Control-Max-Age'] = 1728000
-			bottle.response.headers['Access-Control-Allow-Headers'] = \
+			response.headers['Access-Control-Max-Age'] = 1728000
+			response.headers['Access-Control-Allow-Headers'] = \
 				'Authorization,DNT,X-CustomHeader,Keep-Alive,User-Agent,' \
 				'X-Requested-With,If-Modified-Since,Cache-Control,Content-Type'
-			bottle.response.headers['Content-Type'] = 'text/plain charset=UTF-8'
-			bottle.response.headers['Content-Length'] = 0
-			bottle.request.status = 204
+			response.headers['Content-Type'] = 'text/plain charset=UTF-8'
+			response.headers['Content-Length'] = 0
+			request.status = 204
 			return ''
 
 		# Set the return to JSON
-		bottle.response.headers['Content-Type'] = \
+		response.headers['Content-Type'] = \
 			'application/json; charset=utf-8'
 
 		# Initialise the request details with the bottle request and response
@@ -206,247 +468,245 @@ class _Route(object):
 		oReq = jobject({ })
 
 		# If we got a Read request and the data is in the GET
-		if bottle.request.method == 'GET' and 'd' in bottle.request.query:
+		if request.method == 'GET' and 'd' in request.query:
 
 			# Convert the GET and store the data
 			try:
-				oReq.data = jsonb.decode(bottle.request.query['d'])
+				oReq.data = formats.JSON.decode(request.query['d'])
 			except Exception as e:
 				return Error(
 					REST_REQUEST_DATA,
-					'%s\n%s' % ( bottle.request.query['d'], str(e) )
+					'%s\n%s' % ( request.query['d'], str(e) )
 				).to_json()
 
-		# Else we most likely got the data in the body
-		else:
+		# Else, if the noun takes its data one item at a time
+		elif self._streamed and request.method != 'GET':
 
-			# Make sure the request send JSON
-			try:
-				if not self.__content_type.match(
-					bottle.request.headers['Content-Type'].lower()
-				):
-					return str(Error(REST_CONTENT_TYPE))
-			except KeyError:
+			# Make sure the request sent a JSON array or newline delimited
+			#	JSON
+			sContentType = request.headers.get('Content-Type', '').lower()
+			if self.__content_type.match(sContentType):
+				bLines = False
+			elif sContentType.split(';', 1)[0].strip() == stream.MIME:
+				bLines = True
+			else:
 				return Error(REST_CONTENT_TYPE).to_json()
 
-			# Store the data, if it's too big we need to read it rather than
-			#	use getvalue
+			# Spill the body to a file, without ever holding all of it in
+			#	memory, unless the server already has, see body.asgi
+			iLength = request.content_length
+			if iLength < 0:
+				iLength = 0
+				if request.chunked:
+					iLength = None
 			try:
-				sData = bottle.request.body.getvalue()
-			except AttributeError as e:
-				sData = bottle.request.body.read()
-
-			# Make sure we have a string, not a set of bytes
-			try:
-				sData = sData.decode()
-			except (UnicodeDecodeError, AttributeError):
-				pass
+				oFile = ingest.spool(
+					request.environ['wsgi.input'],
+					iLength,
+					self._streamed['max_bytes'],
+					self._streamed['memory'],
+					request.environ.get(ingest.SPOOLED, False)
+				)
+			except ValueError as e:
+				return Error(REST_REQUEST_DATA, e.args[-1]).to_json()
 
-			# Convert the data and store it
+			# Store the items, decompressing them as they're read if the body
+			#	was compressed
+			sEncoding = request.headers.get('Content-Encoding')
 			try:
-				if sData: oReq.data = jsonb.decode(sData)
-			except Exception as e:
+				oReq.data = ingest.Items(
+					oFile, bLines, sEncoding, self._streamed['max_bytes']
+				)
+			except KeyError:
+				oFile.close()
 				return Error(
 					REST_REQUEST_DATA,
-					'%s\n%s' % ( sData, str(e) )
+					'Content-Encoding %s not supported' % sEncoding
 				).to_json()
 
+		# Else we most likely got the data in the body
+		else:
+
+			# Make sure the request sent a format we understand, JSON must
+			#	be utf-8
+			try:
+				sContentType = request.headers['Content-Type'].lower()
+			except KeyError:
+				return Error(REST_CONTENT_TYPE).to_json()
+			if self.__content_type.match(sContentType):
+				oFormat = formats.JSON
+			else:
+				oFormat = formats.by_mime(sContentType)
+				if oFormat is None or oFormat is formats.JSON:
+					return Error(REST_CONTENT_TYPE).to_json()
+
+			# Read, decompress, and decode the body. All of which can take a
+			#	while with a large one, so it's yielded to keep it off of any
+			#	event loop
+			try:
+				yield ( self._decode, request, oFormat, oReq )
+			except ResponseException as e:
+				return e.args[0].to_json()
+
 		# If the request sent a authorization token
-		if 'Authorization' in bottle.request.headers:
+		if 'Authorization' in request.headers:
 
-			# Get the session from the Authorization token
-			oReq.session = memory.load(bottle.request.headers['Authorization'])
+			# Get the session from the Authorization token, this also makes
+			#	sure the session's ttl is extended
+			oReq.session = yield (
+				sessions.load, request.headers['Authorization']
+			)
 
 			# If the session is not found
 			if not oReq.session:
-				bottle.response.status = 401
+				response.status = 401
 				return Error(
 					REST_AUTHORIZATION, 'Unauthorized'
 				).to_json()
 
-			# Else, extend the session's ttl
-			else:
-				oReq.session.extend()
-
 		# Step through all headers
-		for k in bottle.request.headers:
+		for k in request.headers:
 			if k[0:7] == 'X-Body-':
 				try:
-					oReq.meta[k[7:]] = bottle.request.headers[k]
+					oReq.meta[k[7:]] = request.headers[k]
 				except AttributeError:
-					oReq.meta = { k[7:]: bottle.request.headers[k] }
+					oReq.meta = { k[7:]: request.headers[k] }
 
-		# In case the service crashes
-		try:
-
-			# If we're in verbose mode
-			if self.__verbose:
-				print('%s REQUEST %s %s %s %s' % (
-					str(datetime.now()),
-					self.__services[self._service],
-					bottle.request.method,
-					bottle.request.path,
-					(oReq and jsonb.encode(oReq, 2) or 'None')
-				))
+		# If we got a deadline
+		fDeadline = None
+		if 'meta' in oReq and deadline.META in oReq.meta:
 
-			# If this is a list request
-			if self.__callback is True:
-
-				# If the data isn't passed or isn't an array
-				if 'data' not in oReq or not isinstance(oReq.data, list):
-					oResponse = Error(
-						REST_REQUEST_DATA,
-						'data must be an array'
-					)
+			# Make sure it's a valid timestamp
+			try:
+				fDeadline = float(oReq.meta[deadline.META])
+				oReq.meta[deadline.META] = fDeadline
+			except ValueError:
+				return Error(
+					REST_REQUEST_DATA,
+					'X-Body-%s must be a unix timestamp' % deadline.META
+				).to_json()
 
-				# Else, if it's beyond the max
-				elif len(oReq.data) > 10:
-					oResponse = Error(
-						REST_LIST_TO_LONG,
-						'Can not request more than 10 urls via __list'
+			# If the caller has already given up, don't bother
+			if fDeadline <= time():
+				return Error(
+					REST_DEADLINE,
+					'%s:%s' % (
+						self.__services[self._service],
+						request.path
 					)
+				).to_json()
 
-				# Else, we have an array of nouns to call and return
-				else:
-
-					# Init the response
-					lResponse = []
+		# If requests are being logged, roll the dice once, so it's known now
+		#	if this one will be, whether it fails or not. If it could be, note
+		#	when it started, and keep a deep copy of the data it came in
+		#	with, as the service could change any part of it
+		oLog = self.__log
+		if oLog is not None:
+			fRoll = random()
+			if oLog.sampled(
+				self.__services[self._service], request.path, False, fRoll
+			) or oLog.sampled(
+				self.__services[self._service], request.path, True, fRoll
+			):
+				fStart = perf_counter()
+				mData = None
+				if oLog.payloads and not self._streamed:
+					mData = deepcopy(oReq.get('data'))
+			else:
+				oLog = None
 
-					# Go through each element in the list
-					for m in oReq.data:
+		# If this is a read the client can cache, get the settings, and init
+		#	the ETag
+		dConditional = request.method == 'GET' and \
+			(self._conditional or (self.__etags and self.__etags_default)) or \
+			None
+		sETag = None
+		bNotModified = False
 
-						# If we got a string
-						if isinstance(m, str):
-							m = [ m ]
+		# Pass the deadline on to any requests made by the service
+		oDeadline = deadline.push(fDeadline)
 
-						# Else, if we didn't get a list
-						elif not isinstance(m, list):
-							oResponse = Error(
-								REST_REQUEST_DATA, [ m,
-									'data must be an array or URI and data, ' \
-									'or single string for the URI' ]
-							)
-							break
+		# Make sure the deadline is restored, whatever happens, so it's never
+		#	left for the next request handled by the thread
+		try:
 
-						# If the URI doesn't exist
-						if m[0] not in self.__uris:
-							oResponse = Error(
-								REST_LIST_INVALID_URI,
-								m[0]
-							)
-							break
+			# In case the service crashes
+			try:
 
-						# Clone the __list request data so that the session
-						#	or any other data is shared
-						oRequest = clone(oReq)
+				# If this is a list request
+				if self.__callback is True:
+					oResponse = yield ( self._list, oReq, request )
 
-						# If unique data was passed for the child request
-						if len(m) == 2:
+				# Else, we are making a single URI request
+				else:
 
-							# If we didn't get a dict
-							if not isinstance(m[1], dict):
-								oResponse = Error(
-									REST_LIST_INVALID_URI,
-									[ m[1], 'data must be an object' ]
+					# Call the appropriate API method based on the HTTP/request
+					#	method
+					try:
+
+						# If the noun can supply the version of its Response,
+						#	get it, and use it as the ETag
+						if dConditional and dConditional['etag'] and \
+							dConditional['version']:
+							mVersion = yield (
+								dConditional['version'],
+								getattr(self.__callback, '__self__', None),
+								oReq
+							)
+							if mVersion is not None:
+								sETag = conditional.versioned(mVersion)
+								bNotModified = conditional.matches(
+									request.headers.get('If-None-Match'),
+									sETag
 								)
-								break
 
-							# Set the data for this request
-							oRequest.data = m[1]
+						# If the client already has the version, there's no
+						#	need to call the noun
+						if bNotModified:
+							oResponse = Response()
 
-						# No unique data was sent, so we need to delete the
-						#	original data from the request
+						# Else, call it
 						else:
-							try: del oRequest.data
-							except AttributeError: pass
-
-						# Call the request and append the data to the
-						#	response
-						try:
-							lResponse.append([
-								m[0],
-								self.__uris[m[0]](oRequest).to_dict()
-							])
-
-						# If we got a KeyError
-						except (AttributeError, KeyError) as e:
-							if e.args[0] in self.__key_to_errors:
-								oResponse = Error(
-									self.__key_to_errors[e.args[0]]
-								)
-								break
-							else:
-								raise
-
-						# If we got a response exception
-						except ResponseException as e:
-
-							# Set the response using the exceptions first argument
-							oResponse = e.args[0]
-							break
-
-					# Else, we got through the list
-					else:
-
-						# Set the response using the list of individual
-						#	responses
-						oResponse = Response(lResponse)
-
-			# Else, we are making a single URI request
-			else:
-
-				# Call the appropriate API method based on the HTTP/request
-				#	method
-				try:
-					oResponse = self.__callback(oReq)
-
-				# If we got a KeyError
-				except (AttributeError, KeyError) as e:
-					if e.args[0] in self.__key_to_errors:
-						oResponse = Error(
-							self.__key_to_errors[e.args[0]]
-						)
-					else:
-						raise
-
-				# If we got a response exception
-				except ResponseException as e:
-
-					# Set the response using the exceptions first argument
-					oResponse = e.args[0]
+							oResponse = yield ( self.__callback, oReq )
+
+							# If the noun returned an iterator of items, and
+							#	the client can't take them one at a time,
+							#	gather them all
+							if stream.is_stream(oResponse):
+								oResponse = Response(oResponse)
+							if not isinstance(oResponse, RawResponse) and \
+								stream.is_stream(oResponse.data) and \
+								not stream.accepts(
+									request.headers.get('Accept')
+								):
+								oResponse.data = list(oResponse.data)
+
+					# If we got a KeyError
+					except (AttributeError, KeyError) as e:
+						if e.args[0] in self.__key_to_errors:
+							oResponse = Error(
+								self.__key_to_errors[e.args[0]]
+							)
+						else:
+							raise
 
-		# If we get absolutely any exception
-		except Exception as e:
+					# If we got a response exception
+					except ResponseException as e:
 
-			# Get the traceback info
-			sError = traceback.format_exc()
+						# Set the response using the exceptions first argument
+						oResponse = e.args[0]
 
-			# Print the traceback to stderr
-			print(sError, file = sys.stderr)
+			# If we get absolutely any exception
+			except Exception as e:
+				oResponse = self._crashed(oReq, request)
 
-			# If we have an error handler
-			if self.__on_error:
+		# Restore the previous deadline
+		finally:
+			deadline.pop(oDeadline)
 
-				# Gather all the details, including optional ones
-				oDetails = {
-					'service': self.__services[self._service],
-					'method': bottle.request.method,
-					'path': bottle.request.path,
-					'environment': bottle.request.environ,
-					'traceback': sError
-				}
-				for s in [ 'data', 'session' ]:
-					if s in oReq:
-						oDetails[s] = oReq[s]
-
-				# Pass the details to the error handler
-				self.__on_error(oDetails)
-
-			# Set a response of service/request crashed
-			oResponse = Error(
-				SERVICE_CRASHED,
-				'%s:%s' % ( self.__services[self._service], bottle.request.path )
-			)
+		# If the data was read from a file, remove it
+		if isinstance(oReq.get('data'), ingest.Items):
+			oReq.data.close()
 
 		# If the response contains an error
 		if oResponse.error:
@@ -455,7 +715,7 @@ class _Route(object):
 			if oResponse.error['code'] == REST_AUTHORIZATION:
 
 				# Set the http status to 401 Unauthorized
-				bottle.response.status = 401
+				response.status = 401
 
 				# If the message is missing
 				if oResponse.error['msg'] == '':
@@ -464,27 +724,517 @@ class _Route(object):
 			# Add the service and path to the call
 			l = [
 				self.__services[self._service],
-				bottle.request.method,
-				bottle.request.path
+				request.method,
+				request.path
 			]
 			try:
 				oResponse.error['service'].append(l)
 			except KeyError:
 				oResponse.error['service'] = [ l ]
 
-		# If we're in verbose mode
-		if self.__verbose:
-			print('%s RETURNING %s %s %s %s' % (
-				str(datetime.now()),
-				self.__services[self._service],
-				bottle.request.method,
-				bottle.request.path,
-				jsonb.encode(oResponse.to_dict(), 2)
+		# Is the data an iterator of items, Responses received from another
+		#	service never are, and looking would decode them
+		bStream = not isinstance(oResponse, RawResponse) and \
+			stream.is_stream(oResponse.data)
+
+		# If the data is an iterator, send the items as they're generated
+		if bStream:
+			response.headers['Content-Type'] = stream.CONTENT_TYPE
+			response.add_header('Vary', 'Accept')
+			mBody = stream.lines(
+				oResponse.data, lambda e: self._crashed(oReq, request)
 			)
+
+		# Else, send the entire Response
+		else:
+
+			# Find the format the client wants, JSON unless it explicitly asks
+			#	for another one, and let caches know the response depends on
+			#	it
+			oFormat = formats.negotiate(request.headers.get('Accept'))
+			response.headers['Content-Type'] = oFormat.content_type
+			response.add_header('Vary', 'Accept')
+
+			# Encode the Response, unless the client already has it. Responses
+			#	received from another service, in the same format, and not
+			#	modified, are sent as is
+			mBody = ''
+			if not bNotModified:
+				mBody = yield ( oResponse.to_format, oFormat.mime )
+
+			# If this is a read the client can cache, and it worked
+			if dConditional and not oResponse.error:
+
+				# If the noun declared how it can be cached, let the client know
+				if dConditional['cache_control']:
+					response.headers['Cache-Control'] = \
+						dConditional['cache_control']
+
+				# If it gets an ETag, and the noun didn't supply a version,
+				#	generate it from the Response, and check if the client
+				#	already has it
+				if dConditional['etag']:
+					if sETag is None:
+						sETag = yield ( conditional.generate, mBody )
+						bNotModified = conditional.matches(
+							request.headers.get('If-None-Match'), sETag
+						)
+					response.headers['ETag'] = sETag
+
+				# If the client already has it, send nothing
+				if bNotModified:
+					response.status = 304
+					mBody = ''
+
+			# If compression is on
+			if self.__compress:
+
+				# Let caches know the response depends on the encoding
+				response.add_header('Vary', 'Accept-Encoding')
+
+				# If the response is big enough, and the client accepts one of
+				#	our codecs, compress it
+				if mBody and len(mBody) >= self.__compress['threshold']:
+					sCodec = compress.negotiate(
+						request.headers.get('Accept-Encoding')
+					)
+					if sCodec:
+						response.headers['Content-Encoding'] = sCodec
+						mBody = yield (
+							compress.compress,
+							sCodec,
+							isinstance(mBody, str) and \
+								mBody.encode('utf-8') or mBody,
+							self.__compress['level']
+						)
+
+		# If requests are being logged, and this one is sampled, add it. The
+		#	payloads are encoded by the Log, off of this thread
+		if oLog is not None and oLog.sampled(
+			self.__services[self._service],
+			request.path,
+			bool(oResponse.error),
+			fRoll
+		):
+			dRecord = {
+				'time': time(),
+				'service': self.__services[self._service],
+				'method': request.method,
+				'path': request.path,
+				'status': response.status_code,
+				'duration': round((perf_counter() - fStart) * 1000, 3),
+				'error': oResponse.error and oResponse.error['code'] or None,
+				'stream': bStream
+			}
+			if oLog.payloads:
+				dRecord['request'] = mData
+				if not bStream and not bNotModified:
+					dRecord['response'] = oResponse.to_dict()
+			oLog.add(dRecord)
+
+		# Return the body
+		return mBody
+
+	def _crashed(self,
+		req: jobject,
+		request: bottle.BaseRequest | None = None
+	) -> Error:
+		"""Crashed
+
+		Called from inside an except block when a request raises an exception
+		that wasn't handled. Prints the traceback, passes the details to the
+		error handler, if there is one, and returns the error to send back
+
+		Arguments:
+			req (jobject): The request details
+			request (bottle.BaseRequest): Optional, the request, defaults to
+				the one bottle is handling in the current thread
+
+		Returns:
+			Error
+		"""
+
+		# If we didn't get the request, use bottle's
+		if request is None:
+			request = bottle.request
+
+		# Get the traceback info
+		sError = traceback.format_exc()
+
+		# Print the traceback to stderr
+		print(sError, file = sys.stderr)
+
+		# If we have an error handler
+		if self.__on_error:
+
+			# Gather all the details, including optional ones
+			oDetails = {
+				'service': self.__services[self._service],
+				'method': request.method,
+				'path': request.path,
+				'environment': request.environ,
+				'traceback': sError
+			}
+			for s in [ 'data', 'session' ]:
+				if s in req:
+					oDetails[s] = req[s]
+
+			# Pass the details to the error handler
+			self.__on_error(oDetails)
+
+		# Return a response of service/request crashed
+		return Error(
+			SERVICE_CRASHED,
+			'%s:%s' % ( self.__services[self._service], request.path )
+		)
+
+	@staticmethod
+	def _decode(request: bottle.BaseRequest,
+		format: formats.Format,
+		req: jobject
+	) -> None:
+		"""Decode
+
+		Reads the body of the request, decompresses it if it was compressed,
+		and stores the data decoded from it on the request details
+
+		Arguments:
+			request (bottle.BaseRequest): The request
+			format (formats.Format): The format the body is in
+			req (jobject): The request details to store the data on
+
+		Raises:
+			ResponseException: If the body can't be decompressed or decoded
+
+		Returns:
+			None
+		"""
+
+		# Store the data, if it's too big we need to read it rather than use
+		#	getvalue
+		try:
+			sData = request.body.getvalue()
+		except AttributeError as e:
+			sData = request.body.read()
+
+		# If the body was compressed, decompress it, but never beyond the
+		#	maximum size of a request
+		sEncoding = request.headers.get('Content-Encoding')
+		if sData and sEncoding and sEncoding.lower() != 'identity':
+			try:
+				sData = compress.decompress(
+					sEncoding, sData, bottle.BaseRequest.MEMFILE_MAX
+				)
+			except KeyError:
+				raise ResponseException(Error(
+					REST_REQUEST_DATA,
+					'Content-Encoding %s not supported' % sEncoding
+				))
+			except ValueError as e:
+				raise ResponseException(Error(
+					REST_REQUEST_DATA,
+					'Content-Encoding %s: %s' % ( sEncoding, str(e) )
+				))
+
+		# Convert the data, straight from the bytes, and store it
+		try:
+			if sData: req.data = format.decode(sData)
+		except Exception as e:
+			raise ResponseException(Error(
+				REST_REQUEST_DATA,
+				'%s\n%s' % ( sData, str(e) )
+			))
+
+	@staticmethod
+	def _drive(handler: Generator) -> any:
+		"""Drive
+
+		Runs the steps of a request in the current thread, calling everything
+		yielded by the handler and sending back the result. Async methods are
+		run on the event loop, see body.loop
+
+		Arguments:
+			handler (generator): The generator returned by _handle
+
+		Returns:
+			any: The value returned by the handler
+		"""
+		try:
+			t = next(handler)
+			while True:
+				try:
+					m = t[0](*t[1:])
+					if inspect.isawaitable(m):
+						m = loop.run(m)
+				except Exception as e:
+					t = handler.throw(e)
+				else:
+					t = handler.send(m)
+		except StopIteration as e:
+			return e.value
+
+	async def _drive_async(self,
+		handler: Generator,
+		executor: ThreadPoolExecutor
+	) -> any:
+		"""Drive Async
+
+		Runs the steps of a request on the running event loop, awaiting
+		everything yielded by the handler that's async, and running anything
+		that isn't on the pool of threads, then sending back the result
+
+		Arguments:
+			handler (generator): The generator returned by _handle
+			executor (ThreadPoolExecutor): The threads to run sync methods on
+
+		Returns:
+			any: The value returned by the handler
+		"""
+		oLoop = asyncio.get_running_loop()
+		try:
+			t = next(handler)
+			while True:
+				try:
+
+					# If it's async, await it
+					if inspect.iscoroutinefunction(t[0]):
+						m = await t[0](*t[1:])
+
+					# Else, run it on a thread, with the current context, and
+					#	if it returned something awaitable anyway, await it
+					else:
+						m = await oLoop.run_in_executor(
+							executor, contextvars.copy_context().run, *t
+						)
+						if inspect.isawaitable(m):
+							m = await m
+
+				except Exception as e:
+					t = handler.throw(e)
+				else:
+					t = handler.send(m)
+		except StopIteration as e:
+			return e.value
+
+	@classmethod
+	def _after_fork(cls):
+		"""After Fork
+
+		Called in child processes after a fork, threads don't survive one, so
+		drop the executor and its lock
+
+		Returns:
+			None
+		"""
+		cls.__list_executor = None
+		cls.__list_lock = Lock()
+
+	def _list(self,
+		req: jobject,
+		request: bottle.BaseRequest
+	) -> Response:
+		"""List
+
+		Runs each request in a __list request, at the same time if allowed,
+		and returns their Responses in the same order they were requested
+
+		Arguments:
+			req (jobject): The request details of the __list request
+			request (bottle.BaseRequest): The __list request, used to report
+				crashes, only ever from the thread handling it
+
+		Returns:
+			Response
+		"""
+
+		# Get the settings, the caller can ask for every request's Response,
+		#	errors included, e.g. so that reads sent together aren't failed
+		#	by the error of another
+		dList = self.__list
+		bAbort = dList['errors'] == 'abort' and not (
+			'meta' in req and req.meta and
+			req.meta.get(LIST_ERRORS) == 'collect'
 		)
 
-		# Return the Response as a string
-		return oResponse.to_json()
+		# If the data isn't passed or isn't an array
+		if 'data' not in req or not isinstance(req.data, list):
+			return Error(REST_REQUEST_DATA, 'data must be an array')
+
+		# If it's beyond the max
+		if len(req.data) > dList['limit']:
+			return Error(
+				REST_LIST_TO_LONG,
+				'Can not request more than %d urls via __list' % dList['limit']
+			)
+
+		# Go through each element in the list and generate the request for
+		#	it, or the error if it's invalid
+		lRequests = []
+		for m in req.data:
+
+			# If we got a string
+			if isinstance(m, str):
+				m = [ m ]
+
+			# Else, if we didn't get a list
+			elif not isinstance(m, list):
+				oError = Error(
+					REST_REQUEST_DATA, [ m,
+						'data must be an array or URI and data, ' \
+						'or single string for the URI' ]
+				)
+				if bAbort:
+					return oError
+				lRequests.append(( m, oError ))
+				continue
+
+			# If the URI doesn't exist
+			if not m or m[0] not in self.__uris:
+				oError = Error(REST_LIST_INVALID_URI, m and m[0] or None)
+				if bAbort:
+					return oError
+				lRequests.append(( m and m[0] or None, oError ))
+				continue
+
+			# If unique data was passed for the child request, but we didn't
+			#	get a dict
+			if len(m) == 2 and not isinstance(m[1], dict):
+				oError = Error(
+					REST_LIST_INVALID_URI,
+					[ m[1], 'data must be an object' ]
+				)
+				if bAbort:
+					return oError
+				lRequests.append(( m[0], oError ))
+				continue
+
+			# Add the request with its own data, if any was passed, sharing
+			#	the session and everything else with the __list request
+			lRequests.append(( m[0], _View(req, len(m) == 2 and m[1] or None) ))
+
+		# Start the requests that are valid, at the same time if there's
+		#	more than one and we're allowed, with the same deadline
+		lValid = [
+			i for i in range(len(lRequests))
+			if not isinstance(lRequests[i][1], Response)
+		]
+		if dList['workers'] > 1 and len(lValid) > 1:
+			oExecutor = self._list_executor()
+			dFutures = { i: oExecutor.submit(
+				contextvars.copy_context().run,
+				self._list_item, lRequests[i][0], lRequests[i][1]
+			) for i in lValid }
+		else:
+			dFutures = None
+
+		# Go through each request in order
+		lResponse = []
+		for i in range(len(lRequests)):
+			mURI, mRequest = lRequests[i]
+
+			# If the request was invalid, use the error
+			if isinstance(mRequest, Response):
+				lResponse.append([ mURI, mRequest.to_dict() ])
+				continue
+
+			# Get the result of the request, either by waiting for it, or by
+			#	running it
+			try:
+				if dFutures is not None:
+					oResponse, bRaised = dFutures[i].result()
+				else:
+					oResponse, bRaised = self._list_item(mURI, mRequest)
+
+			# If it crashed
+			except Exception:
+
+				# If we're aborting, cancel anything that hasn't started, and
+				#	let the crash through
+				if bAbort:
+					if dFutures is not None:
+						for o in dFutures.values():
+							o.cancel()
+					raise
+
+				# Else, store the error and keep going
+				oResponse = self._crashed(mRequest, request)
+				bRaised = True
+
+			# If the request raised an error, and we're aborting, cancel
+			#	anything that hasn't started, and return the error
+			if bRaised and bAbort:
+				if dFutures is not None:
+					for o in dFutures.values():
+						o.cancel()
+				return oResponse
+
+			# Add the Response
+			lResponse.append([ mURI, oResponse.to_dict() ])
+
+		# Return the list of individual responses
+		return Response(lResponse)
+
+	@classmethod
+	def _list_executor(cls) -> ThreadPoolExecutor:
+		"""List Executor
+
+		Returns the pool of threads used to run the requests in __list
+		requests, creating it if necessary
+
+		Returns:
+			ThreadPoolExecutor
+		"""
+		if cls.__list_executor is None:
+			with cls.__list_lock:
+				if cls.__list_executor is None:
+					cls.__list_executor = ThreadPoolExecutor(
+						max_workers = cls.__list['workers'],
+						thread_name_prefix = 'body.rest.list'
+					)
+		return cls.__list_executor
+
+	def _list_item(self, uri: str, req: jobject) -> tuple:
+		"""List Item
+
+		Runs a single request of a __list request and returns its Response,
+		along with whether it raised the error instead of returning it
+
+		Arguments:
+			uri (str): The URI of the request
+			req (jobject): The request details
+
+		Returns:
+			( Response, bool )
+		"""
+
+		# Call the request, waiting for it if it's async
+		try:
+			oResponse = self.__uris[uri](req)
+			if inspect.isawaitable(oResponse):
+				oResponse = loop.run(oResponse)
+
+			# If the noun returned an iterator of items, gather them all,
+			#	lists are never streamed
+			if stream.is_stream(oResponse):
+				oResponse = Response(oResponse)
+			if stream.is_stream(oResponse.data):
+				oResponse.data = list(oResponse.data)
+
+		# If we got a KeyError
+		except (AttributeError, KeyError) as e:
+			if e.args[0] in self.__key_to_errors:
+				return ( Error(self.__key_to_errors[e.args[0]]), True )
+			raise
+
+		# If we got a response exception, use its first argument
+		except ResponseException as e:
+			return ( e.args[0], True )
+
+		# Return the Response
+		return ( oResponse, False )
+
+# Make sure forked processes get their own threads
+os.register_at_fork(after_in_child = _Route._after_fork)
 
 class REST(bottle.Bottle):
 	"""REST
@@ -497,9 +1247,12 @@ class REST(bottle.Bottle):
 
 	__action_to_method = {
 		'create': 'POST',
+		'create_many': 'POST',
 		'delete': 'DELETE',
+		'delete_many': 'DELETE',
 		'read':   'GET',
-		'update': 'PUT'
+		'update': 'PUT',
+		'update_many': 'PUT'
 	}
 	"""Maps HTTP methods to service actions"""
 
@@ -508,7 +1261,14 @@ class REST(bottle.Bottle):
 		cors: List[str] | None = None,
 		lists: str | Literal[True] = True,
 		on_errors: Callable | None = None,
-		verbose: bool = False
+		verbose: bool = False,
+		compress: int | None = None,
+		log: Log | dict | None = None,
+		list_limit: int = 10,
+		list_workers: int = 4,
+		list_errors: str = 'abort',
+		session_cache: dict | bool | None = None,
+		etags: bool = False
 	):
 		"""Constructor
 
@@ -522,8 +1282,27 @@ class REST(bottle.Bottle):
 				to use instead of `__list`
 			on_errors (callable): Optional, a function to call when a service
 				request throws an exception
-			verbose (bool): Optional, set to True to print out each request and
-				and response
+			verbose (bool): Optional, set to True to log every request and
+				response to stdout, ignored if log is set
+			compress (uint): Optional, the minimum size in bytes of responses
+				that will be compressed if the client accepts it, defaults to
+				None, never compress
+			log (Log | dict): Optional, the Log to add requests and responses
+				to, or the arguments to create one with
+			list_limit (uint): Optional, the maximum number of requests in a
+				single __list request
+			list_workers (uint): Optional, the maximum number of requests in a
+				__list request run at the same time, 1 to run them one after
+				the other
+			list_errors (str): Optional, 'abort' to return the error of the
+				first request in a __list that raises one, 'collect' to return
+				every request's Response, errors included
+			session_cache (dict | bool): Optional, True, or the arguments to
+				pass to body.sessions.configure, to cache sessions in each
+				process and extend them in the background
+			etags (bool): Optional, set to True to send an ETag with every
+				read, not just those of nouns decorated with
+				body.conditional.conditional
 
 		Raises:
 			ValueError
@@ -565,8 +1344,25 @@ class REST(bottle.Bottle):
 		if on_errors:
 			_Route.on_error(on_errors)
 
-		# Set the verbose mode
-		_Route.verbose(verbose)
+		# Set the compression threshold
+		_Route.compress(compress)
+
+		# Set how requests are logged, verbose logs every one of them
+		if isinstance(log, dict):
+			log = Log(**log)
+		_Route.log(log or (verbose and Log() or None))
+
+		# Set how __list requests are handled
+		_Route.lists(list_limit, list_workers, list_errors)
+
+		# Set whether every read gets an ETag
+		_Route.etags(etags)
+
+		# If sessions are cached, turn it on
+		if session_cache:
+			sessions.configure(
+				**(isinstance(session_cache, dict) and session_cache or {})
+			)
 
 		# Step through each service
 		bOne = len(instances) == 1
@@ -578,8 +1374,11 @@ class REST(bottle.Bottle):
 				# Get the method
 				sMethod = self.__action_to_method[dRequest['action']]
 
-				# Generate the URI
+				# Generate the URI, requests for many items of the noun get
+				#	their own
 				sUri = '/%s' % dRequest['name'].replace('_', '/')
+				if dRequest['action'].endswith('_many'):
+					sUri = '%s/%s' % ( sUri, MANY )
 
 				# Register it with bottle
 				self.route(
@@ -605,13 +1404,36 @@ class REST(bottle.Bottle):
 					_Route(oInstance.name, True)
 				)
 
+	def asgi(self, threads: int = 32) -> ASGI:
+		"""ASGI
+
+		Returns an ASGI application serving the instance, to run on an event
+		loop with any ASGI server, e.g. uvicorn. Async noun methods are awaited
+		on the loop, and sync ones are run on a pool of threads, so requests
+		waiting on I/O don't each hold a worker
+
+		Arguments:
+			threads (uint): The maximum number of sync methods run at the
+				same time
+
+		Raises:
+			ValueError
+
+		Returns:
+			body.asgi.ASGI
+		"""
+		from body.asgi import ASGI
+		return ASGI(self, threads)
+
 	# run method
 	def run(self, server = 'gunicorn', host = '127.0.0.1', port = 8080,
 			reloader = False, interval = 1, quiet = False, plugins = None,
 			debug = None, maxfile = 20971520, **kargs):
 		"""Run
 
-		Overrides Bottle's run to default gunicorn and other fields
+		Overrides Bottle's run to default gunicorn and other fields. Set server
+		to 'asgi' to serve from an event loop, using gunicorn with uvicorn
+		workers, see asgi()
 
 		Arguments:
 			server (str): Server adapter to use
@@ -623,6 +1445,8 @@ class REST(bottle.Bottle):
 			plugins (list): List of plugins to the server
 			debug (bool): Debug mode
 			maxfile (int): Maximum size of requests
+			threads (int): With 'asgi', the maximum number of sync methods run
+				at the same time in each worker, defaults to 32
 
 		Returns:
 			None
@@ -631,9 +1455,35 @@ class REST(bottle.Bottle):
 		# Set the max file size
 		bottle.BaseRequest.MEMFILE_MAX = maxfile
 
+		# If we are serving from an event loop, use gunicorn with workers
+		#	that run one
+		mApp = self
+		if server == 'asgi':
+			mApp = self.asgi(kargs.pop('threads', 32))
+			kargs.setdefault('worker_class', 'uvicorn.workers.UvicornWorker')
+			server = 'gunicorn'
+
+		# If we are running gunicorn, connections to other services need to be
+		#	opened in each worker, not in the parent that forks them
+		if server == 'gunicorn':
+
+			# Keep any hook already passed
+			fPostWorkerInit = kargs.get('post_worker_init')
+
+			# Prewarm the connections, then call the original hook
+			def post_worker_init(worker):
+				prewarm()
+				if fPostWorkerInit:
+					fPostWorkerInit(worker)
+			kargs['post_worker_init'] = post_worker_init
+
+		# Else, prewarm the connections in this process
+		else:
+			prewarm()
+
 		# Call bottle run
 		bottle.run(
-			app = self, server = server, host = host, port = port,
+			app = mApp, server = server, host = host, port = port,
 			reloader = reloader, interval = interval, quiet = quiet,
 			plugins = plugins, debug = debug, **kargs
 		)
\ No newline at end of file
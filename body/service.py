@@ -20,6 +20,7 @@ import re
 from typing import List
 
 # Module imports
+from body import cached
 from body.external import register_service
 from body.errors import DATA_FIELDS
 from body.response import ResponseException
@@ -32,7 +33,8 @@ class Service(abc.ABC):
 	"""
 
 	__noun_regex = re.compile(
-		r'([a-z]+(?:_[a-z]+)*)_(create|delete|read|update)'
+		r'([a-z]+(?:_[a-z]+)*)_(create|delete|read|update|' \
+		r'create_many|delete_many|update_many)$'
 	)
 	"""Regular Expression to match to valid service noun method"""
 
@@ -71,6 +73,26 @@ class Service(abc.ABC):
 					'func': getattr(self, sFunc)
 				})
 
+		# Find the nouns whose reads are cached
+		lCached = [
+			d['name'] for d in self._requests
+			if d['action'] == 'read' and cached.settings(d['func'])
+		]
+
+		# Make sure writes to those nouns remove their cached reads
+		for d in self._requests:
+			if d['action'] != 'read' and d['name'] in lCached:
+				d['func'] = cached.invalidates(self._name, d['name'], d['func'])
+				setattr(self, '%s_%s' % ( d['name'], d['action'] ), d['func'])
+
+		# Make sure resetting the service removes its cached reads
+		if lCached:
+			fReset = self.reset
+			def reset():
+				cached.clear(self._name)
+				return fReset()
+			self.reset = reset
+
 		# Register the service with body
 		self._info = register_service(self._name, self)
 
@@ -135,6 +157,9 @@ class Service(abc.ABC):
 		Called when the system has been reset, usually by loading new data that
 		the instance will need to process/reprocess
 
+		Any reads cached with body.cached.cached are removed before it's
+		called
+
 		Returns:
 			None
 		"""
@@ -176,12 +201,24 @@ class Service(abc.ABC):
 				request crashes
 		"""
 
+		# Get the settings for __list requests
+		dList = config.body.rest.list({
+			'errors': 'abort', 'limit': 10, 'workers': 4
+		})
+
 		# Create the REST server using the Client instance
 		oRest = REST(
 			instances = [ self ],
 			cors = config.body.rest.allowed('localhost'),
 			on_errors = on_errors,
-			verbose = config.body.rest.verbose(False)
+			verbose = config.body.rest.verbose(False),
+			compress = config.body.rest.compress(None),
+			log = config.body.rest.log(None),
+			list_limit = dList['limit'],
+			list_workers = dList['workers'],
+			list_errors = dList['errors'],
+			session_cache = config.body.rest.session_cache(None),
+			etags = config.body.rest.etags(False)
 		)
 
 		# If there's any additional
@@ -189,10 +226,19 @@ class Service(abc.ABC):
 			for l in additional:
 				oRest.route(*l)
 
+		# If the server is run from an event loop, get the number of threads
+		#	sync methods are run on
+		mASGI = config.body.rest.asgi(False)
+		dServer = mASGI and {
+			'server': 'asgi',
+			'threads': isinstance(mASGI, dict) and mASGI.get('threads', 32) or 32
+		} or {}
+
 		# Run the server forever
 		oRest.run(
 			host = self._info['host'],
 			port = self._info['port'],
 			workers = self._info['workers'],
-			timeout = 'timeout' in self._info and self._info['timeout'] or 30
+			timeout = 'timeout' in self._info and self._info['timeout'] or 30,
+			**dServer
 		)
\ No newline at end of file
@@ -0,0 +1,405 @@
+# coding=utf8
+"""Sessions
+
+Loads the sessions of incoming requests, optionally keeping them in a small
+cache local to the process, and extending their TTL from a background thread
+instead of on every request
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'configure', 'flush', 'invalidate', 'load', 'stats' ]
+
+# Ouroboros imports
+import memory
+
+# Python imports
+import atexit
+from collections import OrderedDict
+import os
+import sys
+from threading import Event, Lock, Thread
+from time import monotonic
+import traceback
+
+__settings = None
+"""The cache settings, None if sessions aren't cached"""
+
+__entries = OrderedDict()
+"""The cached sessions by key, least recently used first"""
+
+__pending = {}
+"""The sessions waiting to be extended by key, with when they were added"""
+
+__lock = Lock()
+"""Lock used to modify the entries, pending extensions, and stats"""
+
+__thread = None
+"""The thread extending the sessions"""
+
+__pid = None
+"""The process the thread was started in"""
+
+__wake = Event()
+"""Used to wake the thread early, e.g. when the interval changes"""
+
+__stats = {
+	'errors': 0,
+	'evictions': 0,
+	'extended': 0,
+	'flushes': 0,
+	'hits': 0,
+	'last_lag': 0.0,
+	'misses': 0
+}
+"""The counters returned by stats()"""
+
+class _Session(memory._Memory):
+	"""Session
+
+	A request's own copy of a cached session, so that anything the request
+	changes isn't seen by other requests until it's saved. Saving it also
+	replaces the cached session, and closing it removes it from the cache
+
+	Extends:
+		memory._Memory
+	"""
+
+	def close(self):
+		"""Close
+
+		Deletes the session from the session store, and the cache
+
+		Returns:
+			None
+		"""
+		super().close()
+		invalidate(self.key())
+
+	def save(self):
+		"""Save
+
+		Saves the session in the session store, and replaces the cached one,
+		if it's still cached, so the next request in the process sees it
+
+		Returns:
+			None
+		"""
+		super().save()
+		_replace(self)
+
+def _copy(session: any, cls: type = _Session) -> any:
+	"""Copy
+
+	Returns a deep copy of a session
+
+	Arguments:
+		session (memory._Memory): The session
+		cls (type): Optional, the class of the copy
+
+	Returns:
+		memory._Memory
+	"""
+	dSession = session.__json__()
+	return cls(dSession['__key'], dSession['__store'])
+
+def _replace(session: any):
+	"""Replace
+
+	Replaces the cached copy of a session with a copy of the one passed, if
+	it's still cached, keeping when it expires
+
+	Arguments:
+		session (memory._Memory): The session
+
+	Returns:
+		None
+	"""
+	oSession = _copy(session, memory._Memory)
+	with __lock:
+		try:
+			fExpires = __entries[session.key()][1]
+		except KeyError:
+			return
+		__entries[session.key()] = ( oSession, fExpires )
+
+def _extend(key: str, session: any, now: float):
+	"""Extend
+
+	Adds the session to those waiting to be extended, if it isn't already,
+	and makes sure the thread is running
+
+	Arguments:
+		key (str): The key of the session
+		session (memory._Memory): The session
+		now (float): The monotonic time of the request
+
+	Returns:
+		None
+	"""
+	global __pid, __thread
+
+	with __lock:
+
+		# Add the session, keeping the oldest time if it's already waiting
+		if key not in __pending:
+			__pending[key] = ( session, now )
+
+		# If the thread isn't running in this process, start it
+		if __pid != os.getpid():
+			__thread = Thread(
+				target = _run, name = 'body.sessions', daemon = True
+			)
+			__thread.start()
+			__pid = os.getpid()
+
+def _flush() -> int:
+	"""Flush
+
+	Extends every session waiting to be
+
+	Returns:
+		uint: The number of sessions extended
+	"""
+
+	# Take the sessions waiting
+	with __lock:
+		dPending = __pending.copy()
+		__pending.clear()
+
+	# If there's nothing, there's nothing to do
+	if not dPending:
+		return 0
+
+	# Extend each one, keeping track of the longest any waited
+	fNow = monotonic()
+	fLag = 0.0
+	iErrors = 0
+	for oSession, fAdded in dPending.values():
+		fLag = max(fLag, fNow - fAdded)
+		try:
+			oSession.extend()
+		except Exception:
+			iErrors += 1
+			print(traceback.format_exc(), file = sys.stderr)
+
+	# Update the stats and return the count
+	with __lock:
+		__stats['errors'] += iErrors
+		__stats['extended'] += len(dPending) - iErrors
+		__stats['flushes'] += 1
+		__stats['last_lag'] = fLag
+	return len(dPending)
+
+def _run():
+	"""Run
+
+	Runs in the background, extending the sessions waiting every interval
+
+	Returns:
+		None
+	"""
+	while True:
+		__wake.wait(__settings and __settings['interval'] or 1.0)
+		__wake.clear()
+		_flush()
+
+def _after_fork():
+	"""After Fork
+
+	Called in child processes after a fork, sessions are cached, and counted,
+	per process, and threads don't survive a fork, so start over
+
+	Returns:
+		None
+	"""
+	global __lock, __pid, __thread, __wake
+	__entries.clear()
+	__pending.clear()
+	for s in __stats:
+		__stats[s] = 0
+	__stats['last_lag'] = 0.0
+	__lock = Lock()
+	__pid = None
+	__thread = None
+	__wake = Event()
+
+# Make sure forked processes get their own cache and thread
+os.register_at_fork(after_in_child = _after_fork)
+
+# Make sure sessions waiting are extended before the process exits
+atexit.register(_flush)
+
+def configure(
+	ttl: float = 5.0,
+	size: int = 1000,
+	interval: float = 1.0
+):
+	"""Configure
+
+	Turns on caching of sessions. Once on, a session loaded is kept for `ttl`
+	seconds and every request using it gets its own copy, and its TTL in the
+	session store is extended once every `interval` seconds at most, instead
+	of on every request
+
+	Arguments:
+		ttl (float): The number of seconds a session is cached, 0 to turn
+			caching off
+		size (uint): The maximum number of sessions cached
+		interval (float): The number of seconds between each extension of
+			the sessions used
+
+	Raises:
+		ValueError
+
+	Returns:
+		None
+	"""
+	global __settings
+
+	# Validate the settings
+	try:
+		fTTL = float(ttl)
+		if fTTL < 0: raise ValueError()
+	except (TypeError, ValueError):
+		raise ValueError('ttl', 'must be a number of 0 or greater')
+	try:
+		iSize = int(size)
+		if iSize < 1: raise ValueError()
+	except (TypeError, ValueError):
+		raise ValueError('size', 'must be an int greater than 0')
+	try:
+		fInterval = float(interval)
+		if fInterval <= 0: raise ValueError()
+	except (TypeError, ValueError):
+		raise ValueError('interval', 'must be a number greater than 0')
+
+	# Store the settings, or turn caching off, and clear anything cached
+	#	under the old settings
+	with __lock:
+		__settings = fTTL and {
+			'interval': fInterval,
+			'size': iSize,
+			'ttl': fTTL
+		} or None
+		__entries.clear()
+
+	# Wake the thread, if it's running, so the new interval is used right
+	#	away
+	__wake.set()
+
+def flush():
+	"""Flush
+
+	Extends every session waiting to be right away, instead of waiting for
+	the next interval
+
+	Returns:
+		None
+	"""
+	_flush()
+
+def invalidate(key: str):
+	"""Invalidate
+
+	Removes a session from the cache of this process, e.g. once it's closed,
+	so that the next request using it loads it from the session store. Other
+	processes keep their copy until it expires from their cache
+
+	Arguments:
+		key (str): The key of the session
+
+	Returns:
+		None
+	"""
+	with __lock:
+		__entries.pop(key, None)
+		__pending.pop(key, None)
+
+def load(key: str) -> any:
+	"""Load
+
+	Returns the session associated with the key, from the cache if it's on
+	and has it, else from the session store, and makes sure its TTL gets
+	extended. Cached sessions are never returned, only copies of them, so
+	changes made by one request don't leak into others
+
+	Arguments:
+		key (str): The key of the session
+
+	Returns:
+		memory._Memory | None
+	"""
+
+	# If caching is off, load the session and extend it right away
+	dSettings = __settings
+	if dSettings is None:
+		oSession = memory.load(key)
+		if oSession:
+			oSession.extend()
+		return oSession
+
+	# Look for the session in the cache
+	fNow = monotonic()
+	with __lock:
+		try:
+			oSession, fExpires = __entries[key]
+			if fExpires > fNow:
+				__entries.move_to_end(key)
+				__stats['hits'] += 1
+			else:
+				del __entries[key]
+				oSession = None
+		except KeyError:
+			oSession = None
+		if oSession is None:
+			__stats['misses'] += 1
+
+	# If we didn't find it, load it, and if it doesn't exist, there's nothing
+	#	to cache
+	if oSession is None:
+		oSession = memory.load(key)
+		if not oSession:
+			return None
+
+		# Add it to the cache, removing the least recently used if there's too
+		#	many
+		with __lock:
+			__entries[key] = ( oSession, fNow + dSettings['ttl'] )
+			__entries.move_to_end(key)
+			while len(__entries) > dSettings['size']:
+				__entries.popitem(last = False)
+				__stats['evictions'] += 1
+
+	# Extend the session in the background and return a copy of it
+	_extend(key, oSession, fNow)
+	return _copy(oSession)
+
+def stats() -> dict:
+	"""Stats
+
+	Returns whether caching is on, the number of sessions cached, hits,
+	misses, the hit rate, and evictions, along with the number of sessions
+	waiting to be extended, how long the oldest has been waiting ('lag'),
+	the longest any waited in the last flush ('last_lag'), and the totals of
+	flushes, sessions extended, and extensions that failed
+
+	Returns:
+		dict
+	"""
+	fNow = monotonic()
+	with __lock:
+		dRet = __stats.copy()
+		dRet['enabled'] = __settings is not None
+		dRet['size'] = len(__entries)
+		dRet['pending'] = len(__pending)
+		dRet['lag'] = __pending and \
+			max([ fNow - t[1] for t in __pending.values() ]) or 0.0
+	iTotal = dRet['hits'] + dRet['misses']
+	dRet['hit_rate'] = iTotal and (dRet['hits'] / iTotal) or 0.0
+	return dRet
\ No newline at end of file
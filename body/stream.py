@@ -0,0 +1,177 @@
+# coding=utf8
+"""Stream
+
+Used to send the items of a Response one at a time, as newline delimited JSON,
+instead of all at once, so that neither side needs to hold all of them in
+memory
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Limit exports
+__all__ = [ 'accepts', 'CONTENT_TYPE', 'is_stream', 'items', 'lines', 'MIME' ]
+
+# Python imports
+from collections.abc import Callable, Iterator
+
+# Pip imports
+import requests
+
+# Local imports
+from body import errors, formats
+from body.response import Error, Response, ResponseException
+
+MIME = 'application/x-ndjson'
+"""The mime type of streamed Responses"""
+
+CONTENT_TYPE = '%s; charset=utf-8' % MIME
+"""The Content-Type header of streamed Responses"""
+
+__buffer = 16384
+"""The number of bytes collected before they are sent"""
+
+def accepts(accept: str | None) -> bool:
+	"""Accepts
+
+	Returns True if the value of an Accept header explicitly lists streamed
+	Responses
+
+	Arguments:
+		accept (str): The value of the Accept header
+
+	Returns:
+		bool
+	"""
+
+	# If there's no header, streams aren't accepted
+	if not accept:
+		return False
+
+	# Go through each type and look for ours
+	for s in accept.split(','):
+		l = s.split(';')
+		if l[0].strip().lower() == MIME:
+			for p in l[1:]:
+				p = p.strip()
+				if p.startswith('q='):
+					try: return float(p[2:]) > 0
+					except ValueError: return False
+			return True
+
+	# Not found
+	return False
+
+def is_stream(val: any) -> bool:
+	"""Is Stream
+
+	Returns True if the value is an iterator, e.g. a generator, and should be
+	streamed instead of sent all at once
+
+	Arguments:
+		val (any): The value to check
+
+	Returns:
+		bool
+	"""
+	return isinstance(val, Iterator)
+
+def items(res: requests.Response) -> Iterator:
+	"""Items
+
+	Yields each item of a streamed Response as it arrives. Closes the
+	response once it's done, or if the iterator is closed early
+
+	Arguments:
+		res (requests.Response): A response made with stream = True
+
+	Raises:
+		ResponseException: If the service sent an error, or the stream was
+			cut off
+
+	Returns:
+		iterator
+	"""
+	try:
+		for b in res.iter_lines(chunk_size = __buffer):
+
+			# Skip any empty lines
+			if not b:
+				continue
+
+			# Decode the line, and if it's an error, raise it
+			d = formats.JSON.decode(b)
+			if 'error' in d:
+				raise ResponseException(Response.from_dict(d))
+
+			# Else, return the item
+			yield d['data']
+
+	# If the stream was cut off
+	except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError,
+			requests.Timeout) as e:
+		raise ResponseException(Error(errors.SERVICE_UNREACHABLE, str(e)))
+
+	# Whatever happens, release the connection
+	finally:
+		res.close()
+
+def lines(
+	items: Iterator,
+	on_error: Callable[[Exception], Response]
+) -> Iterator:
+	"""Lines
+
+	Yields the items of a Response as newline delimited JSON, collected into
+	chunks of at least 16KB. Each line is a Response with one item as its data,
+	or a single Response with an error if the iterator raised an exception,
+	after which the stream ends
+
+	Arguments:
+		items (iterator): The items to send
+		on_error (callable): Called with any exception raised by the iterator
+			other than a ResponseException, returns the Response to send
+
+	Returns:
+		iterator
+	"""
+
+	# Init the buffer
+	lBuffer = []
+	iSize = 0
+
+	try:
+
+		# Go through each item, adding it to the buffer, and send the buffer
+		#	once it's big enough
+		for m in items:
+			b = formats.JSON.encode({ 'data': m }) + b'\n'
+			lBuffer.append(b)
+			iSize += len(b)
+			if iSize >= __buffer:
+				yield b''.join(lBuffer)
+				lBuffer = []
+				iSize = 0
+
+	# If the iterator raised an error
+	except ResponseException as e:
+		oError = e.args[0]
+	except Exception as e:
+		oError = on_error(e)
+
+	# Else, there's no error
+	else:
+		oError = None
+
+	# If there was an error, add it
+	if oError is not None:
+		lBuffer.append(
+			formats.JSON.encode(oError.to_dict()) + b'\n'
+		)
+
+	# Send whatever is left
+	if lBuffer:
+		yield b''.join(lBuffer)
\ No newline at end of file
@@ -0,0 +1,140 @@
+# coding=utf8
+"""Conftest
+
+Fixtures shared by the tests, a config with the services each test needs, and
+HTTP servers, run in the same process, for those services to point to
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Ouroboros imports
+import config
+
+# Python imports
+import json
+from socketserver import ThreadingMixIn
+from threading import Thread
+from wsgiref.simple_server import make_server, WSGIRequestHandler, WSGIServer
+
+# Pip imports
+import pytest
+
+# Local imports
+from body import external
+from body.flight import Flight
+from body.rest import REST
+
+class _Server(ThreadingMixIn, WSGIServer):
+	"""Server
+
+	WSGI server that handles each request in its own thread, so that requests
+	made at the same time are received at the same time
+	"""
+	daemon_threads = True
+
+class _Quiet(WSGIRequestHandler):
+	"""Quiet
+
+	Request handler that doesn't print every request
+	"""
+	def log_message(self, *args):
+		pass
+
+@pytest.fixture
+def serve():
+	"""Serve
+
+	Returns a function that serves a WSGI application on a free port in a
+	background thread and returns the port. Every server is stopped once the
+	test is done
+	"""
+	lServers = []
+
+	def start(app: callable) -> int:
+		oServer = make_server('127.0.0.1', 0, app, _Server, _Quiet)
+		Thread(target = oServer.serve_forever, daemon = True).start()
+		lServers.append(oServer)
+		return oServer.server_port
+
+	yield start
+
+	for o in lServers:
+		o.shutdown()
+		o.server_close()
+
+@pytest.fixture
+def upstream(serve):
+	"""Upstream
+
+	Returns a function that serves a fake service and returns its port. The
+	handler passed gets the WSGI environment of each request and returns the
+	status and the dict to send back as JSON
+	"""
+
+	def start(handler: callable) -> int:
+		def app(environ: dict, start_response: callable) -> list:
+			iStatus, dBody = handler(environ)
+			bBody = json.dumps(dBody).encode('utf-8')
+			start_response('%d X' % iStatus, [
+				( 'Content-Type', 'application/json; charset=utf-8' ),
+				( 'Content-Length', str(len(bBody)) )
+			])
+			return [ bBody ]
+		return serve(app)
+
+	return start
+
+@pytest.fixture
+def rest(serve):
+	"""Rest
+
+	Returns a function that serves a REST instance of the services passed,
+	created with any other arguments passed, and returns its URL
+	"""
+
+	def start(instances: list, **kwargs) -> str:
+		return 'http://127.0.0.1:%d' % serve(REST(instances, **kwargs))
+
+	return start
+
+@pytest.fixture
+def services(monkeypatch):
+	"""Services
+
+	Returns a function that replaces the config with the services passed,
+	along with any other sections of config.body, and generates the services
+	from it, without anything cached or in flight from another test
+	"""
+
+	# Make sure everything is put back once the test is done
+	monkeypatch.setattr(config, '_Conf__data', {})
+	monkeypatch.setattr(external, '__services', None)
+	monkeypatch.setattr(external, '__cache', None)
+	monkeypatch.setattr(external, '__flight', Flight())
+
+	def configure(services: dict, **body):
+		config._Conf__data = { 'body': {
+			'rest': {
+				'default': {
+					'domain': '127.0.0.1',
+					'port': 0,
+					'protocol': 'http'
+				},
+				'services': services
+			},
+			**body
+		} }
+		external._generate_services()
+
+	yield configure
+
+	# Close any connections left open
+	dServices = getattr(external, '__services')
+	if dServices:
+		for d in dServices.values():
+			if 'balancer' in d:
+				d['balancer'].close()
\ No newline at end of file
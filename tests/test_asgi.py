@@ -0,0 +1,233 @@
+# coding=utf8
+"""Test ASGI
+
+Tests async noun methods, and serving a REST instance from an event loop
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+import asyncio
+import json
+from threading import current_thread
+from time import perf_counter
+
+# Local imports
+from body import errors, external, formats, ingest, Response, Service
+from body.rest import REST
+
+class Items(Service):
+	"""Items
+
+	Service with async and sync reads
+	"""
+
+	def reset(self):
+		pass
+
+	async def wait_read(self, req):
+		await asyncio.sleep(req.data['ms'] / 1000)
+		return Response(req.data['ms'])
+
+	def thread_read(self, req):
+		return Response(current_thread().name)
+
+	def crash_read(self, req):
+		raise RuntimeError('crashed')
+
+	@ingest.streamed(max_bytes = 1024)
+	def rows_create(self, req):
+		return Response(sum(req.data))
+
+def _serve(app: REST, requests: list) -> list:
+	"""Serve
+
+	Starts the ASGI application of the REST instance, sends it the requests
+	at the same time, then stops it, and returns the status and decoded body
+	of each, in the same order
+
+	Arguments:
+		app (REST): The REST instance
+		requests (list): The list of ( method, path, data )
+
+	Returns:
+		list
+	"""
+	oApp = app.asgi(threads = 2)
+
+	async def call(method: str, path: str, data: any) -> tuple:
+		lEvents = [ {
+			'type': 'http.request',
+			'body': data is not None and json.dumps(data).encode() or b'',
+			'more_body': False
+		} ]
+		lSent = []
+		async def receive():
+			if lEvents:
+				return lEvents.pop(0)
+			await asyncio.sleep(60)
+		async def send(event):
+			lSent.append(event)
+		await oApp({
+			'type': 'http',
+			'method': method,
+			'path': path,
+			'query_string': b'',
+			'headers': [
+				( b'content-type', b'application/json; charset=utf-8' )
+			]
+		}, receive, send)
+		return (
+			lSent[0]['status'],
+			json.loads(b''.join([ d.get('body', b'') for d in lSent[1:] ]))
+		)
+
+	async def run() -> list:
+
+		# Start the application, and wait for it to be ready
+		oEvents = asyncio.Queue()
+		oStarted = asyncio.Event()
+		async def send(event):
+			if event['type'] == 'lifespan.startup.complete':
+				oStarted.set()
+		oLifespan = asyncio.create_task(
+			oApp({ 'type': 'lifespan' }, oEvents.get, send)
+		)
+		await oEvents.put({ 'type': 'lifespan.startup' })
+		await oStarted.wait()
+
+		# Make the requests, then stop the application
+		try:
+			return await asyncio.gather(*[ call(*t) for t in requests ])
+		finally:
+			await oEvents.put({ 'type': 'lifespan.shutdown' })
+			await oLifespan
+
+	return asyncio.run(run())
+
+def test_async_concurrent(services):
+	"""Async Concurrent
+
+	Async nouns are awaited on the loop, so requests waiting on them don't
+	hold a thread
+	"""
+	services({ 'items': {} })
+	fStart = perf_counter()
+	lResults = _serve(REST([ Items() ]), [
+		( 'GET', '/wait', { 'ms': 300 } ) for i in range(4)
+	])
+	assert perf_counter() - fStart < 0.9
+	assert lResults == [ ( 200, { 'data': 300 } ) ] * 4
+
+def test_sync_thread(services):
+	"""Sync Thread
+
+	Sync nouns are run on the pool of threads
+	"""
+	services({ 'items': {} })
+	lResults = _serve(REST([ Items() ]), [ ( 'GET', '/thread', None ) ])
+	assert lResults[0][1]['data'].startswith('body.asgi')
+
+def test_codec_thread(services, monkeypatch):
+	"""Codec Thread
+
+	Bodies are decoded and encoded on the pool of threads, even for async
+	nouns, so large ones don't hold up the loop
+	"""
+	services({ 'items': {} })
+	lThreads = []
+	def wrap(f):
+		def wrapped(*args):
+			lThreads.append(current_thread().name)
+			return f(*args)
+		return wrapped
+	monkeypatch.setattr(formats.JSON, 'decode', wrap(formats.JSON.decode))
+	monkeypatch.setattr(formats.JSON, 'encode', wrap(formats.JSON.encode))
+	lResults = _serve(REST([ Items() ]), [ ( 'GET', '/wait', { 'ms': 1 } ) ])
+	assert lResults == [ ( 200, { 'data': 1 } ) ]
+	assert len(lThreads) == 2
+	assert all([ s.startswith('body.asgi') for s in lThreads ])
+
+def test_streamed(services, monkeypatch):
+	"""Streamed
+
+	Bodies of nouns that take their data one item at a time are read from
+	the file the body was spooled to as it was received, not copied again
+	"""
+	services({ 'items': {} })
+	def copied(*args, **kwargs):
+		raise AssertionError('copied')
+	monkeypatch.setattr(ingest, 'SpooledTemporaryFile', copied)
+	lResults = _serve(REST([ Items() ]), [
+		( 'POST', '/rows', list(range(100)) ),
+		( 'POST', '/rows', list(range(1000)) )
+	])
+	assert lResults[0] == ( 200, { 'data': 4950 } )
+	assert lResults[1][1]['error'] == {
+		'code': errors.REST_REQUEST_DATA, 'msg': 'larger than 1024 bytes'
+	}
+
+def test_crash(services):
+	"""Crash
+
+	A noun that crashes gets a crashed error, the request doesn't fail
+	"""
+	services({ 'items': {} })
+	lResults = _serve(REST([ Items() ]), [ ( 'GET', '/crash', None ) ])
+	assert lResults[0][1]['error']['code'] == errors.SERVICE_CRASHED
+	assert lResults[0][1]['error']['msg'] == 'items:/crash'
+
+def test_list_collect_crash(services):
+	"""List Collect Crash
+
+	When collecting errors, a read in a __list request that crashes only
+	fails that read, even though there's no bottle request in the thread
+	"""
+	services({ 'items': {} })
+	lResults = _serve(REST([ Items() ], list_errors = 'collect'), [
+		( 'GET', '/__list', [ 'crash', [ 'wait', { 'ms': 0 } ] ] )
+	])
+	iStatus, dBody = lResults[0]
+	assert iStatus == 200
+	assert 'error' not in dBody
+	assert dBody['data'][0][1]['error']['code'] == errors.SERVICE_CRASHED
+	assert dBody['data'][0][1]['error']['msg'] == 'items:/__list'
+	assert dBody['data'][1][1]['data'] == 0
+
+def test_list_abort_crash(services):
+	"""List Abort Crash
+
+	When aborting, a read in a __list request that crashes fails the entire
+	request
+	"""
+	services({ 'items': {} })
+	lResults = _serve(REST([ Items() ], list_errors = 'abort'), [
+		( 'GET', '/__list', [ 'crash', 'thread' ] )
+	])
+	assert lResults[0][1]['error']['code'] == errors.SERVICE_CRASHED
+
+def test_not_found(services):
+	"""Not Found
+
+	Anything that isn't a noun is handled by bottle on a thread
+	"""
+	services({ 'items': {} })
+	oApp = REST([ Items() ])
+	oApp.route('/health', 'GET', lambda: { 'ok': True })
+	lResults = _serve(oApp, [ ( 'GET', '/health', None ) ])
+	assert lResults == [ ( 200, { 'ok': True } ) ]
+
+def test_in_process(services):
+	"""In Process
+
+	Async nouns called in the same process from sync code are run on the
+	background loop and waited for
+	"""
+	services({ 'items': {} })
+	Items()
+	oResponse = external.read('items', 'wait', { 'data': { 'ms': 0 } })
+	assert oResponse.data == 0
\ No newline at end of file
@@ -0,0 +1,359 @@
+# coding=utf8
+"""Test Batch
+
+Tests collecting reads and sending them to a service's list path as a single
+request
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+import json
+from threading import current_thread
+from time import time
+
+# Pip imports
+import pytest
+
+# Local imports
+from body import deadline, Error, errors, external, Response, \
+	ResponseException, Service
+from body.batch import Batch
+
+class Items(Service):
+	"""Items
+
+	Service with reads that work, or raise
+	"""
+
+	def reset(self):
+		self.calls = 0
+
+	def item_read(self, req):
+		self.calls += 1
+		return Response(req.data['id'])
+
+	def raised_read(self, req):
+		self.calls += 1
+		raise ResponseException(Error(errors.DB_NO_RECORD, req.data['id']))
+
+def _service(services: callable, upstream: callable, **conf) -> list:
+	"""Service
+
+	Serves a service with a list path that returns the path and data of each
+	read, and returns the list of requests it received, each the path and
+	the data sent
+
+	Arguments:
+		services (callable): The services fixture
+		upstream (callable): The upstream fixture
+		**conf (dict): Any other config of the service
+
+	Returns:
+		list
+	"""
+	lCalls = []
+	def handler(environ):
+		iLength = int(environ.get('CONTENT_LENGTH') or 0)
+		mData = iLength and \
+			json.loads(environ['wsgi.input'].read(iLength)) or None
+		sPath = environ['PATH_INFO'][1:]
+		lCalls.append(( sPath, mData ))
+
+		# If it's a list, return a Response for each read
+		if sPath == '__list':
+			lRet = []
+			for m in mData:
+				if isinstance(m, str):
+					m = [ m, None ]
+				if m[0] == 'missing':
+					lRet.append([ m[0], { 'error': {
+						'code': errors.DB_NO_RECORD
+					} } ])
+				else:
+					lRet.append([ m[0], { 'data': m } ])
+			return ( 200, { 'data': lRet } )
+
+		# Else, return the one
+		return ( 200, { 'data': [ sPath, mData ] } )
+
+	services({ 'remote': { 'port': upstream(handler), **conf } })
+	return lCalls
+
+def test_futures():
+	"""Futures
+
+	Each read gets a Future that's resolved once the block is done, or
+	cancelled if the block raises
+	"""
+	lSent = []
+	def send(service, reads):
+		lSent.append(( service, reads ))
+		return [ '%s:%s' % ( service, t[0] ) for t in reads ]
+
+	with Batch(send) as oBatch:
+		oA = oBatch.read('one', 'a')
+		oB = oBatch.read('one', 'b')
+		oC = oBatch.read('two', 'c')
+		assert not oA.done()
+	assert [ o.result() for o in [ oA, oB, oC ] ] == \
+		[ 'one:a', 'one:b', 'two:c' ]
+	assert len(lSent) == 2
+
+	# If the block fails, nothing is sent
+	with pytest.raises(RuntimeError):
+		with Batch(send) as oBatch:
+			oD = oBatch.read('one', 'd')
+			raise RuntimeError('failed')
+	with pytest.raises(CancelledError):
+		oD.result()
+	assert len(lSent) == 2
+
+def test_send_error():
+	"""Send Error
+
+	If sending the reads of a service fails, each of its reads gets the
+	exception, and the reads of other services aren't affected
+	"""
+	def send(service, reads):
+		if service == 'bad':
+			raise ConnectionError(service)
+		return [ t[0] for t in reads ]
+
+	with ThreadPoolExecutor(2) as oPool:
+		with Batch(send, oPool) as oBatch:
+			oGood = oBatch.read('good', 'a')
+			oBad = oBatch.read('bad', 'b')
+	assert oGood.result() == 'a'
+	with pytest.raises(ConnectionError):
+		oBad.result()
+
+def test_flush_thread():
+	"""Flush Thread
+
+	A batch sent from one of the executor's own threads sends each service
+	in that thread, instead of waiting on the pool, which could dead lock it
+	"""
+	def send(service, reads):
+		return [ current_thread().name for t in reads ]
+
+	with ThreadPoolExecutor(1, thread_name_prefix = 'pool') as oPool:
+		def run():
+			with Batch(send, oPool, 'pool') as oBatch:
+				oA = oBatch.read('one', 'a')
+				oB = oBatch.read('two', 'b')
+			return [ oA.result(), oB.result(), current_thread().name ]
+		lNames = oPool.submit(run).result(timeout = 5)
+	assert lNames[0] == lNames[1] == lNames[2]
+
+def test_flush_context():
+	"""Flush Context
+
+	Reads sent on the executor keep the context of the thread that sent the
+	batch, including its deadline
+	"""
+	def send(service, reads):
+		return [ ( current_thread().name, deadline.current() ) for t in reads ]
+
+	with ThreadPoolExecutor(2, thread_name_prefix = 'pool') as oPool:
+		with deadline.within(30):
+			fUntil = deadline.current()
+			with Batch(send, oPool, 'pool') as oBatch:
+				oA = oBatch.read('one', 'a')
+				oB = oBatch.read('two', 'b')
+	for o in [ oA, oB ]:
+		assert o.result()[0].startswith('pool')
+		assert o.result()[1] == fUntil
+
+def test_list(services, upstream):
+	"""List
+
+	Reads with the same session and meta are sent as one request, in chunks
+	no bigger than the service allows, and each gets its own Response
+	"""
+	lCalls = _service(services, upstream, batch = { 'size': 2 })
+	with external.batch() as oBatch:
+		lFutures = [
+			oBatch.read('remote', 'thing', { 'data': { 'id': i } })
+			for i in range(3)
+		]
+		oMissing = oBatch.read('remote', 'missing')
+	assert [ o.result().data for o in lFutures ] == [
+		[ 'thing', { 'id': i } ] for i in range(3)
+	]
+	assert oMissing.result().error['code'] == errors.DB_NO_RECORD
+	assert [ t[0] for t in lCalls ] == [ '__list', '__list' ]
+	assert sum([ len(t[1]) for t in lCalls ]) == 4
+
+def test_meta(services, upstream):
+	"""Meta
+
+	Reads with different meta are never sent together
+	"""
+	lCalls = _service(services, upstream)
+	with external.batch() as oBatch:
+		oEn = oBatch.read('remote', 'thing', { 'meta': { 'Locale': 'en' } })
+		oFr = oBatch.read('remote', 'thing', { 'meta': { 'Locale': 'fr' } })
+	assert oEn.result().data == oFr.result().data == [ 'thing', None ]
+	assert lCalls == [ ( 'thing', None ), ( 'thing', None ) ]
+
+def test_identical(services, upstream):
+	"""Identical
+
+	Identical reads in a batch are only sent once, and each gets its own
+	copy, unless the service doesn't coalesce reads
+	"""
+	lCalls = _service(services, upstream)
+	with external.batch() as oBatch:
+		lFutures = [
+			oBatch.read('remote', 'thing', { 'data': { 'id': 1 } })
+			for i in range(3)
+		] + [ oBatch.read('remote', 'other') ]
+	lResponses = [ o.result() for o in lFutures ]
+	assert [ o.data for o in lResponses[:3] ] == \
+		[ [ 'thing', { 'id': 1 } ] ] * 3
+	assert len(set([ id(o) for o in lResponses ])) == 4
+	assert lCalls == [ ( '__list', [ [ 'thing', { 'id': 1 } ], 'other' ] ) ]
+
+	# Without coalescing, each is sent
+	lCalls = _service(services, upstream, coalesce = False)
+	with external.batch() as oBatch:
+		for i in range(2):
+			oBatch.read('remote', 'thing', { 'data': { 'id': 1 } })
+	assert lCalls == [ ( '__list', [ [ 'thing', { 'id': 1 } ] ] * 2 ) ]
+
+def test_cached(services, upstream):
+	"""Cached
+
+	Reads of cached paths in a batch come from the cache, only the rest are
+	sent, and what's sent is stored in the cache
+	"""
+	lCalls = _service(
+		services, upstream, cache = { 'paths': { 'thing': 60 } }
+	)
+
+	# Read one directly, so it's cached
+	assert external.read('remote', 'thing', { 'data': { 'id': 1 } }).data == \
+		[ 'thing', { 'id': 1 } ]
+	assert len(lCalls) == 1
+
+	# The same read in a batch comes from the cache, the others are sent
+	with external.batch() as oBatch:
+		oCached = oBatch.read('remote', 'thing', { 'data': { 'id': 1 } })
+		oTwo = oBatch.read('remote', 'thing', { 'data': { 'id': 2 } })
+		oThree = oBatch.read('remote', 'thing', { 'data': { 'id': 3 } })
+	assert oCached.result().data == [ 'thing', { 'id': 1 } ]
+	assert oTwo.result().data == [ 'thing', { 'id': 2 } ]
+	assert oThree.result().data == [ 'thing', { 'id': 3 } ]
+	assert lCalls[1] == ( '__list', [
+		[ 'thing', { 'id': 2 } ], [ 'thing', { 'id': 3 } ]
+	] )
+
+	# The reads that were sent are now cached as well
+	assert external.read('remote', 'thing', { 'data': { 'id': 3 } }).data == \
+		[ 'thing', { 'id': 3 } ]
+	with external.batch() as oBatch:
+		oTwo = oBatch.read('remote', 'thing', { 'data': { 'id': 2 } })
+	assert oTwo.result().data == [ 'thing', { 'id': 2 } ]
+	assert len(lCalls) == 2
+
+def test_fallback(services, upstream):
+	"""Fallback
+
+	If the service has no list path, the reads are sent one at a time
+	"""
+	lCalls = []
+	def handler(environ):
+		lCalls.append(environ['PATH_INFO'])
+		if environ['PATH_INFO'] == '/__list':
+			return ( 404, { 'error': 'not found' } )
+		return ( 200, { 'data': environ['PATH_INFO'] } )
+	services({ 'remote': { 'port': upstream(handler) } })
+	with external.batch() as oBatch:
+		oA = oBatch.read('remote', 'a')
+		oB = oBatch.read('remote', 'b')
+	assert oA.result().data == '/a'
+	assert oB.result().data == '/b'
+	assert lCalls == [ '/__list', '/a', '/b' ]
+
+def test_deadline(services, upstream):
+	"""Deadline
+
+	Reads whose deadline has already passed aren't sent
+	"""
+	lCalls = _service(services, upstream)
+	with external.batch() as oBatch:
+		oLate = oBatch.read('remote', 'thing', {
+			'meta': { deadline.META: time() - 1 }
+		})
+		oOnTime = oBatch.read('remote', 'thing', { 'timeout': 5 })
+	assert oLate.result().error['code'] == errors.SERVICE_TIMEOUT
+	assert oOnTime.result().data == [ 'thing', None ]
+	assert lCalls == [ ( 'thing', None ) ]
+
+def test_window(services, upstream):
+	"""Window
+
+	Reads made at the same time to a service with a window are sent together
+	without using batch()
+	"""
+	lCalls = _service(services, upstream, batch = { 'window': 0.05 })
+	with ThreadPoolExecutor(3) as oPool:
+		lResponses = list(oPool.map(
+			lambda i: external.read('remote', 'thing', { 'data': { 'id': i } }),
+			range(3)
+		))
+	assert [ o.data for o in lResponses ] == [
+		[ 'thing', { 'id': i } ] for i in range(3)
+	]
+	assert len(lCalls) == 1
+	assert lCalls[0][0] == '__list'
+	assert external.batch_stats('remote') == { 'calls': 1, 'items': 3 }
+
+def test_list_errors(services, rest):
+	"""List Errors
+
+	A read that raises doesn't fail the other reads sent with it, even if
+	the service aborts __list requests, and nothing is sent twice
+	"""
+	services({ 'items': {} })
+	oItems = Items()
+	sURL = rest([ oItems ], list_errors = 'abort')
+	services({ 'items': {}, 'remote': {
+		'port': int(sURL.rsplit(':', 1)[1])
+	} })
+	with external.batch() as oBatch:
+		oOne = oBatch.read('remote', 'item', { 'data': { 'id': 1 } })
+		oRaised = oBatch.read('remote', 'raised', { 'data': { 'id': 2 } })
+		oThree = oBatch.read('remote', 'item', { 'data': { 'id': 3 } })
+	assert oOne.result().data == 1
+	assert oRaised.result().error['code'] == errors.DB_NO_RECORD
+	assert oThree.result().data == 3
+	assert oItems.calls == 3
+
+def test_list_failing(services, upstream):
+	"""List Failing
+
+	If the service fails the entire list, e.g. because it's failing, each
+	read gets the error, and they aren't sent again one at a time
+	"""
+	lCalls = []
+	def handler(environ):
+		lCalls.append(environ['PATH_INFO'])
+		return ( 500, { 'error': 'failing' } )
+	services({ 'remote': {
+		'port': upstream(handler), 'retry': { 'attempts': 1 },
+		'circuit': False
+	} })
+	with external.batch() as oBatch:
+		oA = oBatch.read('remote', 'a')
+		oB = oBatch.read('remote', 'b')
+	assert oA.result().error['code'] == errors.SERVICE_STATUS
+	assert oB.result().error['code'] == errors.SERVICE_STATUS
+	assert oA.result() is not oB.result()
+	assert lCalls == [ '/__list' ]
\ No newline at end of file
@@ -0,0 +1,164 @@
+# coding=utf8
+"""Test Cache
+
+Tests the cache of values that expire, and the caching of reads made to
+external services
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+from time import sleep
+
+# Pip imports
+import pytest
+
+# Local imports
+from body import errors, external
+from body.cache import Cache, canonical
+
+def test_states():
+	"""States
+
+	Values are fresh during their ttl, stale during their stale time, and
+	gone after, unless the expired copy is asked for
+	"""
+	oCache = Cache()
+	oCache.set('key', 'value', 0.05, 0.05)
+	assert oCache.get('key') == ( 'value', Cache.FRESH )
+	sleep(0.06)
+	assert oCache.get('key') == ( 'value', Cache.STALE )
+	sleep(0.05)
+	assert oCache.get('key', True) == ( 'value', Cache.EXPIRED )
+	assert oCache.get('key') == ( None, None )
+	assert len(oCache) == 0
+
+def test_least_recently_used():
+	"""Least Recently Used
+
+	Once the cache is full, the value used the longest ago is removed first
+	"""
+	oCache = Cache(max_entries = 2)
+	oCache.set('a', 'a', 60)
+	oCache.set('b', 'b', 60)
+	oCache.get('a')
+	oCache.set('c', 'c', 60)
+	assert 'a' in oCache
+	assert 'b' not in oCache
+	assert 'c' in oCache
+	assert oCache.stats()['evictions'] == 1
+
+def test_bytes():
+	"""Bytes
+
+	Values are measured in bytes, so text outside of ASCII counts for every
+	byte it takes up, not every character
+	"""
+	assert Cache.size('abc') == 3
+	assert Cache.size('é') == 2
+	assert Cache.size(b'\xc3\xa9') == 2
+	with pytest.raises(ValueError):
+		Cache.size({ 'a': 1 })
+
+	# Two 4 character values fit in 16 bytes, but not once encoded
+	oCache = Cache(16)
+	oCache.set('a', 'éééé', 60)
+	oCache.set('b', 'éééé', 60)
+	assert oCache.stats()['bytes'] == 16
+	oCache.set('c', 'é', 60)
+	assert oCache.stats()['bytes'] <= 16
+	assert 'a' not in oCache
+
+	# A value bigger than the cache is never stored
+	oCache.set('d', 'é' * 9, 60)
+	assert 'd' not in oCache
+
+def test_clear():
+	"""Clear
+
+	Clearing by prefix only removes the matching keys, and their size
+	"""
+	oCache = Cache()
+	oCache.set('service\na', 'aa', 60)
+	oCache.set('service\nb', 'bb', 60)
+	oCache.set('other\na', 'cc', 60)
+	oCache.clear('service\n')
+	assert len(oCache) == 1
+	assert oCache.stats()['bytes'] == 2
+
+def test_canonical():
+	"""Canonical
+
+	Equal values generate the same canonical value, whatever the order of
+	their keys
+	"""
+	assert canonical({ 'b': 1, 'a': [ { 'd': 2, 'c': 3 } ] }) == \
+		canonical({ 'a': [ { 'c': 3, 'd': 2 } ], 'b': 1 })
+
+def test_external_read(services, upstream):
+	"""External Read
+
+	Reads of a cached path are only sent once while they're fresh, different
+	data gets its own copy, and errors aren't stored
+	"""
+
+	# Count the requests, and fail any for the missing path
+	lCalls = []
+	def handler(environ):
+		lCalls.append(environ['PATH_INFO'])
+		if environ['PATH_INFO'] == '/missing':
+			return ( 200, { 'error': { 'code': errors.DB_NO_RECORD } } )
+		return ( 200, { 'data': len(lCalls) } )
+	iPort = upstream(handler)
+	services({ 'remote': {
+		'port': iPort,
+		'cache': { 'paths': { 'thing': 60, 'missing': 60 } }
+	} })
+
+	# The second read comes from the cache
+	assert external.read('remote', 'thing', { 'data': { 'a': 1 } }).data == 1
+	assert external.read('remote', 'thing', { 'data': { 'a': 1 } }).data == 1
+	assert lCalls == [ '/thing' ]
+
+	# Different data is a different read
+	assert external.read('remote', 'thing', { 'data': { 'a': 2 } }).data == 2
+
+	# Errors are never cached
+	for i in range(2):
+		oResponse = external.read('remote', 'missing')
+		assert oResponse.error['code'] == errors.DB_NO_RECORD
+	assert lCalls.count('/missing') == 2
+
+	# Clearing the cache sends the read again
+	external.cache_clear('remote')
+	assert external.read('remote', 'thing', { 'data': { 'a': 1 } }).data == 5
+
+def test_expired_removed(services, upstream):
+	"""Expired Removed
+
+	An expired read without an ETag to revalidate it with is removed, even
+	if fetching it again fails
+	"""
+	lStatus = [ 200 ]
+	def handler(environ):
+		if lStatus[0] != 200:
+			return ( lStatus[0], { 'error': 'unavailable' } )
+		return ( 200, { 'data': 'value' } )
+	services({ 'remote': {
+		'port': upstream(handler),
+		'cache': { 'paths': { 'thing': 0.05 } }
+	} })
+	assert external.read('remote', 'thing').data == 'value'
+	assert external.cache_stats()['entries'] == 1
+
+	# Once it's expired, and the service is failing, it's gone
+	sleep(0.06)
+	lStatus[0] = 500
+	assert external.read('remote', 'thing').error['code'] == \
+		errors.SERVICE_STATUS
+	assert external.cache_stats()['entries'] == 0
+	assert external.cache_stats()['bytes'] == 0
\ No newline at end of file
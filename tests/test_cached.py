@@ -0,0 +1,103 @@
+# coding=utf8
+"""Test Cached
+
+Tests caching the Responses of reads in the process running the service, and
+removing them when the noun is written to, or the service is reset
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Local imports
+from body import cached, errors, Error, Response, Service
+
+class Prices(Service):
+	"""Prices
+
+	Service with cached reads that count how many times they really ran
+	"""
+
+	def reset(self):
+		self.price = 1
+		self.reads = 0
+
+	@cached.cached(60)
+	def price_read(self, req):
+		self.reads += 1
+		return Response(self.price)
+
+	def price_update(self, req):
+		self.price = req['data']
+		return Response(True)
+
+	def price_delete(self, req):
+		return Error(errors.DB_NO_RECORD)
+
+	@cached.cached(60)
+	def during_read(self, req):
+		self.reads += 1
+		cached.clear(*req['data'])
+		return Response(self.reads)
+
+def test_write(services):
+	"""Write
+
+	Reads are cached until a write to the same noun succeeds
+	"""
+	services({ 'prices': {} })
+	oPrices = Prices()
+	assert oPrices.price_read({}).data == 1
+	assert oPrices.price_read({}).data == 1
+	assert oPrices.reads == 1
+
+	# A failed write leaves the cache alone
+	assert oPrices.price_delete({}).error['code'] == errors.DB_NO_RECORD
+	assert oPrices.price_read({}).data == 1
+	assert oPrices.reads == 1
+
+	# A successful one removes it
+	assert oPrices.price_update({ 'data': 2 }).data is True
+	assert oPrices.price_read({}).data == 2
+	assert oPrices.reads == 2
+
+def test_reset(services):
+	"""Reset
+
+	Resetting the service removes its cached reads
+	"""
+	services({ 'prices': {} })
+	oPrices = Prices()
+	oPrices.price_read({})
+	oPrices.price = 3
+	oPrices.reset()
+	oPrices.price = 4
+	assert oPrices.price_read({}).data == 4
+	assert oPrices.reads == 1
+
+def test_clear(services):
+	"""Clear
+
+	Clearing everything, the service, or the noun removes the cached reads,
+	and a read that was running while it happened isn't stored
+	"""
+	services({ 'prices': {} })
+	oPrices = Prices()
+	for i in range(2):
+		oPrices.price_read({})
+	assert oPrices.reads == 1
+	cached.clear()
+	oPrices.price_read({})
+	assert oPrices.reads == 2
+	cached.clear('prices')
+	oPrices.price_read({})
+	assert oPrices.reads == 3
+
+	# Nothing is stored for reads that had a clear happen while they ran
+	for l in [ [], [ 'prices' ], [ 'prices', 'during' ] ]:
+		iReads = oPrices.reads
+		assert oPrices.during_read({ 'data': l }).data == iReads + 1
+		assert oPrices.during_read({ 'data': l }).data == iReads + 2
+	assert ( None, None ) not in getattr(cached, '__generations')
\ No newline at end of file
@@ -0,0 +1,223 @@
+# coding=utf8
+"""Test Circuit
+
+Tests the circuit breaker, and the retries and circuit breaking of requests
+made to external services
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+import socket
+from time import sleep
+
+# Pip imports
+import pytest
+import requests
+
+# Local imports
+from body import errors, external
+from body.circuit import Circuit
+
+def _free_port() -> int:
+	"""Free Port
+
+	Returns a port nothing is listening on
+
+	Returns:
+		uint
+	"""
+	with socket.socket() as oSocket:
+		oSocket.bind(( '127.0.0.1', 0 ))
+		return oSocket.getsockname()[1]
+
+def test_settings():
+	"""Settings
+
+	Invalid settings are rejected with the name of the setting
+	"""
+	for dArgs, sName in [
+		( { 'threshold': 0 }, 'threshold' ),
+		( { 'threshold': 1.5 }, 'threshold' ),
+		( { 'minimum': 0 }, 'minimum' ),
+		( { 'window': 'a' }, 'window' ),
+		( { 'cooldown': -1 }, 'cooldown' )
+	]:
+		with pytest.raises(ValueError) as e:
+			Circuit(**dArgs)
+		assert e.value.args[0] == sName
+
+def test_opens():
+	"""Opens
+
+	The circuit stays closed until there are enough requests, then opens on
+	the failure that crosses the threshold
+	"""
+	oCircuit = Circuit(threshold = 0.5, minimum = 4, cooldown = 60)
+	oCircuit.success()
+	oCircuit.failure()
+	oCircuit.failure()
+	assert oCircuit.state == Circuit.CLOSED
+	assert oCircuit.allow()
+	oCircuit.success()
+	assert oCircuit.state == Circuit.CLOSED
+	oCircuit.failure()
+	assert oCircuit.state == Circuit.OPEN
+	assert not oCircuit.allow()
+	assert oCircuit.stats()['rejected'] == 1
+	assert oCircuit.stats()['trips'] == 1
+
+def test_probes():
+	"""Probes
+
+	After the cooldown only the probes are allowed, a failed probe opens the
+	circuit again, and a successful one closes it
+	"""
+	oCircuit = Circuit(minimum = 1, cooldown = 0.05, probes = 1)
+	oCircuit.failure()
+	assert not oCircuit.allow()
+	sleep(0.06)
+
+	# A single probe is let through, and fails
+	assert oCircuit.allow()
+	assert oCircuit.state == Circuit.HALF_OPEN
+	assert not oCircuit.allow()
+	oCircuit.failure()
+	assert oCircuit.state == Circuit.OPEN
+	assert not oCircuit.allow()
+	sleep(0.06)
+
+	# The next probe succeeds, and the old failures are forgotten
+	assert oCircuit.allow()
+	oCircuit.success()
+	assert oCircuit.state == Circuit.CLOSED
+	assert oCircuit.stats()['failures'] == 0
+
+def test_retry_statuses(services, upstream):
+	"""Retry Statuses
+
+	Requests that get a status that can be retried are sent again, up to the
+	number of attempts
+	"""
+	lCalls = []
+	def handler(environ):
+		lCalls.append(environ['PATH_INFO'])
+		if environ['PATH_INFO'] == '/down' or len(lCalls) < 3:
+			return ( 503, { 'error': 'unavailable' } )
+		return ( 200, { 'data': len(lCalls) } )
+	services({ 'remote': {
+		'port': upstream(handler),
+		'coalesce': False,
+		'retry': { 'statuses': [ 503 ], 'backoff': 0.01 },
+		'circuit': False
+	} })
+
+	# The third attempt works
+	assert external.read('remote', 'up').data == 3
+
+	# If every attempt fails, the last status is returned
+	del lCalls[:]
+	oResponse = external.read('remote', 'down')
+	assert oResponse.error['code'] == errors.SERVICE_STATUS
+	assert oResponse.error['msg'].startswith('503')
+	assert lCalls == [ '/down' ] * 3
+
+def test_retry_actions(services, upstream):
+	"""Retry Actions
+
+	Actions that aren't in the policy are never sent twice
+	"""
+	lCalls = []
+	def handler(environ):
+		lCalls.append(environ['REQUEST_METHOD'])
+		return ( 503, { 'error': 'unavailable' } )
+	services({ 'remote': {
+		'port': upstream(handler),
+		'retry': {
+			'actions': [ 'read' ], 'statuses': [ 503 ], 'backoff': 0.01
+		},
+		'circuit': False
+	} })
+	oResponse = external.create('remote', 'thing', { 'data': { 'a': 1 } })
+	assert oResponse.error['code'] == errors.SERVICE_STATUS
+	assert lCalls == [ 'POST' ]
+
+def test_circuit_opens(services):
+	"""Circuit Opens
+
+	Once enough requests to a service fail, the circuit opens and requests
+	fail immediately without being sent, until the service is probed again
+	"""
+	services({ 'dead': {
+		'port': _free_port(),
+		'retry': { 'attempts': 1 },
+		'circuit': { 'minimum': 3, 'cooldown': 0.1 }
+	} })
+
+	# The first requests are sent, and fail
+	for i in range(3):
+		oResponse = external.read('dead', 'thing')
+		assert oResponse.error['code'] == errors.SERVICE_UNREACHABLE
+		assert 'circuit open' not in oResponse.error['msg']
+	assert external.circuit_stats('dead')['state'] == Circuit.OPEN
+
+	# Then they aren't sent at all
+	oResponse = external.read('dead', 'thing')
+	assert oResponse.error['code'] == errors.SERVICE_UNREACHABLE
+	assert oResponse.error['msg'] == 'dead: circuit open'
+	assert external.circuit_stats('dead')['rejected'] == 1
+
+	# After the cooldown, the probe is sent, and fails, opening it again
+	sleep(0.12)
+	oResponse = external.read('dead', 'thing')
+	assert 'circuit open' not in oResponse.error['msg']
+	assert external.circuit_stats('dead')['state'] == Circuit.OPEN
+	assert external.circuit_stats('dead')['trips'] == 2
+
+def test_circuit_invalid(services):
+	"""Circuit Invalid
+
+	Invalid circuit settings are reported with the full config path
+	"""
+	with pytest.raises(ValueError) as e:
+		services({ 'remote': { 'circuit': { 'threshold': 2 } } })
+	assert e.value.args[0] == \
+		'config.body.rest.services.remote.circuit.threshold'
+def test_circuit_raises(services, serve):
+	"""Circuit Raises
+
+	A request that fails with anything other than a connection error or a
+	timeout still counts as a failure, so a probe that fails that way doesn't
+	keep the circuit from ever closing again
+	"""
+	lBroken = [ True ]
+	def app(environ, start_response):
+		start_response('200 OK', [
+			( 'Content-Type', 'application/json; charset=utf-8' ),
+			( 'Content-Encoding', lBroken[0] and 'gzip' or 'identity' )
+		])
+		return [ b'{"data": true}' ]
+	services({ 'remote': {
+		'port': serve(app),
+		'retry': { 'attempts': 1 },
+		'circuit': { 'minimum': 1, 'cooldown': 0.05 }
+	} })
+	with pytest.raises(requests.exceptions.ContentDecodingError):
+		external.read('remote', 'thing')
+	assert external.circuit_stats('remote')['state'] == Circuit.OPEN
+
+	# The probe fails the same way, and opens it again
+	sleep(0.06)
+	with pytest.raises(requests.exceptions.ContentDecodingError):
+		external.read('remote', 'thing')
+	assert external.circuit_stats('remote')['state'] == Circuit.OPEN
+
+	# Once the service is fixed, the next probe closes it
+	lBroken[0] = False
+	sleep(0.06)
+	assert external.read('remote', 'thing').data is True
+	assert external.circuit_stats('remote')['state'] == Circuit.CLOSED
\ No newline at end of file
@@ -0,0 +1,188 @@
+# coding=utf8
+"""Test Coalesce
+
+Tests that identical calls in progress at the same time are only made once,
+and that calls that differ in any way aren't
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep, time
+
+# Pip imports
+import pytest
+
+# Local imports
+from body import errors, external
+from body.flight import Flight
+
+def test_shared():
+	"""Shared
+
+	Calls with the same key made while the first is in progress wait for it
+	and get its result
+	"""
+	oFlight = Flight()
+	oStarted = Event()
+	oRelease = Event()
+	lCalls = []
+	def func(value):
+		lCalls.append(value)
+		oStarted.set()
+		oRelease.wait(5)
+		return value
+
+	with ThreadPoolExecutor(4) as oPool:
+		oLeader = oPool.submit(oFlight.run, 'key', func, 1)
+		oStarted.wait(5)
+		lFollowers = [
+			oPool.submit(oFlight.run, 'key', func, 2) for i in range(3)
+		]
+		sleep(0.05)
+		oRelease.set()
+		assert oLeader.result() == ( 1, False )
+		assert [ o.result() for o in lFollowers ] == [ ( 1, True ) ] * 3
+
+	assert lCalls == [ 1 ]
+	assert oFlight.stats() == { 'coalesced': 3, 'in_flight': 0, 'runs': 1 }
+
+def test_error():
+	"""Error
+
+	If the call raises an exception, everyone waiting on it gets it
+	"""
+	oFlight = Flight()
+	oStarted = Event()
+	def func():
+		oStarted.set()
+		sleep(0.1)
+		raise RuntimeError('failed')
+
+	with ThreadPoolExecutor(2) as oPool:
+		oLeader = oPool.submit(oFlight.run, 'key', func)
+		oStarted.wait(5)
+		oFollower = oPool.submit(oFlight.run, 'key', func)
+		for o in [ oLeader, oFollower ]:
+			with pytest.raises(RuntimeError):
+				o.result()
+
+def test_follower_deadline():
+	"""Follower Deadline
+
+	A call waiting on another stops waiting at its own deadline, and the call
+	it was waiting on still finishes
+	"""
+	oFlight = Flight()
+	oStarted = Event()
+	def func():
+		oStarted.set()
+		sleep(0.3)
+		return 'done'
+
+	with ThreadPoolExecutor(2) as oPool:
+		oLeader = oPool.submit(oFlight.run, 'key', func)
+		oStarted.wait(5)
+		fStart = time()
+		with pytest.raises(TimeoutError):
+			oFlight.run('key', func, until = time() + 0.05)
+		assert time() - fStart < 0.2
+		assert oLeader.result() == ( 'done', False )
+
+def _locale(services: callable, upstream: callable) -> list:
+	"""Locale
+
+	Serves a slow service that returns the locale it was sent in the meta,
+	and returns the list of locales it received
+
+	Arguments:
+		services (callable): The services fixture
+		upstream (callable): The upstream fixture
+
+	Returns:
+		list
+	"""
+	lCalls = []
+	def handler(environ):
+		lCalls.append(environ.get('HTTP_X_BODY_LOCALE'))
+		sleep(0.2)
+		return ( 200, { 'data': environ.get('HTTP_X_BODY_LOCALE') } )
+	services({ 'remote': { 'port': upstream(handler) } })
+	return lCalls
+
+def test_same_reads(services, upstream):
+	"""Same Reads
+
+	Identical reads made at the same time are sent once, and every caller
+	gets its own copy of the Response
+	"""
+	lCalls = _locale(services, upstream)
+	dReq = { 'data': { 'id': 1 }, 'meta': { 'Locale': 'en' } }
+	with ThreadPoolExecutor(4) as oPool:
+		lResponses = list(oPool.map(
+			lambda i: external.read('remote', 'thing', dReq), range(4)
+		))
+	assert lCalls == [ 'en' ]
+	assert [ o.data for o in lResponses ] == [ 'en' ] * 4
+	assert len(set([ id(o) for o in lResponses ])) == 4
+
+def test_meta_distinct(services, upstream):
+	"""Meta Distinct
+
+	Reads made at the same time that only differ in their meta are not
+	coalesced, each caller gets the Response to its own read
+	"""
+	lCalls = _locale(services, upstream)
+	with ThreadPoolExecutor(2) as oPool:
+		oEn = oPool.submit(external.read, 'remote', 'thing', {
+			'data': { 'id': 1 }, 'meta': { 'Locale': 'en' }
+		})
+		oFr = oPool.submit(external.read, 'remote', 'thing', {
+			'data': { 'id': 1 }, 'meta': { 'Locale': 'fr' }
+		})
+		assert oEn.result().data == 'en'
+		assert oFr.result().data == 'fr'
+	assert sorted(lCalls) == [ 'en', 'fr' ]
+
+def test_deadline_ignored(services, upstream):
+	"""Deadline Ignored
+
+	Reads with different deadlines are still identical
+	"""
+	lCalls = _locale(services, upstream)
+	with ThreadPoolExecutor(2) as oPool:
+		lFutures = [
+			oPool.submit(external.read, 'remote', 'thing', {
+				'meta': { 'Locale': 'en' }, 'timeout': f
+			}) for f in [ 5, 10 ]
+		]
+		assert [ o.result().data for o in lFutures ] == [ 'en', 'en' ]
+	assert lCalls == [ 'en' ]
+
+def test_follower_timeout(services, upstream):
+	"""Follower Timeout
+
+	A read waiting on an identical one gets a timeout error once its own
+	deadline passes, while the read it waited on still succeeds
+	"""
+	lCalls = _locale(services, upstream)
+	with ThreadPoolExecutor(1) as oPool:
+		oLeader = oPool.submit(external.read, 'remote', 'thing', {
+			'meta': { 'Locale': 'en' }
+		})
+		sleep(0.05)
+		fStart = time()
+		oResponse = external.read('remote', 'thing', {
+			'meta': { 'Locale': 'en' }, 'timeout': 0.05
+		})
+		assert time() - fStart < 0.15
+		assert oResponse.error['code'] == errors.SERVICE_TIMEOUT
+		assert oLeader.result().data == 'en'
+	assert lCalls == [ 'en' ]
+	assert external.coalesce_stats()['coalesced'] == 1
\ No newline at end of file
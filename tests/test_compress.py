@@ -0,0 +1,195 @@
+# coding=utf8
+"""Test Compress
+
+Tests the codecs used to compress bodies, and compressing the requests and
+responses of services
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+import gzip
+import json
+import zlib
+
+# Pip imports
+import pytest
+import requests
+
+# Local imports
+from body import compress, errors, external, Response, Service
+from body.rest import REST
+
+class Echo(Service):
+	"""Echo
+
+	Service that returns what it was sent
+	"""
+
+	def reset(self):
+		pass
+
+	def echo_create(self, req):
+		return Response(req.data)
+
+def _post(url: str, data: any, **headers) -> requests.Response:
+	"""Post
+
+	Sends the data as JSON to the echo noun, and returns the response
+
+	Arguments:
+		url (str): The URL of the REST instance
+		data (any): The data to send
+		**headers (dict): Any other headers to send
+
+	Returns:
+		requests.Response
+	"""
+	if not isinstance(data, bytes):
+		data = json.dumps(data).encode()
+	return requests.post(
+		'%s/echo' % url,
+		data = data,
+		headers = {
+			'Content-Type': 'application/json; charset=utf-8',
+			**{ k.replace('_', '-'): v for k,v in headers.items() }
+		},
+		timeout = 10
+	)
+
+def test_negotiate():
+	"""Negotiate
+
+	The codec with the highest quality is chosen, ties go to gzip, and
+	nothing is chosen if the client doesn't accept any
+	"""
+	assert compress.negotiate('gzip, deflate') == 'gzip'
+	assert compress.negotiate('deflate, gzip') == 'gzip'
+	assert compress.negotiate('gzip;q=0.5, deflate') == 'deflate'
+	assert compress.negotiate('*') == 'gzip'
+	assert compress.negotiate('*, gzip;q=0') == 'deflate'
+	assert compress.negotiate('br, identity') is None
+	assert compress.negotiate('gzip;q=x') is None
+	assert compress.negotiate(None) is None
+
+def test_codecs():
+	"""Codecs
+
+	Data comes back out the same, decompressing stops at the limit, and
+	invalid data and unknown codecs fail
+	"""
+	bData = b'abc' * 1000
+	for s in [ 'gzip', 'deflate' ]:
+		assert compress.decompress(s, compress.compress(s, bData)) == bData
+	assert compress.decompress('GZIP', gzip.compress(bData)) == bData
+	assert compress.decompress('deflate', zlib.compress(bData)) == bData
+	with pytest.raises(ValueError):
+		compress.decompress('gzip', gzip.compress(bData), 100)
+	with pytest.raises(ValueError):
+		compress.decompress('gzip', b'not gzip')
+	with pytest.raises(KeyError):
+		compress.compress('br', bData)
+
+def test_positional(services, serve):
+	"""Positional
+
+	REST can still be created with the CORS domains as the second argument,
+	and responses aren't compressed unless asked for
+	"""
+	services({ 'echo': {} })
+	sURL = 'http://127.0.0.1:%d' % serve(REST(
+		[ Echo() ], [ 'example.com' ], True, None, False
+	))
+	oRes = _post(sURL, 'a' * 2000,
+		Origin = 'https://www.example.com',
+		Accept_Encoding = 'gzip'
+	)
+	assert oRes.headers['Access-Control-Allow-Origin'] == \
+		'https://www.example.com'
+	assert 'Content-Encoding' not in oRes.headers
+	assert oRes.json() == { 'data': 'a' * 2000 }
+
+def test_responses(services, rest):
+	"""Responses
+
+	Responses big enough are compressed with the codec the client prefers,
+	smaller ones, and those to clients that don't accept any, are not
+	"""
+	services({ 'echo': {} })
+	sURL = rest([ Echo() ], compress = 1024)
+
+	oRes = _post(sURL, 'a' * 2000, Accept_Encoding = 'gzip, deflate')
+	assert oRes.headers['Content-Encoding'] == 'gzip'
+	assert 'Accept-Encoding' in oRes.headers['Vary']
+	assert oRes.json() == { 'data': 'a' * 2000 }
+
+	oRes = _post(sURL, 'a' * 2000, Accept_Encoding = 'deflate')
+	assert oRes.headers['Content-Encoding'] == 'deflate'
+	assert oRes.json() == { 'data': 'a' * 2000 }
+
+	oRes = _post(sURL, 'a', Accept_Encoding = 'gzip')
+	assert 'Content-Encoding' not in oRes.headers
+
+	oRes = _post(sURL, 'a' * 2000, Accept_Encoding = 'identity')
+	assert 'Content-Encoding' not in oRes.headers
+
+def test_requests(services, rest):
+	"""Requests
+
+	Compressed request bodies are always accepted, and those that can't be
+	decompressed are refused
+	"""
+	services({ 'echo': {} })
+	sURL = rest([ Echo() ])
+	bData = json.dumps({ 'a': 'b' * 2000 }).encode()
+
+	oRes = _post(sURL, gzip.compress(bData), Content_Encoding = 'gzip')
+	assert oRes.json() == { 'data': { 'a': 'b' * 2000 } }
+	oRes = _post(sURL, zlib.compress(bData), Content_Encoding = 'deflate')
+	assert oRes.json() == { 'data': { 'a': 'b' * 2000 } }
+
+	dRes = _post(sURL, bData, Content_Encoding = 'br').json()
+	assert dRes['error'] == {
+		'code': errors.REST_REQUEST_DATA,
+		'msg': 'Content-Encoding br not supported'
+	}
+	dRes = _post(sURL, bData, Content_Encoding = 'gzip').json()
+	assert dRes['error']['code'] == errors.REST_REQUEST_DATA
+
+def test_external(services, upstream):
+	"""External
+
+	Data sent to a service is compressed once it's big enough, and the
+	settings are validated
+	"""
+	lCalls = []
+	def handler(environ):
+		bData = environ['wsgi.input'].read(int(environ['CONTENT_LENGTH']))
+		sEncoding = environ.get('HTTP_CONTENT_ENCODING')
+		lCalls.append(sEncoding)
+		if sEncoding:
+			bData = compress.decompress(sEncoding, bData)
+		return ( 200, { 'data': len(json.loads(bData)) } )
+	services({ 'remote': {
+		'port': upstream(handler),
+		'compress': { 'threshold': 100, 'codec': 'deflate' }
+	} })
+
+	assert external.create('remote', 'thing', { 'data': 'a' }).data == 1
+	assert external.create('remote', 'thing', { 'data': 'a' * 200 }).data == \
+		200
+	assert lCalls == [ None, 'deflate' ]
+
+	# Invalid settings are reported with the full config path
+	with pytest.raises(ValueError) as e:
+		services({ 'remote': { 'compress': { 'codec': 'br' } } })
+	assert e.value.args[0] == \
+		'config.body.rest.services.remote.compress.codec'
+	with pytest.raises(ValueError) as e:
+		services({ 'remote': { 'compress': { 'size': 1 } } })
+	assert e.value.args[0] == \
+		'config.body.rest.services.remote.compress.size'
\ No newline at end of file
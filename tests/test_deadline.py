@@ -0,0 +1,179 @@
+# coding=utf8
+"""Test Deadline
+
+Tests deadlines, and passing them on from service to service
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+from io import BytesIO
+from time import sleep, time
+from wsgiref.util import setup_testing_defaults
+
+# Pip imports
+import requests
+
+# Local imports
+from body import deadline, errors, external, Response, Service
+from body.rest import _Route, REST
+
+class Relay(Service):
+	"""Relay
+
+	Service that passes reads on to another service, or crashes
+	"""
+
+	def reset(self):
+		pass
+
+	def relay_read(self, req):
+		return Response([
+			deadline.current(),
+			external.read('remote', 'thing').data
+		])
+
+	def crash_read(self, req):
+		raise RuntimeError('crashed')
+
+def _upstream(services: callable, upstream: callable) -> None:
+	"""Upstream
+
+	Serves the remote service, which returns the deadline it was sent, as
+	it was sent
+
+	Arguments:
+		services (callable): The services fixture
+		upstream (callable): The upstream fixture
+
+	Returns:
+		None
+	"""
+	def handler(environ):
+		return ( 200, {
+			'data': environ.get('HTTP_X_BODY_%s' % deadline.META.upper())
+		} )
+	services({ 'relay': {}, 'remote': { 'port': upstream(handler) } })
+
+def _get(url: str, path: str, until: float | str | None = None) -> dict:
+	"""Get
+
+	Makes a read, with a deadline if one is passed, and returns the decoded
+	body
+
+	Arguments:
+		url (str): The URL of the REST instance
+		path (str): The path of the read
+		until (float): Optional, the deadline
+
+	Returns:
+		dict
+	"""
+	dHeaders = { 'Content-Type': 'application/json; charset=utf-8' }
+	if until is not None:
+		dHeaders['X-Body-%s' % deadline.META] = str(until)
+	return requests.get(
+		'%s/%s' % ( url, path ), data = 'null', headers = dHeaders,
+		timeout = 10
+	).json()
+
+def test_push_pop():
+	"""Push Pop
+
+	A deadline can only get earlier, and popping restores the previous one
+	"""
+	assert deadline.current() is None
+	assert deadline.remaining() is None
+	assert not deadline.expired()
+	fUntil = time() + 60
+	oOuter = deadline.push(fUntil)
+	oLater = deadline.push(fUntil + 60)
+	assert deadline.current() == fUntil
+	deadline.pop(oLater)
+	with deadline.within(0.01):
+		assert deadline.current() < fUntil
+		sleep(0.02)
+		assert deadline.expired()
+		assert deadline.remaining() < 0
+	assert deadline.current() == fUntil
+	deadline.pop(oOuter)
+	assert deadline.current() is None
+
+def test_external(services, upstream):
+	"""External
+
+	The deadline is sent on to other services, the earliest of the current
+	one, the one in the meta, and the timeout, and nothing is sent once
+	it's passed
+	"""
+	_upstream(services, upstream)
+	assert external.read('remote', 'thing').data is None
+	fUntil = time() + 60
+	with deadline.within(30):
+		fCurrent = deadline.current()
+		assert external.read('remote', 'thing', {
+			'meta': { deadline.META: fUntil }
+		}).data == '%.3f' % fCurrent
+		assert float(external.read('remote', 'thing', {
+			'timeout': 5
+		}).data) < fCurrent
+	assert external.read('remote', 'thing', {
+		'meta': { deadline.META: fUntil }
+	}).data == '%.3f' % fUntil
+
+	# Once it's passed, the request isn't sent
+	oResponse = external.read('remote', 'thing', {
+		'meta': { deadline.META: time() - 1 }
+	})
+	assert oResponse.error['code'] == errors.SERVICE_TIMEOUT
+
+def test_propagation(services, upstream, rest):
+	"""Propagation
+
+	The deadline a request arrives with is the deadline of the noun, and of
+	every request it makes, and a request that's already too late, or has
+	an invalid deadline, is refused
+	"""
+	_upstream(services, upstream)
+	sURL = rest([ Relay() ])
+	fUntil = round(time() + 60, 3)
+	assert _get(sURL, 'relay', fUntil) == \
+		{ 'data': [ fUntil, '%.3f' % fUntil ] }
+	assert _get(sURL, 'relay') == { 'data': [ None, None ] }
+
+	dRes = _get(sURL, 'relay', time() - 1)
+	assert dRes['error']['code'] == errors.REST_DEADLINE
+	dRes = _get(sURL, 'relay', 'soon')
+	assert dRes['error']['code'] == errors.REST_REQUEST_DATA
+
+def test_crash(services, monkeypatch):
+	"""Crash
+
+	The deadline is removed once the request is done, even if handling the
+	crash of the noun fails, so the next request on the thread doesn't
+	inherit it
+	"""
+	services({ 'relay': {} })
+	monkeypatch.setattr(_Route, '_Route__on_error', None)
+	def on_errors(details):
+		raise RuntimeError('on_errors failed')
+	oApp = REST([ Relay() ], on_errors = on_errors)
+
+	# Call the application in this thread
+	dEnviron = {
+		'REQUEST_METHOD': 'GET',
+		'PATH_INFO': '/crash',
+		'CONTENT_TYPE': 'application/json; charset=utf-8',
+		'CONTENT_LENGTH': '4',
+		'HTTP_X_BODY_%s' % deadline.META.upper(): str(time() + 60),
+		'wsgi.input': BytesIO(b'null')
+	}
+	setup_testing_defaults(dEnviron)
+	lStatus = []
+	b''.join(oApp(dEnviron, lambda s, h, e = None: lStatus.append(s)))
+	assert lStatus[0].startswith('500')
+	assert deadline.current() is None
\ No newline at end of file
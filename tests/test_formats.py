@@ -0,0 +1,99 @@
+# coding=utf8
+"""Test Formats
+
+Tests the formats requests and responses are encoded in, and the backends
+used for JSON
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+from datetime import datetime
+from decimal import Decimal
+
+# Pip imports
+import pytest
+
+# Local imports
+from body import formats
+
+@pytest.fixture
+def backend():
+	"""Backend
+
+	Sets the JSON backend, and puts the original functions back after the
+	test
+	"""
+	fEncode, fDecode = formats.JSON.encode, formats.JSON.decode
+	yield formats.json_backend
+	formats.JSON.encode, formats.JSON.decode = fEncode, fDecode
+
+def test_backend_invalid(backend):
+	"""Backend Invalid
+
+	Unknown backends are rejected, and the current one is kept
+	"""
+	fEncode = formats.JSON.encode
+	with pytest.raises(ValueError) as e:
+		backend('simplejson')
+	assert e.value.args[0] == 'backend'
+	assert formats.JSON.encode is fEncode
+
+def test_same_result(backend):
+	"""Same Result
+
+	Decimal and datetime values are encoded the same by either backend, and
+	values orjson can't handle are encoded by jsonb
+	"""
+	if formats.orjson is None:
+		pytest.skip('orjson is not installed')
+	dValue = {
+		'price': Decimal('1.50'),
+		'at': datetime(2026, 10, 17, 9, 30, 5),
+		1: 'key'
+	}
+	backend('jsonb')
+	bJsonb = formats.JSON.encode(dValue)
+	backend('orjson')
+	bOrjson = formats.JSON.encode(dValue)
+	assert bOrjson == bJsonb.replace(b': ', b':').replace(b', ', b',')
+	assert formats.JSON.decode(bOrjson) == {
+		'price': '1.50',
+		'at': '2026-10-17 09:30:05',
+		'1': 'key'
+	}
+
+	# An int larger than 64 bits is too much for orjson
+	assert formats.JSON.encode({ 'big': 2 ** 70 }) == \
+		b'{"big": 1180591620717411303424}'
+
+def test_not_finite(backend):
+	"""Not Finite
+
+	NaN and Infinity are encoded as null by orjson, unlike jsonb
+	"""
+	if formats.orjson is None:
+		pytest.skip('orjson is not installed')
+	backend('orjson')
+	assert formats.JSON.encode([ float('nan'), float('inf') ]) == \
+		b'[null,null]'
+	backend('jsonb')
+	assert formats.JSON.encode([ float('nan'), float('inf') ]) == \
+		b'[NaN, Infinity]'
+
+def test_decimal(backend):
+	"""Decimal
+
+	orjson only decodes when numbers with decimals can be floats
+	"""
+	if formats.orjson is None:
+		pytest.skip('orjson is not installed')
+	backend('orjson')
+	assert formats.JSON.decode(b'1.5') == Decimal('1.5')
+	backend('orjson', decimal = False)
+	assert formats.JSON.decode(b'1.5') == 1.5
+	assert isinstance(formats.JSON.decode(b'1.5'), float)
\ No newline at end of file
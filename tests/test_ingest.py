@@ -0,0 +1,278 @@
+# coding=utf8
+"""Test Ingest
+
+Tests receiving large request bodies one item at a time
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+import gzip
+from io import BytesIO
+import json
+import zlib
+
+# Pip imports
+import pytest
+import requests
+
+# Local imports
+from body import errors, ingest, Response, ResponseException, Service
+
+class Rows(Service):
+	"""Rows
+
+	Service with nouns that take their data one item at a time
+	"""
+
+	def reset(self):
+		pass
+
+	@ingest.streamed(memory = 1024)
+	def rows_create(self, req):
+		iTotal = 0
+		for d in req.data:
+			iTotal += d['n']
+		return Response([ req.data.count, iTotal ])
+
+	@ingest.streamed(max_bytes = 64)
+	def small_create(self, req):
+		return Response(len(list(req.data)))
+
+def _items(body: bytes, lines: bool = False, encoding: str = None) -> list:
+	"""Items
+
+	Returns every item decoded from the body
+
+	Arguments:
+		body (bytes): The body
+		lines (bool): True if it's newline delimited
+		encoding (str): The Content-Encoding of the body
+
+	Returns:
+		list
+	"""
+	with ingest.Items(BytesIO(body), lines, encoding) as oItems:
+		return list(oItems)
+
+def _error(body: bytes, lines: bool = False) -> tuple:
+	"""Error
+
+	Returns the items decoded before the body failed, and the message of the
+	error
+
+	Arguments:
+		body (bytes): The invalid body
+		lines (bool): True if it's newline delimited
+
+	Returns:
+		tuple
+	"""
+	lItems = []
+	oItems = ingest.Items(BytesIO(body), lines)
+	with pytest.raises(ResponseException) as e:
+		for m in oItems:
+			lItems.append(m)
+	assert e.value.args[0].error['code'] == errors.REST_REQUEST_DATA
+	return ( lItems, e.value.args[0].error['msg'] )
+
+def test_spool():
+	"""Spool
+
+	The body is copied to a file that's returned at its start, as long as it
+	isn't too large, or shorter than it claims to be, and isn't copied again
+	if it already was
+	"""
+	with ingest.spool(BytesIO(b'x' * 100), 100, 100) as oFile:
+		assert oFile.read() == b'x' * 100
+	with ingest.spool(BytesIO(b'x' * 100), None) as oFile:
+		assert len(oFile.read()) == 100
+
+	# Too large, known before or after reading
+	with pytest.raises(ValueError) as e:
+		ingest.spool(BytesIO(b'x' * 100), 100, 99)
+	assert e.value.args == ( 'body', 'larger than 99 bytes' )
+	with pytest.raises(ValueError) as e:
+		ingest.spool(BytesIO(b'x' * 100), None, 99)
+	assert e.value.args == ( 'body', 'larger than 99 bytes' )
+
+	# Shorter than the length
+	with pytest.raises(ValueError) as e:
+		ingest.spool(BytesIO(b'x' * 10), 20)
+	assert e.value.args == ( 'body', 'ended after 10 bytes' )
+
+	# Already spooled, it's returned as is, unless it's too large
+	oSource = BytesIO(b'x' * 100)
+	assert ingest.spool(oSource, 100, 100, spooled = True) is oSource
+	with pytest.raises(ValueError) as e:
+		ingest.spool(oSource, 100, 99, spooled = True)
+	assert e.value.args == ( 'body', 'larger than 99 bytes' )
+
+def test_array():
+	"""Array
+
+	Every element of the array is returned, whatever the chunks are, and the
+	count is kept
+	"""
+	lData = [
+		{ 'n': i, 's': 'é' * (i % 7), 'l': [ ',]"' ] } for i in range(5000)
+	]
+	bBody = json.dumps(lData).encode('utf-8')
+	assert len(bBody) > 2 * ingest.CHUNK
+	with ingest.Items(BytesIO(bBody)) as oItems:
+		assert list(oItems) == lData
+		assert oItems.count == 5000
+	assert _items(b' [ ] ') == []
+	assert _items(b'[1, "a", null, 2.5]')[:3] == [ 1, 'a', None ]
+
+def test_lines():
+	"""Lines
+
+	Each line of newline delimited JSON is an item, blank lines are skipped
+	"""
+	assert _items(b'{"a": 1}\n\n[2]\r\n"3"', True) == \
+		[ { 'a': 1 }, [ 2 ], '3' ]
+
+def test_compressed():
+	"""Compressed
+
+	Gzip and deflate bodies are decompressed as they're read, and others are
+	refused
+	"""
+	lData = list(range(20000))
+	bBody = json.dumps(lData).encode()
+	assert _items(gzip.compress(bBody), encoding = 'gzip') == lData
+	assert _items(zlib.compress(bBody), encoding = 'deflate') == lData
+	assert _items(bBody, encoding = 'identity') == lData
+	with pytest.raises(KeyError):
+		ingest.Items(BytesIO(bBody), encoding = 'br')
+
+	# Corrupt data fails
+	with pytest.raises(ResponseException):
+		_items(b'not gzip', encoding = 'gzip')
+
+def test_max_bytes():
+	"""Max Bytes
+
+	Bodies larger than the maximum once decompressed fail
+	"""
+	bBody = gzip.compress(json.dumps([ 0 ] * 1000).encode())
+	assert len(bBody) < 100
+	oItems = ingest.Items(BytesIO(bBody), encoding = 'gzip', max_bytes = 100)
+	with pytest.raises(ResponseException) as e:
+		list(oItems)
+	assert 'larger than 100 bytes' in e.value.args[0].error['msg']
+
+def test_invalid():
+	"""Invalid
+
+	Invalid bodies fail once the invalid part is reached, with the index of
+	the item, after the valid items before it have been returned
+	"""
+	assert _error(b'{"a": 1}') == ( [], 'item 0: must be a JSON array' )
+	assert _error(b'[1, 2, {"a": }]') == ( [ 1, 2 ], 'item 2: Expecting value' )
+	assert _error(b'[1, 2') == ( [ 1, 2 ], 'item 2: unexpected end of data' )
+	assert _error(b'[1,, 2]') == ( [ 1 ], 'item 1: missing element' )
+	assert _error(b'[1 2]') == ( [ 1 ], 'item 1: expected "," or "]"' )
+	assert _error(b'[1] [2]') == ( [ 1 ], 'item 1: data after the array' )
+	assert _error(b'1\n2 3\n', True) == \
+		( [ 1, 2 ], 'item 2: more than one value on the line' )
+
+	# Nothing is returned once it's failed
+	oItems = ingest.Items(BytesIO(b'[1, x]'))
+	assert next(oItems) == 1
+	with pytest.raises(ResponseException):
+		next(oItems)
+	with pytest.raises(StopIteration):
+		next(oItems)
+
+def test_streamed():
+	"""Streamed
+
+	The decorator stores its settings on the method, rejects invalid ones,
+	and can't be used on reads
+	"""
+	assert ingest.settings(Rows.rows_create) == \
+		{ 'max_bytes': None, 'memory': 1024 }
+	assert ingest.settings(Rows.reset) is None
+	with pytest.raises(ValueError) as e:
+		ingest.streamed(max_bytes = 0)
+	assert e.value.args[0] == 'max_bytes'
+	with pytest.raises(ValueError) as e:
+		ingest.streamed(memory = -1)
+	assert e.value.args[0] == 'memory'
+	with pytest.raises(ValueError) as e:
+		@ingest.streamed()
+		def rows_read(self, req):
+			pass
+	assert e.value.args[0] == 'func'
+
+def test_rest(services, rest):
+	"""REST
+
+	A noun that takes its data one item at a time gets every item of a large
+	body, sent as an array, lines, or compressed, and invalid bodies are
+	refused
+	"""
+	services({ 'rows': {} })
+	sURL = rest([ Rows() ])
+	lData = [ { 'n': i } for i in range(20000) ]
+	dJSON = { 'Content-Type': 'application/json; charset=utf-8' }
+
+	# As a JSON array
+	dRes = requests.post(
+		'%s/rows' % sURL, data = json.dumps(lData),
+		headers = dJSON, timeout = 10
+	).json()
+	assert dRes == { 'data': [ 20000, sum(range(20000)) ] }
+
+	# As lines, compressed
+	dRes = requests.post('%s/rows' % sURL,
+		data = gzip.compress('\n'.join(
+			[ json.dumps(d) for d in lData ]
+		).encode()),
+		headers = {
+			'Content-Type': 'application/x-ndjson',
+			'Content-Encoding': 'gzip'
+		},
+		timeout = 10
+	).json()
+	assert dRes == { 'data': [ 20000, sum(range(20000)) ] }
+
+	# Any other type is refused
+	dRes = requests.post(
+		'%s/rows' % sURL, data = '<rows/>',
+		headers = { 'Content-Type': 'text/xml' }, timeout = 10
+	).json()
+	assert dRes['error']['code'] == errors.REST_CONTENT_TYPE
+
+	# Too large
+	dRes = requests.post(
+		'%s/small' % sURL, data = json.dumps(lData[:100]),
+		headers = dJSON, timeout = 10
+	).json()
+	assert dRes['error'] == {
+		'code': errors.REST_REQUEST_DATA, 'msg': 'larger than 64 bytes'
+	}
+
+	# Invalid items after valid ones fail the request
+	dRes = requests.post(
+		'%s/rows' % sURL, data = '[{"n": 1}, {"n": }]',
+		headers = dJSON, timeout = 10
+	).json()
+	assert dRes['error']['code'] == errors.REST_REQUEST_DATA
+	assert dRes['error']['msg'].startswith('item 1: ')
+
+	# Unknown encodings are refused
+	dRes = requests.post(
+		'%s/rows' % sURL, data = '[]',
+		headers = { **dJSON, 'Content-Encoding': 'br' }, timeout = 10
+	).json()
+	assert dRes['error'] == {
+		'code': errors.REST_REQUEST_DATA,
+		'msg': 'Content-Encoding br not supported'
+	}
\ No newline at end of file
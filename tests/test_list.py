@@ -0,0 +1,165 @@
+# coding=utf8
+"""Test List
+
+Tests __list requests, several reads of a service run as a single request
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+import json
+from threading import current_thread
+from time import perf_counter, sleep
+
+# Pip imports
+import requests
+
+# Local imports
+from body import Error, errors, Response, ResponseException, Service
+
+class Items(Service):
+	"""Items
+
+	Service with reads that are slow, fail, or crash
+	"""
+
+	def reset(self):
+		pass
+
+	def slow_read(self, req):
+		sleep(0.2)
+		return Response([ req.data['id'], current_thread().name ])
+
+	def failed_read(self, req):
+		return Error(errors.DB_NO_RECORD, req.data['id'])
+
+	def raised_read(self, req):
+		raise ResponseException(Error(errors.DB_NO_RECORD, req.data['id']))
+
+	def crash_read(self, req):
+		raise RuntimeError('crashed')
+
+def _list(url: str, reads: list) -> dict:
+	"""List
+
+	Sends a __list request and returns the decoded body
+
+	Arguments:
+		url (str): The URL of the REST instance
+		reads (list): The reads to send
+
+	Returns:
+		dict
+	"""
+	return requests.get(
+		'%s/__list' % url,
+		data = json.dumps(reads),
+		headers = { 'Content-Type': 'application/json; charset=utf-8' },
+		timeout = 10
+	).json()
+
+def test_concurrent(services, rest):
+	"""Concurrent
+
+	Reads are run at the same time on a pool of threads, and returned in the
+	order they were requested
+	"""
+	services({ 'items': {} })
+	sURL = rest([ Items() ], list_workers = 4)
+	fStart = perf_counter()
+	dRes = _list(sURL, [ [ 'slow', { 'id': i } ] for i in range(4) ])
+	assert perf_counter() - fStart < 0.6
+	assert [ l[0] for l in dRes['data'] ] == [ 'slow' ] * 4
+	assert [ l[1]['data'][0] for l in dRes['data'] ] == [ 0, 1, 2, 3 ]
+	assert all([
+		l[1]['data'][1].startswith('body.rest.list') for l in dRes['data']
+	])
+
+def test_sequential(services, rest):
+	"""Sequential
+
+	With a single worker, the reads are run one after the other in the
+	thread handling the request
+	"""
+	services({ 'items': {} })
+	sURL = rest([ Items() ], list_workers = 1)
+	fStart = perf_counter()
+	dRes = _list(sURL, [ [ 'slow', { 'id': i } ] for i in range(3) ])
+	assert perf_counter() - fStart >= 0.6
+	assert [ l[1]['data'][0] for l in dRes['data'] ] == [ 0, 1, 2 ]
+	assert not any([
+		l[1]['data'][1].startswith('body.rest.list') for l in dRes['data']
+	])
+
+def test_limit(services, rest):
+	"""Limit
+
+	Requests with more reads than the limit are refused
+	"""
+	services({ 'items': {} })
+	sURL = rest([ Items() ], list_limit = 2)
+	dRes = _list(sURL, [ [ 'slow', { 'id': i } ] for i in range(3) ])
+	assert dRes['error']['code'] == errors.REST_LIST_TO_LONG
+
+def test_abort(services, rest):
+	"""Abort
+
+	By default, the first read that raises an error is the Response of the
+	entire request, and one that crashes crashes the request, while errors
+	returned are just the Response of their read
+	"""
+	services({ 'items': {} })
+	sURL = rest([ Items() ], list_errors = 'abort')
+	dRes = _list(sURL, [
+		[ 'failed', { 'id': 1 } ], [ 'slow', { 'id': 2 } ]
+	])
+	assert dRes['data'][0][1]['error']['code'] == errors.DB_NO_RECORD
+	assert dRes['data'][1][1]['data'][0] == 2
+
+	dRes = _list(sURL, [
+		[ 'slow', { 'id': 1 } ], [ 'raised', { 'id': 2 } ]
+	])
+	assert dRes['error']['code'] == errors.DB_NO_RECORD
+	assert dRes['error']['msg'] == 2
+
+	dRes = _list(sURL, [ [ 'slow', { 'id': 1 } ], 'crash' ])
+	assert dRes['error']['code'] == errors.SERVICE_CRASHED
+
+	dRes = _list(sURL, [ 'unknown' ])
+	assert dRes['error']['code'] == errors.REST_LIST_INVALID_URI
+
+def test_collect(services, rest):
+	"""Collect
+
+	When collecting errors, every read gets its own Response, including
+	those that raised, crashed, or were invalid
+	"""
+	services({ 'items': {} })
+	sURL = rest([ Items() ], list_errors = 'collect')
+	dRes = _list(sURL, [
+		[ 'raised', { 'id': 1 } ],
+		'crash',
+		'unknown',
+		[ 'slow', { 'id': 4 } ]
+	])
+	assert [ l[0] for l in dRes['data'] ] == \
+		[ 'raised', 'crash', 'unknown', 'slow' ]
+	assert dRes['data'][0][1]['error']['code'] == errors.DB_NO_RECORD
+	assert dRes['data'][1][1]['error']['code'] == errors.SERVICE_CRASHED
+	assert dRes['data'][2][1]['error']['code'] == \
+		errors.REST_LIST_INVALID_URI
+	assert dRes['data'][3][1]['data'][0] == 4
+
+def test_invalid(services, rest):
+	"""Invalid
+
+	The data of a __list request must be an array
+	"""
+	services({ 'items': {} })
+	sURL = rest([ Items() ])
+	dRes = _list(sURL, { 'slow': { 'id': 1 } })
+	assert dRes['error']['code'] == errors.REST_REQUEST_DATA
\ No newline at end of file
@@ -0,0 +1,182 @@
+# coding=utf8
+"""Test Many
+
+Tests the create_many, update_many, and delete_many actions, which handle
+several items of a noun in one request
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+import json
+
+# Pip imports
+import requests
+
+# Local imports
+from body import create_many, delete_many, errors, Error, external, Many, \
+	Response, Service, update_many
+
+class Products(Service):
+	"""Products
+
+	Service with a noun that creates and deletes many items at once
+	"""
+
+	def reset(self):
+		self._ids = { 'a' }
+
+	def product_create(self, req):
+		return Response(req.data['_id'])
+
+	def product_create_many(self, req):
+		lResults = []
+		for d in req.data:
+			if d['_id'] in self._ids:
+				lResults.append(Error(errors.DB_DUPLICATE, d['_id']))
+			else:
+				self._ids.add(d['_id'])
+				lResults.append(d['_id'])
+		return Many(lResults)
+
+	def product_delete_many(self, req):
+		return Many([
+			s in self._ids and True or Error(errors.DB_NO_RECORD, s)
+			for s in req.data
+		])
+
+	def product_many_read(self, req):
+		return Response('many')
+
+def test_many():
+	"""Many
+
+	Every result is stored as a Response, in order, and split returns them,
+	or nothing if the request failed. Results without data are empty
+	"""
+	oMany = Many([ 1, Error(errors.DB_NO_RECORD, 'b'), Response(None) ])
+	assert oMany.data == [
+		{ 'data': 1 },
+		{ 'error': { 'code': errors.DB_NO_RECORD, 'msg': 'b' } },
+		{}
+	]
+	lResults = Many.split(oMany)
+	assert [ o.data for o in lResults ] == [ 1, None, None ]
+	assert [ bool(o.error) for o in lResults ] == [ False, True, False ]
+	assert lResults[1].error['msg'] == 'b'
+
+	# A failed request, or one that isn't a list, has no items
+	assert Many.split(Error(errors.SERVICE_ACTION)) == []
+	assert Many.split(Response({ 'a': 1 })) == []
+
+def test_nouns(services):
+	"""Nouns
+
+	The bulk methods are found as their own actions, and a noun ending in
+	"many" isn't mistaken for one
+	"""
+	services({ 'products': {} })
+	lActions = sorted([
+		( d['name'], d['action'] ) for d in Products()._requests
+	])
+	assert lActions == [
+		( 'product', 'create' ),
+		( 'product', 'create_many' ),
+		( 'product', 'delete_many' ),
+		( 'product_many', 'read' )
+	]
+
+def test_in_process(services):
+	"""In Process
+
+	Bulk actions of a service in the same process are called directly, and
+	actions the noun doesn't have are refused
+	"""
+	services({ 'products': {} })
+	Products()
+	oResponse = create_many('products', 'product', {
+		'data': [ { '_id': 'a' }, { '_id': 'b' } ]
+	})
+	lResults = Many.split(oResponse)
+	assert lResults[0].error['code'] == errors.DB_DUPLICATE
+	assert lResults[1].data == 'b'
+	oResponse = update_many('products', 'product', { 'data': [] })
+	assert oResponse.error['code'] == errors.SERVICE_ACTION
+	assert external.read('products', 'product/many').data == 'many'
+
+def test_rest(services, rest):
+	"""REST
+
+	Bulk actions are served at the noun's URI followed by __many, with the
+	same method as the single item action, and each item gets its own result
+	"""
+	services({ 'products': {} })
+	sURL = rest([ Products() ])
+	dHeaders = { 'Content-Type': 'application/json; charset=utf-8' }
+
+	# Create two, one of which already exists
+	dRes = requests.post(
+		'%s/product/__many' % sURL,
+		data = json.dumps([ { '_id': 'a' }, { '_id': 'c' } ]),
+		headers = dHeaders, timeout = 10
+	).json()
+	assert dRes['data'] == [
+		{ 'error': { 'code': errors.DB_DUPLICATE, 'msg': 'a' } },
+		{ 'data': 'c' }
+	]
+
+	# Delete the one that was created, and one that doesn't exist
+	dRes = requests.delete(
+		'%s/product/__many' % sURL, data = json.dumps([ 'c', 'd' ]),
+		headers = dHeaders, timeout = 10
+	).json()
+	assert dRes['data'] == [
+		{ 'data': True },
+		{ 'error': { 'code': errors.DB_NO_RECORD, 'msg': 'd' } }
+	]
+
+	# The noun ending in many is served as usual
+	assert requests.get(
+		'%s/product/many' % sURL, data = 'null', headers = dHeaders,
+		timeout = 10
+	).json() == { 'data': 'many' }
+
+	# There's no update_many, so there's no route for it
+	oRes = requests.put(
+		'%s/product/__many' % sURL, data = '[]', headers = dHeaders,
+		timeout = 10
+	)
+	assert oRes.status_code == 405
+
+def test_external(services, upstream):
+	"""External
+
+	Bulk actions of another service are sent to the noun's __many URI, and
+	each result can be split back out
+	"""
+	lCalls = []
+	def handler(environ):
+		iLength = int(environ.get('CONTENT_LENGTH') or 0)
+		lData = json.loads(environ['wsgi.input'].read(iLength))
+		lCalls.append(( environ['REQUEST_METHOD'], environ['PATH_INFO'] ))
+		if environ['PATH_INFO'] != '/thing/__many':
+			return ( 404, { 'error': 'not found' } )
+		return ( 200, { 'data': [ { 'data': m } for m in lData ] } )
+	services({ 'remote': { 'port': upstream(handler) } })
+
+	oResponse = create_many('remote', 'thing', { 'data': [ 1, 2 ] })
+	assert [ o.data for o in Many.split(oResponse) ] == [ 1, 2 ]
+	oResponse = delete_many('remote', 'thing', { 'data': [ 3 ] })
+	assert [ o.data for o in Many.split(oResponse) ] == [ 3 ]
+	assert lCalls == [
+		( 'POST', '/thing/__many' ), ( 'DELETE', '/thing/__many' )
+	]
+
+	# A failed request has no items
+	oResponse = create_many('remote', 'other', { 'data': [ 1 ] })
+	assert oResponse.error['code'] == errors.SERVICE_STATUS
+	assert Many.split(oResponse) == []
\ No newline at end of file
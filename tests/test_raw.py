@@ -0,0 +1,165 @@
+# coding=utf8
+"""Test Raw
+
+Tests Responses received from other services, which are only decoded when
+they need to be, and passed on as they were received when they aren't
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+import json
+
+# Pip imports
+import pytest
+import requests
+
+# Local imports
+from body import errors, external, formats, Service
+from body.response import RawResponse
+
+JSON = 'application/json; charset=utf-8'
+"""The Content-Type of the bodies"""
+
+class Relay(Service):
+	"""Relay
+
+	Service that passes on the Responses of another service, as is, or after
+	changing them
+	"""
+
+	def reset(self):
+		pass
+
+	def relay_read(self, req):
+		return external.read('remote', req.data)
+
+	def changed_read(self, req):
+		oResponse = external.read('remote', 'thing')
+		oResponse.data['b'] = 2
+		return oResponse
+
+def _app(environ: dict, start_response: callable) -> list:
+	"""App
+
+	The remote service, which sends bodies spaced differently than body
+	encodes them, so that passing them on as is can be seen
+
+	Arguments:
+		environ (dict): The WSGI environment
+		start_response (callable): Starts the response
+
+	Returns:
+		list
+	"""
+	if environ['PATH_INFO'] == '/thing':
+		bBody = b'{"data":{"a":  1}}'
+	else:
+		bBody = b'{"error":{"code":1000,"msg":"nope"}}'
+	start_response('200 OK', [
+		( 'Content-Type', JSON ), ( 'Content-Length', str(len(bBody)) )
+	])
+	return [ bBody ]
+
+def test_lazy():
+	"""Lazy
+
+	The body isn't decoded to check for an error or warning that isn't in
+	it, or to send it on in the same format, and reading simple data doesn't
+	stop it being sent on
+	"""
+	bRaw = b'{"data":  1}'
+	oRes = RawResponse(bRaw, JSON)
+	assert oRes.error is False
+	assert not oRes.warning_exists()
+	assert oRes._decoded is None
+	assert oRes.to_format(JSON) is bRaw
+	assert oRes.to_json() == bRaw.decode()
+
+	# Reading the data decodes it, but as it can't have been changed, the
+	#	original is still used
+	assert oRes.data == 1
+	assert oRes._decoded is not None
+	assert oRes.raw is bRaw
+	assert oRes.to_dict() == { 'data': 1 }
+
+	# Another format is encoded
+	if 'msgpack' in formats.names():
+		assert formats.by_name('msgpack').decode(
+			oRes.to_format('application/msgpack')
+		) == { 'data': 1 }
+
+def test_error():
+	"""Error
+
+	An error or warning in the body is decoded when it's checked, and the
+	body can then be changed
+	"""
+	oRes = RawResponse(
+		b'{"error":{"code":1000,"msg":"nope"},"warning":"careful"}', JSON
+	)
+	assert oRes.error == { 'code': errors.RIGHTS, 'msg': 'nope' }
+	assert oRes.warning == 'careful'
+	assert oRes.data is None
+	assert oRes.raw is None
+	assert json.loads(oRes.to_json()) == {
+		'error': { 'code': errors.RIGHTS, 'msg': 'nope' },
+		'warning': 'careful'
+	}
+
+	# Invalid bodies and formats fail once they're decoded
+	with pytest.raises(ValueError):
+		RawResponse(b'{"data": ', JSON).data
+	with pytest.raises(ValueError):
+		RawResponse(b'data', 'text/plain').data
+
+def test_modified():
+	"""Modified
+
+	Once anything is set, or a dict or list is handed out, the body is
+	encoded again
+	"""
+	oRes = RawResponse(b'{"data":  1}', JSON)
+	oRes.data = 2
+	assert oRes.raw is None
+	assert json.loads(oRes.to_format(JSON)) == { 'data': 2 }
+
+	oRes = RawResponse(b'{"data":  [ 1 ]}', JSON)
+	oRes.data.append(2)
+	assert oRes.raw is None
+	assert json.loads(oRes.to_json()) == { 'data': [ 1, 2 ] }
+
+	oRes = RawResponse(b'{"data":  1}', JSON)
+	oRes.warning = 'careful'
+	assert json.loads(oRes.to_json()) == { 'data': 1, 'warning': 'careful' }
+
+def test_rest(services, serve, rest):
+	"""REST
+
+	Responses passed on by a service are sent as they were received, unless
+	they were changed, and errors still get the service added
+	"""
+	services({ 'relay': {}, 'remote': { 'port': serve(_app) } })
+	sURL = rest([ Relay() ])
+	def get(path: str, data: any) -> requests.Response:
+		return requests.get(
+			'%s/%s' % ( sURL, path ), data = json.dumps(data),
+			headers = { 'Content-Type': JSON }, timeout = 10
+		)
+
+	# As is
+	assert get('relay', 'thing').content == b'{"data":{"a":  1}}'
+
+	# Changed
+	assert get('changed', None).json() == { 'data': { 'a': 1, 'b': 2 } }
+
+	# Errors
+	assert get('relay', 'other').json() == { 'error': {
+		'code': errors.RIGHTS,
+		'msg': 'nope',
+		'service': [ [ 'relay', 'GET', '/relay' ] ]
+	} }
\ No newline at end of file
@@ -0,0 +1,150 @@
+# coding=utf8
+"""Test Sessions
+
+Tests caching the sessions of incoming requests, and extending their TTL in
+the background
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Ouroboros imports
+import jsonb
+import memory
+
+# Python imports
+from time import sleep
+
+# Pip imports
+import pytest
+
+# Local imports
+from body import sessions
+
+class Store(object):
+	"""Store
+
+	Session store kept in a dict, that records every call made to it
+	"""
+
+	def __init__(self):
+		self.data = {}
+		self.calls = []
+
+	def get(self, key):
+		self.calls.append(( 'get', key ))
+		return self.data.get(key)
+
+	def expire(self, key, ttl):
+		self.calls.append(( 'expire', key ))
+
+	def set(self, key, value):
+		self.data[key] = value
+
+	def setex(self, key, ttl, value):
+		self.data[key] = value
+
+	def delete(self, key):
+		self.data.pop(key, None)
+
+	def count(self, call: str) -> int:
+		return len([ t for t in self.calls if t[0] == call ])
+
+@pytest.fixture
+def store(monkeypatch):
+	"""Store
+
+	Replaces the session store with one in memory holding a single session,
+	'one', and turns caching off once the test is done
+	"""
+	oStore = Store()
+	oStore.data['one'] = jsonb.encode({ '__ttl': 60, 'user': 1 })
+	monkeypatch.setattr(memory, '_moRedis', oStore)
+	yield oStore
+	sessions.configure(ttl = 0)
+	sessions.flush()
+
+def test_uncached(store):
+	"""Uncached
+
+	With caching off, every load goes to the session store and extends the
+	session right away
+	"""
+	sessions.configure(ttl = 0)
+	assert sessions.load('one')['user'] == 1
+	assert sessions.load('one')['user'] == 1
+	assert sessions.load('two') is None
+	assert store.count('get') == 3
+	assert store.count('expire') == 2
+
+def test_isolation(store):
+	"""Isolation
+
+	Each load of a cached session gets its own copy, so changes made by one
+	request aren't seen by others until they're saved, and a closed session
+	isn't loaded from the cache
+	"""
+	sessions.configure(ttl = 60, interval = 60)
+	oFirst = sessions.load('one')
+	oSecond = sessions.load('one')
+	assert oFirst is not oSecond
+	oFirst['user'] = 2
+	assert oSecond['user'] == 1
+	assert sessions.load('one')['user'] == 1
+	assert store.count('get') == 1
+
+	# Once saved, the change is cached
+	oFirst.save()
+	assert sessions.load('one')['user'] == 2
+	assert store.count('get') == 1
+
+	# Once closed, it's gone
+	oFirst.close()
+	assert sessions.load('one') is None
+	assert store.count('get') == 2
+
+def test_extension(store):
+	"""Extension
+
+	The TTL of a cached session is extended once per interval, in the
+	background, however many times it's loaded
+	"""
+	sessions.configure(ttl = 60, interval = 60)
+	dBefore = sessions.stats()
+	for i in range(3):
+		sessions.load('one')
+	dStats = sessions.stats()
+	assert dStats['hits'] - dBefore['hits'] == 2
+	assert dStats['misses'] - dBefore['misses'] == 1
+	assert dStats['pending'] == 1
+	assert store.count('expire') == 0
+
+	sessions.flush()
+	assert store.count('expire') == 1
+	assert sessions.stats()['extended'] - dBefore['extended'] == 1
+	assert sessions.stats()['pending'] == 0
+
+	# A new interval is used right away
+	sessions.load('one')
+	sessions.configure(ttl = 60, interval = 0.05)
+	sleep(0.3)
+	assert store.count('expire') == 2
+
+def test_after_fork(store):
+	"""After Fork
+
+	A forked process starts with nothing cached, and no stats
+	"""
+	sessions.configure(ttl = 60, interval = 60)
+	sessions.load('one')
+	sessions.load('one')
+	sessions._after_fork()
+	dStats = sessions.stats()
+	assert dStats['size'] == 0
+	assert dStats['pending'] == 0
+	assert dStats['hits'] == 0
+	assert dStats['misses'] == 0
+	assert store.count('get') == 1
\ No newline at end of file
@@ -0,0 +1,198 @@
+# coding=utf8
+"""Test Stream
+
+Tests sending the items of large reads one at a time, as newline delimited
+JSON, and receiving them from other services
+"""
+from __future__ import annotations
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-17"
+
+# Python imports
+import json
+
+# Pip imports
+import pytest
+import requests
+
+# Local imports
+from body import errors, Error, external, Response, ResponseException, \
+	Service, stream
+
+class Exports(Service):
+	"""Exports
+
+	Service with reads that return their items one at a time
+	"""
+
+	def reset(self):
+		pass
+
+	def export_read(self, req):
+		return Response(( { 'n': i } for i in range(req.data['count']) ))
+
+	def bare_read(self, req):
+		return ( i for i in range(3) )
+
+	def broken_read(self, req):
+		def items():
+			yield 1
+			raise RuntimeError('broken')
+		return Response(items())
+
+	def refused_read(self, req):
+		def items():
+			yield 1
+			raise ResponseException(Error(errors.RIGHTS, 'refused'))
+		return Response(items())
+
+def _get(url: str, path: str, data: any, accept: str | None = None) -> tuple:
+	"""Get
+
+	Makes a read and returns the Content-Type of the response, and each line
+	decoded, or the body decoded if it's not a stream
+
+	Arguments:
+		url (str): The URL of the REST instance
+		path (str): The path of the read
+		data (any): The data to send
+		accept (str): Optional, the Accept header
+
+	Returns:
+		tuple
+	"""
+	dHeaders = { 'Content-Type': 'application/json; charset=utf-8' }
+	if accept:
+		dHeaders['Accept'] = accept
+	oRes = requests.get(
+		'%s/%s' % ( url, path ), data = json.dumps(data), headers = dHeaders,
+		timeout = 10
+	)
+	sType = oRes.headers['Content-Type']
+	if sType == stream.CONTENT_TYPE:
+		return ( sType, [ json.loads(s) for s in oRes.text.splitlines() ] )
+	return ( sType, oRes.json() )
+
+def _remote(services: callable, rest: callable) -> None:
+	"""Remote
+
+	Serves the Exports service, and points the remote service at it, so that
+	requests to it go over HTTP
+
+	Arguments:
+		services (callable): The services fixture
+		rest (callable): The rest fixture
+
+	Returns:
+		None
+	"""
+	services({ 'exports': {} })
+	sURL = rest([ Exports() ])
+	services({
+		'exports': {},
+		'remote': { 'port': int(sURL.rsplit(':', 1)[1]) }
+	})
+
+def test_accepts():
+	"""Accepts
+
+	Streams are only sent to clients that explicitly accept them
+	"""
+	assert stream.accepts('application/x-ndjson')
+	assert stream.accepts('application/json, Application/X-NDJSON; q=0.5')
+	assert not stream.accepts('application/x-ndjson; q=0')
+	assert not stream.accepts('application/x-ndjson; q=x')
+	assert not stream.accepts('application/json, */*')
+	assert not stream.accepts(None)
+
+def test_lines():
+	"""Lines
+
+	Items are sent one per line, in chunks of at least the buffer size, and
+	an error ends the stream
+	"""
+	lChunks = list(stream.lines(iter(range(5000)), None))
+	assert len(lChunks) > 1
+	assert all([ len(b) >= 16384 for b in lChunks[:-1] ])
+	assert [
+		json.loads(s) for s in b''.join(lChunks).splitlines()
+	] == [ { 'data': i } for i in range(5000) ]
+
+	# Errors are added as the last line
+	def items():
+		yield 1
+		raise RuntimeError('broken')
+	lLines = b''.join(stream.lines(
+		items(), lambda e: Error(errors.SERVICE_CRASHED, str(e))
+	)).splitlines()
+	assert [ json.loads(s) for s in lLines ] == [
+		{ 'data': 1 },
+		{ 'error': { 'code': errors.SERVICE_CRASHED, 'msg': 'broken' } }
+	]
+
+def test_rest(services, rest):
+	"""REST
+
+	Clients that accept streams get each item on its own line, any other
+	client gets them all as a list
+	"""
+	services({ 'exports': {} })
+	sURL = rest([ Exports() ])
+
+	sType, lLines = _get(sURL, 'export', { 'count': 2000 }, stream.MIME)
+	assert sType == stream.CONTENT_TYPE
+	assert lLines == [ { 'data': { 'n': i } } for i in range(2000) ]
+	assert _get(sURL, 'bare', None, stream.MIME)[1] == \
+		[ { 'data': i } for i in range(3) ]
+
+	sType, dRes = _get(sURL, 'export', { 'count': 3 })
+	assert sType == 'application/json; charset=utf-8'
+	assert dRes == { 'data': [ { 'n': 0 }, { 'n': 1 }, { 'n': 2 } ] }
+
+	# Errors part way through end the stream
+	lLines = _get(sURL, 'broken', None, stream.MIME)[1]
+	assert lLines[0] == { 'data': 1 }
+	assert lLines[1]['error']['code'] == errors.SERVICE_CRASHED
+	assert _get(sURL, 'refused', None, stream.MIME)[1] == [
+		{ 'data': 1 }, { 'error': { 'code': errors.RIGHTS, 'msg': 'refused' } }
+	]
+
+def test_external(services, rest):
+	"""External
+
+	Streams from other services are iterated as they arrive, and errors part
+	way through are raised
+	"""
+	_remote(services, rest)
+
+	oRes = external.stream('remote', 'export', { 'data': { 'count': 2000 } })
+	assert not oRes.error
+	assert stream.is_stream(oRes.data)
+	assert list(oRes.data) == [ { 'n': i } for i in range(2000) ]
+
+	oRes = external.stream('remote', 'broken')
+	lItems = []
+	with pytest.raises(ResponseException) as e:
+		for m in oRes.data:
+			lItems.append(m)
+	assert lItems == [ 1 ]
+	assert e.value.args[0].error['code'] == errors.SERVICE_CRASHED
+
+	# Reads that aren't streamed are not
+	oRes = external.read('remote', 'export', { 'data': { 'count': 2 } })
+	assert oRes.data == [ { 'n': 0 }, { 'n': 1 } ]
+
+def test_in_process(services):
+	"""In Process
+
+	Services in the same process return the iterator itself
+	"""
+	services({ 'exports': {} })
+	Exports()
+	oRes = external.stream('exports', 'export', { 'data': { 'count': 3 } })
+	assert stream.is_stream(oRes.data)
+	assert list(oRes.data) == [ { 'n': 0 }, { 'n': 1 }, { 'n': 2 } ]
+	assert list(external.stream('exports', 'bare').data) == [ 0, 1, 2 ]
\ No newline at end of file